@@ -1,18 +1,36 @@
-
 __version__ = '0.1'
 
-import os, logging
+import importlib
+import logging
 
+# The package is silent until the application configures the logging
+# (see ruautogui.logs.configure_logging).
 logger = logging.getLogger('ruautogui')
+logger.addHandler(logging.NullHandler())
+
+# Importing the package imports none of its modules: a module is imported at
+# the first access to it (e.g. ruautogui.mouse), so a short-lived process pays
+# only for the modules it uses.
+SUBMODULES = (
+    'aio', 'backends', 'bezier', 'bezier_draftsman', 'calibration', 'clocks', 'keyboard',
+    'layouts', 'lazy', 'logs', 'motion', 'mouse', 'pool', 'program', 'scheduler',
+    'simulation', 'streaming', 'timeline', 'timing', 'trajectory', 'win32tools'
+)
 
-logger.setLevel(logging.DEBUG)
+# The names the package exports from its modules.
+_EXPORTS = {
+    'configure_logging': 'logs',
+    'stop_logging': 'logs'
+}
 
-logConsoleHandler = logging.StreamHandler()
-formatterConsole = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
-logConsoleHandler.setFormatter(formatterConsole)
-logger.addHandler(logConsoleHandler)
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module('ruautogui.' + name)
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module('ruautogui.' + _EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'ruautogui' has no attribute '{name}'")
 
-logFileHandler = logging.FileHandler(f'ruautogui.log')
-formatterFile = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logFileHandler.setFormatter(formatterFile)
-logger.addHandler(logFileHandler)    
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(SUBMODULES) | set(_EXPORTS))
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# aio.py - a module from ruautogui package with the asyncio versions of
+#          the functions of the modules mouse and keyboard.
+# Features:
+#   - move, click, type, press and hotkey are coroutines: the waits between
+#     the steps of a movement and between the groups of key events are
+#     asyncio.sleep (or the virtual time of the package clock, see
+#     the module clocks), so the event loop keeps serving other tasks;
+#   - the curves, the keystroke programs and the events are the same as of
+#     the blocking functions (see mouse.move, keyboard.compile);
+#   - a coroutine can be cancelled as any asyncio task.
+
+if __name__ == '__main__':
+    import backends
+    import keyboard
+    import mouse
+else:
+    from ruautogui import backends
+    from ruautogui import keyboard
+    from ruautogui import mouse
+
+async def move(end_pos, order=2, transition_time=None, sampling='adaptive'):
+    """ This coroutine gets the same arguments as mouse.move.
+Moves the mouse cursor to the end point along a Bezier curve.
+Returns scheduler.ScheduleStatistics of the movement."""
+    if len(end_pos) == 0:
+        return None
+    begin_pos = mouse.get_mouse_cursor_position()
+    points, _, transition_time = mouse.plan_curve(
+        begin_pos, end_pos, order, transition_time, sampling
+    )
+    return await move_through_coordinates(points, transition_time)
+
+async def move_through_coordinates(coordinates, transition_time):
+    """ This coroutine gets the same arguments as mouse.move_through_coordinates.
+Returns scheduler.ScheduleStatistics of the movement."""
+    deadlines, duration = mouse.get_deadlines(coordinates, transition_time)
+    set_cursor_position = backends.get_backend().set_cursor_position
+
+    def step(i):
+        x, y = coordinates[i + 1]
+        set_cursor_position(x, y)
+
+    return await mouse.scheduler.run_async(deadlines, step, duration)
+
+async def click(button='left', double_click=False, hold=None):
+    """ This coroutine gets the same arguments as mouse.click.
+Clicks at the current mouse position; if the task is cancelled while
+the button is pressed, the button is released. Returns None."""
+    edges = mouse.get_click_edges(button, double_click, hold)
+    if edges is None:
+        return None
+    down, up = mouse.get_button_flags(button)
+    send_mouse_events = backends.get_backend().send_mouse_events
+    held = [False]
+
+    def step(i):
+        send_mouse_events(edges[i][1])
+        held[0] = edges[i][1][-1] == down
+
+    try:
+        await mouse.scheduler.run_async([edge[0] for edge in edges], step, droppable=[False] * len(edges))
+    finally:
+        # A cancelled click does not leave the button pressed.
+        if held[0]:
+            send_mouse_events((up,))
+
+async def play(program, layout=None):
+    """ This coroutine gets the same arguments as keyboard.play (without
+should_stop: cancel the task instead; the keys pressed by the cancelled task
+are released and the layout is restored as by keyboard.play).
+Types the keystroke program. Returns keyboard.TypingStatistics."""
+    restore = layout is None
+    if restore:
+        layout = keyboard.LayoutState()
+    sent = [0]
+    try:
+        for run in program.split(keyboard.get_batch_threshold(program.mode)):
+            layout.ensure(run.language)
+            step = keyboard.get_group_sender(program, run, sent)
+            await keyboard.scheduler.run_async(run.deadlines, step, run.duration)
+    finally:
+        # A cancelled task releases the keys it has pressed (see keyboard.play).
+        keyboard.release_keys(program, sent[0])
+        if restore:
+            layout.restore()
+    return keyboard.get_typing_statistics(program, sent[0], layout)
+
+async def type(message, mode='standard', typo=False, method='vk'):
+    """ This coroutine gets the same arguments as keyboard.type.
+The message is compiled (see keyboard.compile) and typed by 'play'.
+Returns keyboard.TypingStatistics."""
+    return await play(keyboard.compile(message, mode, typo, method))
+
+async def press(symbol, mode='standard', shift=False):
+    """ This coroutine gets the same arguments as keyboard.press.
+Returns None."""
+    await play(keyboard.compile_keystroke(symbol, mode, shift))
+
+async def hotkey(*args, **kwargs):
+    """ This coroutine gets the same arguments as keyboard.hotkey.
+Without an interval the whole chord is sent by one SendInput call.
+Returns None."""
+    await play(keyboard.compile_hotkey(*args, **kwargs))
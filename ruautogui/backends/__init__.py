@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# backends - a subpackage of ruautogui with the input backends: the modules
+#            mouse and keyboard inject the input through the current backend.
+# Features:
+#   - 'win32' - the Win32 API (SendInput, SetCursorPos), the default on Windows;
+#   - 'x11' - the XTest extension of an X server (e.g. Xvfb), the default on
+#     the other platforms if DISPLAY is set;
+#   - 'recording' - the events are recorded in memory (see the module recording);
+#   - the backend is created at the first use, it can be chosen by
+#     the RUAUTOGUI_BACKEND environment variable or by set_backend;
+#   - the modules that cache the data of the backend (e.g. the keyboard
+#     layouts) are notified when it is changed (see add_listener).
+
+import importlib
+import os
+import sys
+
+# The names of the backends and their classes (module, class).
+BACKENDS = {
+    'win32': ('ruautogui.backends.win32', 'Win32Backend'),
+    'x11': ('ruautogui.backends.x11', 'X11Backend'),
+    'recording': ('ruautogui.backends.recording', 'RecordingBackend')
+}
+
+_backend = None
+
+# The functions called with the new backend by set_backend.
+_listeners = []
+
+def get_default_name():
+    """ Returns the name of the backend of this host: RUAUTOGUI_BACKEND if it is set,
+'win32' on Windows, 'x11' if there is an X display, None otherwise."""
+    name = os.environ.get('RUAUTOGUI_BACKEND')
+    if name:
+        return name
+    if sys.platform == 'win32':
+        return 'win32'
+    if os.environ.get('DISPLAY'):
+        return 'x11'
+    return None
+
+def create_backend(name, **kwargs):
+    """ This function gets the name of a backend (see BACKENDS) and the arguments
+of its constructor. Returns a new backend."""
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown backend {name}, the possible values are {tuple(BACKENDS)}')
+    module, class_name = BACKENDS[name]
+    return getattr(importlib.import_module(module), class_name)(**kwargs)
+
+def get_backend():
+    """ Returns the current backend, the default one is created on the first call
+(see get_default_name). OSError is raised if this host has no backend."""
+    global _backend
+    if _backend is None:
+        name = get_default_name()
+        if name is None:
+            raise OSError(
+                'No input backend for this platform: set RUAUTOGUI_BACKEND or '
+                'call ruautogui.backends.set_backend'
+            )
+        _backend = create_backend(name)
+    return _backend
+
+def set_backend(backend, **kwargs):
+    """ This function gets a backend (an instance of base.Backend) or the name
+of a backend and the arguments of its constructor.
+Makes it the current backend of the package and returns it."""
+    global _backend
+    if isinstance(backend, str):
+        backend = create_backend(backend, **kwargs)
+    _backend = backend
+    for listener in _listeners:
+        listener(backend)
+    return backend
+
+def add_listener(listener):
+    """ This function gets a function of one argument. It is called with
+the new backend every time set_backend changes the backend of the package,
+e.g. to drop the data cached from the previous backend."""
+    if listener not in _listeners:
+        _listeners.append(listener)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# base.py - a module from ruautogui.backends package with the interface of
+#           the input backends.
+# Features:
+#   - a backend moves and reads the cursor, sends the batches of the mouse
+#     button events and of the key events, queries the screen and switches
+#     the keyboard layouts;
+#   - the events are described in the terms of the Win32 API (virtual-key
+#     codes, KEYEVENTF_* and MOUSEEVENTF_* flags), the other backends
+#     translate them;
+#   - a batch of key events can be prepared once and sent later, so the time
+#     of building it is not spent on the hot path.
+
+# The flags of the key events.
+KEYEVENTF_KEYDOWN = 0x0000
+KEYEVENTF_KEYUP = 0x0002
+# The scan code of the event is a UTF-16 code unit to type.
+KEYEVENTF_UNICODE = 0x0004
+
+# The flags of the mouse button events.
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+MOUSEEVENTF_RIGHTDOWN = 0x0008
+MOUSEEVENTF_RIGHTUP = 0x0010
+MOUSEEVENTF_MIDDLEDOWN = 0x0020
+MOUSEEVENTF_MIDDLEUP = 0x0040
+
+class Backend:
+    """ The interface of an input backend. The methods that a backend cannot
+support raise NotImplementedError; the optional ones have defaults."""
+
+    # The name of the backend (see backends.BACKENDS).
+    name = None
+
+    # True if the translation tables of the keyboard layouts are queried from
+    # the OS (see query_keyboard_layout), otherwise the shipped ones are used.
+    queries_layouts = False
+
+    def get_cursor_position(self):
+        """ Returns a tuple of x and y coordinates of the cursor."""
+        raise NotImplementedError
+
+    def set_cursor_position(self, x, y):
+        """ Moves the cursor to the point."""
+        raise NotImplementedError
+
+    def send_mouse_events(self, flags):
+        """ This method gets a sequence of the flags of the mouse button events
+(e.g. MOUSEEVENTF_LEFTDOWN). Sends the events at the current position of
+the cursor. Returns the number of the sent events."""
+        raise NotImplementedError
+
+    def send_key_events(self, vks, flags, scans):
+        """ This method gets three sequences of the same length: the virtual-key
+codes, the flags (KEYEVENTF_*) and the scan codes of the key events (the scan
+code of a KEYEVENTF_UNICODE event is a UTF-16 code unit).
+Sends all the events at once. Returns the number of the sent events."""
+        return self.send_prepared(self.prepare_key_events(vks, flags, scans))
+
+    def prepare_key_events(self, vks, flags, scans):
+        """ This method gets the same arguments as send_key_events.
+Returns an object that send_prepared sends (the batch can be sent many times)."""
+        return (list(vks), list(flags), list(scans))
+
+    def send_prepared(self, prepared):
+        """ Sends a batch returned by prepare_key_events.
+Returns the number of the sent events."""
+        raise NotImplementedError
+
+    def get_screen_size(self):
+        """ Returns a tuple of the width and the height of the screen in pixels."""
+        raise NotImplementedError
+
+    def get_keyboard_layout(self, thread_id=0):
+        """ Returns the language identifier (the low word of the KLID, e.g. 0x0409)
+of the keyboard layout of the foreground window, None if it is unknown."""
+        return None
+
+    def load_keyboard_layout(self, layout_id):
+        """ This method gets the keyboard layout identifier (KLID), e.g. '00000409'.
+Returns the handle of the layout for switch_keyboard_layout and
+query_keyboard_layout, None if the layout cannot be loaded."""
+        return None
+
+    def switch_keyboard_layout(self, handle):
+        """ Switches the foreground window to the layout.
+Returns True if the switch has been requested, False otherwise."""
+        return False
+
+    def query_keyboard_layout(self, handle):
+        """ Returns the translation table of the layout (see the module layouts),
+None if the backend cannot query it (the shipped layout files are used)."""
+        return None
+
+    def close(self):
+        """ Releases the resources of the backend."""
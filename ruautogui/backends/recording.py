@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# recording.py - a module from ruautogui.backends package that records
+#                the input instead of injecting it.
+# Features:
+#   - every event is written with its time into a preallocated flat buffer
+#     of doubles, so recording an event allocates nothing (the buffer is
+#     doubled when it is full);
+#   - a prepared batch of key events is copied into the buffer by one slice
+#     assignment;
+#   - the cursor, the screen and the keyboard layout are simulated, so
+#     the modules mouse and keyboard work on any platform (e.g. for the tests
+#     and the benchmarks on a headless host);
+#   - the buffer can be read as RecordedEvent tuples or without copying
+#     (e.g. numpy.frombuffer(backend.buffer(), dtype=numpy.float64)).
+
+from array import array
+from collections import namedtuple
+
+from ruautogui import clocks
+from ruautogui.backends.base import Backend
+
+# The kinds of the recorded events and the meaning of their fields a, b, c.
+MOVE = 1    # the cursor has been moved: x, y, 0;
+BUTTON = 2  # a mouse button event: flags (MOUSEEVENTF_*), 0, 0;
+KEY = 3     # a key event: virtual-key code, flags (KEYEVENTF_*), scan code;
+LAYOUT = 4  # the keyboard layout has been switched: language identifier, 0, 0.
+
+# The number of the doubles of an event in the buffer: time, kind, a, b, c.
+FIELDS = 5
+
+# An event: the time in seconds since the beginning of the recording,
+# the kind and the fields (see above).
+RecordedEvent = namedtuple('RecordedEvent', 'time kind a b c')
+
+class RecordingBackend(Backend):
+    """ Records the input events in memory.
+
+The constructor gets the following arguments:
+    capacity - an integer (default = 65536) - the number of the events
+               the buffer is allocated for;
+    screen_size - a tuple (default = (1920, 1080)) - the size of the screen;
+    position - a tuple (default = (0, 0)) - the position of the cursor;
+    layout - an integer (default = 0x0409) - the language identifier of
+               the keyboard layout;
+    clock - a function that returns the current time in seconds
+               (default = None - the clock of the package, see clocks.now)."""
+
+    name = 'recording'
+
+    def __init__(self, capacity=65536, screen_size=(1920, 1080), position=(0, 0), layout=0x0409, clock=None):
+        self.screen_size = tuple(screen_size)
+        self.position = tuple(position)
+        self.layout = layout
+        self.clock = clock if clock is not None else clocks.now
+        self._buffer = array('d', bytes(8 * FIELDS * max(capacity, 1)))
+        self._size = 0
+        self.start = self.clock()
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        """ Drops the recorded events (the buffer stays allocated) and restarts the time."""
+        self._size = 0
+        self.start = self.clock()
+
+    def buffer(self):
+        """ Returns a memoryview of the recorded events: FIELDS doubles per event.
+Release it before recording more events (the buffer cannot grow while it is viewed)."""
+        return memoryview(self._buffer)[:self._size * FIELDS]
+
+    def get_events(self, kind=None):
+        """ Returns the list of RecordedEvent (only the events of the kind if it is given)."""
+        buffer = self._buffer
+        events = []
+        for begin in range(0, self._size * FIELDS, FIELDS):
+            if kind is None or buffer[begin + 1] == kind:
+                events.append(RecordedEvent(
+                    buffer[begin], int(buffer[begin + 1]), int(buffer[begin + 2]),
+                    int(buffer[begin + 3]), int(buffer[begin + 4])
+                ))
+        return events
+
+    def record(self, kind, a=0, b=0, c=0):
+        """ Records an event at the current time."""
+        index = self._reserve(1)
+        buffer = self._buffer
+        buffer[index] = self.clock() - self.start
+        buffer[index + 1] = kind
+        buffer[index + 2] = a
+        buffer[index + 3] = b
+        buffer[index + 4] = c
+
+    def _reserve(self, count):
+        # Returns the index of the first double of the next count events.
+        needed = (self._size + count) * FIELDS
+        if needed > len(self._buffer):
+            # The buffer is at least doubled.
+            growth = max(needed - len(self._buffer), len(self._buffer))
+            self._buffer.extend(array('d', bytes(8 * growth)))
+        index = self._size * FIELDS
+        self._size += count
+        return index
+
+    def get_cursor_position(self):
+        return self.position
+
+    def set_cursor_position(self, x, y):
+        self.position = (x, y)
+        self.record(MOVE, x, y)
+
+    def send_mouse_events(self, flags):
+        for flag in flags:
+            self.record(BUTTON, flag)
+        return len(flags)
+
+    def prepare_key_events(self, vks, flags, scans):
+        # The events are laid out as in the buffer, only the time is left.
+        prepared = array('d', bytes(8 * FIELDS * len(vks)))
+        prepared[1::FIELDS] = array('d', [KEY]) * len(vks)
+        prepared[2::FIELDS] = array('d', vks)
+        prepared[3::FIELDS] = array('d', flags)
+        prepared[4::FIELDS] = array('d', scans)
+        return prepared
+
+    def send_prepared(self, prepared):
+        count = len(prepared) // FIELDS
+        index = self._reserve(count)
+        end = index + len(prepared)
+        self._buffer[index:end] = prepared
+        self._buffer[index:end:FIELDS] = array('d', [self.clock() - self.start]) * count
+        return count
+
+    def get_screen_size(self):
+        return self.screen_size
+
+    def get_keyboard_layout(self, thread_id=0):
+        return self.layout
+
+    def load_keyboard_layout(self, layout_id):
+        return int(layout_id, 16)
+
+    def switch_keyboard_layout(self, handle):
+        self.layout = handle & 0xFFFF
+        self.record(LAYOUT, self.layout)
+        return True
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# win32.py - a module from ruautogui.backends package that injects the input
+#            by the Win32 API (user32.dll).
+# Features:
+#   - the cursor is moved by SetCursorPos, the mouse button and the key
+#     events are sent by SendInput;
+#   - a batch of key events is prepared as an array of INPUT structures and
+#     sent by one SendInput call;
+#   - the keyboard layouts are switched by their handles (HKL) and queried
+#     by VkKeyScanExW.
+
+import ctypes
+import os
+from ctypes import wintypes
+
+from ruautogui import layouts, win32tools
+from ruautogui.backends.base import Backend
+
+# The layout identifiers are compared by the language identifier.
+LANGUAGE_ID_MASK = 2**16 - 1
+
+wintypes.ULONG_PTR = wintypes.WPARAM
+
+INPUT_MOUSE    = 0
+INPUT_KEYBOARD = 1
+INPUT_HARDWARE = 2
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = (("dx",          wintypes.LONG),
+                ("dy",          wintypes.LONG),
+                ("mouseData",   wintypes.DWORD),
+                ("dwFlags",     wintypes.DWORD),
+                ("time",        wintypes.DWORD),
+                ("dwExtraInfo", wintypes.ULONG_PTR))
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = (("wVk",         wintypes.WORD),
+                ("wScan",       wintypes.WORD),
+                ("dwFlags",     wintypes.DWORD),
+                ("time",        wintypes.DWORD),
+                ("dwExtraInfo", wintypes.ULONG_PTR))
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = (("uMsg",    wintypes.DWORD),
+                ("wParamL", wintypes.WORD),
+                ("wParamH", wintypes.WORD))
+
+class INPUT(ctypes.Structure):
+    class _INPUT(ctypes.Union):
+        _fields_ = (("ki", KEYBDINPUT),
+                    ("mi", MOUSEINPUT),
+                    ("hi", HARDWAREINPUT))
+    _anonymous_ = ("_input",)
+    _fields_ = (("type",   wintypes.DWORD),
+                ("_input", _INPUT))
+
+class Win32Backend(Backend):
+    """ Injects the input by user32.dll (Windows only)."""
+
+    name = 'win32'
+    queries_layouts = True
+
+    def __init__(self):
+        self.user32 = win32tools.get_user32()
+        self._input_size = ctypes.sizeof(INPUT)
+
+    def get_cursor_position(self):
+        cursor = win32tools.POINT()
+        self.user32.GetCursorPos(ctypes.byref(cursor))
+        return (cursor.x, cursor.y)
+
+    def set_cursor_position(self, x, y):
+        self.user32.SetCursorPos(x, y)
+
+    def send_mouse_events(self, flags):
+        inputs = (INPUT * len(flags))()
+        for item, flag in zip(inputs, flags):
+            item.type = INPUT_MOUSE
+            item.mi.dwFlags = flag
+        return self.user32.SendInput(len(inputs), inputs, self._input_size)
+
+    def prepare_key_events(self, vks, flags, scans):
+        # The array of the INPUT structures of the key events.
+        inputs = (INPUT * len(vks))()
+        for item, vk, flag, scan in zip(inputs, vks, flags, scans):
+            item.type = INPUT_KEYBOARD
+            item.ki.wVk = vk
+            item.ki.dwFlags = flag
+            item.ki.wScan = scan
+        return inputs
+
+    def send_prepared(self, prepared):
+        return self.user32.SendInput(len(prepared), prepared, self._input_size)
+
+    def get_screen_size(self):
+        return self.user32.GetSystemMetrics(0), self.user32.GetSystemMetrics(1)
+
+    def get_keyboard_layout(self, thread_id=0):
+        if thread_id == 0:
+            current_window = self.user32.GetForegroundWindow()
+            thread_id = self.user32.GetWindowThreadProcessId(current_window, 0)
+        # keyboard_language_id made up of 0xAAABBBB, where
+        # AAA = HKL (handle object), BBBB = language ID
+        return self.user32.GetKeyboardLayout(thread_id) & LANGUAGE_ID_MASK
+
+    def load_keyboard_layout(self, layout_id):
+        return self.user32.LoadKeyboardLayoutW(layout_id, 0) or None
+
+    def switch_keyboard_layout(self, handle):
+        # A switch posts WM_INPUTLANGCHANGEREQUEST to the foreground window (the
+        # window handles it before the keystrokes that follow).
+        user32 = self.user32
+        window = user32.GetForegroundWindow()
+        if not window:
+            return False
+        # The windows of this process are switched at once.
+        process_id = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(window, ctypes.byref(process_id))
+        if process_id.value == os.getpid():
+            user32.ActivateKeyboardLayout(handle, win32tools.KLF_SETFORPROCESS)
+        return bool(user32.PostMessageW(window, win32tools.WM_INPUTLANGCHANGEREQUEST, 0, handle))
+
+    def query_keyboard_layout(self, handle):
+        # The table is built by VkKeyScanExW for every printable character of
+        # the BMP. The characters that need other modifiers than shift, ctrl and
+        # alt, as well as the dead-key ones, are omitted.
+        vk_key_scan = self.user32.VkKeyScanExW
+        vk_key_scan.argtypes = (ctypes.c_wchar, ctypes.c_void_p)
+        vk_key_scan.restype = ctypes.c_short
+        table = {}
+        for code_point in range(0x20, 0x10000):
+            # The surrogates are not characters.
+            if 0xD800 <= code_point <= 0xDFFF:
+                continue
+            result = vk_key_scan(chr(code_point), handle)
+            if result == -1:
+                continue
+            vk = result & 0xFF
+            modifiers = (result >> 8) & 0xFF
+            if modifiers & ~(layouts.SHIFT | layouts.CTRL | layouts.ALT):
+                continue
+            table[code_point] = (vk, modifiers)
+        return table
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+#
+# x11.py - a module from ruautogui.backends package that injects the input
+#          into an X server by the XTest extension (e.g. under Xvfb).
+# Features:
+#   - libX11 and libXtst are loaded by ctypes, no other dependencies;
+#   - the virtual-key codes are translated into the keysyms and the keycodes
+#     of the keymap of the server (the translation is cached);
+#   - the KEYEVENTF_UNICODE events are typed by the keysym of the character:
+#     by the key that types it without modifiers in the current group if there
+#     is one, otherwise a spare keycode of the keymap is mapped to the keysym
+#     for the time of the event (so the case and the group do not matter);
+#     the surrogate pairs are typed as one character;
+#   - the keyboard layouts are the groups of the XKB keymap, switched by
+#     XkbLockGroup in the order of the loaded layouts (e.g. for english and
+#     russian run 'setxkbmap -layout us,ru').
+
+import ctypes
+import ctypes.util
+import os
+
+from ruautogui.backends.base import (
+    Backend,
+    KEYEVENTF_KEYUP,
+    KEYEVENTF_UNICODE,
+    MOUSEEVENTF_LEFTDOWN,
+    MOUSEEVENTF_LEFTUP,
+    MOUSEEVENTF_MIDDLEDOWN,
+    MOUSEEVENTF_MIDDLEUP,
+    MOUSEEVENTF_RIGHTDOWN,
+    MOUSEEVENTF_RIGHTUP
+)
+
+# The device of XkbLockGroup: the core keyboard.
+XKB_USE_CORE_KBD = 0x0100
+# The keysym of an empty entry of the keymap.
+NO_SYMBOL = 0
+
+# The X buttons and the press flags of the mouse button events.
+BUTTONS = {
+    MOUSEEVENTF_LEFTDOWN: (1, True),
+    MOUSEEVENTF_LEFTUP: (1, False),
+    MOUSEEVENTF_MIDDLEDOWN: (2, True),
+    MOUSEEVENTF_MIDDLEUP: (2, False),
+    MOUSEEVENTF_RIGHTDOWN: (3, True),
+    MOUSEEVENTF_RIGHTUP: (3, False)
+}
+
+# The keysyms of the virtual keys that are not letters or digits.
+KEYSYMS = {
+    0x08: 0xFF08,  # VK_BACK - BackSpace
+    0x09: 0xFF09,  # VK_TAB - Tab
+    0x0C: 0xFF0B,  # VK_CLEAR - Clear
+    0x0D: 0xFF0D,  # VK_RETURN - Return
+    0x10: 0xFFE1,  # VK_SHIFT - Shift_L
+    0x11: 0xFFE3,  # VK_CONTROL - Control_L
+    0x12: 0xFFE9,  # VK_MENU - Alt_L
+    0x13: 0xFF13,  # VK_PAUSE - Pause
+    0x14: 0xFFE5,  # VK_CAPITAL - Caps_Lock
+    0x1B: 0xFF1B,  # VK_ESCAPE - Escape
+    0x20: 0x0020,  # VK_SPACE - space
+    0x21: 0xFF55,  # VK_PRIOR - Prior
+    0x22: 0xFF56,  # VK_NEXT - Next
+    0x23: 0xFF57,  # VK_END - End
+    0x24: 0xFF50,  # VK_HOME - Home
+    0x25: 0xFF51,  # VK_LEFT - Left
+    0x26: 0xFF52,  # VK_UP - Up
+    0x27: 0xFF53,  # VK_RIGHT - Right
+    0x28: 0xFF54,  # VK_DOWN - Down
+    0x29: 0xFF60,  # VK_SELECT - Select
+    0x2A: 0xFF61,  # VK_PRINT - Print
+    0x2B: 0xFF62,  # VK_EXECUTE - Execute
+    0x2C: 0xFF61,  # VK_SNAPSHOT - Print
+    0x2D: 0xFF63,  # VK_INSERT - Insert
+    0x2E: 0xFFFF,  # VK_DELETE - Delete
+    0x2F: 0xFF6A,  # VK_HELP - Help
+    0x5B: 0xFFEB,  # VK_LWIN - Super_L
+    0x5C: 0xFFEC,  # VK_RWIN - Super_R
+    0x5D: 0xFF67,  # VK_APPS - Menu
+    0x6A: 0xFFAA,  # VK_MULTIPLY - KP_Multiply
+    0x6B: 0xFFAB,  # VK_ADD - KP_Add
+    0x6D: 0xFFAD,  # VK_SUBTRACT - KP_Subtract
+    0x6E: 0xFFAE,  # VK_DECIMAL - KP_Decimal
+    0x6F: 0xFFAF,  # VK_DIVIDE - KP_Divide
+    0x90: 0xFF7F,  # VK_NUMLOCK - Num_Lock
+    0x91: 0xFF14,  # VK_SCROLL - Scroll_Lock
+    0xA0: 0xFFE1,  # VK_LSHIFT - Shift_L
+    0xA1: 0xFFE2,  # VK_RSHIFT - Shift_R
+    0xA2: 0xFFE3,  # VK_LCONTROL - Control_L
+    0xA3: 0xFFE4,  # VK_RCONTROL - Control_R
+    0xA4: 0xFFE9,  # VK_LMENU - Alt_L
+    0xA5: 0xFFEA,  # VK_RMENU - Alt_R
+    0xAD: 0x1008FF12,  # VK_VOLUME_MUTE - XF86AudioMute
+    0xAE: 0x1008FF11,  # VK_VOLUME_DOWN - XF86AudioLowerVolume
+    0xAF: 0x1008FF13,  # VK_VOLUME_UP - XF86AudioRaiseVolume
+    0xB0: 0x1008FF17,  # VK_MEDIA_NEXT_TRACK - XF86AudioNext
+    0xB1: 0x1008FF16,  # VK_MEDIA_PREV_TRACK - XF86AudioPrev
+    0xB2: 0x1008FF15,  # VK_MEDIA_STOP - XF86AudioStop
+    0xB3: 0x1008FF14,  # VK_MEDIA_PLAY_PAUSE - XF86AudioPlay
+    0xBA: 0x003B,  # VK_OEM_1 - semicolon
+    0xBB: 0x003D,  # VK_OEM_PLUS - equal
+    0xBC: 0x002C,  # VK_OEM_COMMA - comma
+    0xBD: 0x002D,  # VK_OEM_MINUS - minus
+    0xBE: 0x002E,  # VK_OEM_PERIOD - period
+    0xBF: 0x002F,  # VK_OEM_2 - slash
+    0xC0: 0x0060,  # VK_OEM_3 - grave
+    0xDB: 0x005B,  # VK_OEM_4 - bracketleft
+    0xDC: 0x005C,  # VK_OEM_5 - backslash
+    0xDD: 0x005D,  # VK_OEM_6 - bracketright
+    0xDE: 0x0027   # VK_OEM_7 - apostrophe
+}
+
+def get_keysym(vk):
+    """ Returns the X keysym of the virtual-key code, None if there is none."""
+    if 0x30 <= vk <= 0x39:
+        return vk
+    # The letters are the lowercase keysyms, the shift is a separate event.
+    if 0x41 <= vk <= 0x5A:
+        return vk + 0x20
+    # The keypad digits and the function keys F1-F24.
+    if 0x60 <= vk <= 0x69:
+        return 0xFFB0 + vk - 0x60
+    if 0x70 <= vk <= 0x87:
+        return 0xFFBE + vk - 0x70
+    return KEYSYMS.get(vk)
+
+def get_unicode_keysym(code_point):
+    """ Returns the X keysym of the character (Latin-1 or a Unicode keysym)."""
+    if 0x20 <= code_point <= 0x7E or 0xA0 <= code_point <= 0xFF:
+        return code_point
+    return 0x01000000 | code_point
+
+def _load_library(name):
+    path = ctypes.util.find_library(name)
+    if path is None:
+        raise OSError(f'Cannot find the library {name}')
+    return ctypes.CDLL(path)
+
+class X11Backend(Backend):
+    """ Injects the input into an X server by XTest.
+
+The constructor gets the name of the display (default = None - the DISPLAY
+environment variable). OSError is raised if the libraries or the display
+are not available."""
+
+    name = 'x11'
+
+    def __init__(self, display=None):
+        xlib = _load_library('X11')
+        xtst = _load_library('Xtst')
+        xlib.XOpenDisplay.argtypes = (ctypes.c_char_p,)
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XCloseDisplay.argtypes = (ctypes.c_void_p,)
+        xlib.XDefaultRootWindow.argtypes = (ctypes.c_void_p,)
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultScreen.argtypes = (ctypes.c_void_p,)
+        xlib.XDisplayWidth.argtypes = (ctypes.c_void_p, ctypes.c_int)
+        xlib.XDisplayHeight.argtypes = (ctypes.c_void_p, ctypes.c_int)
+        xlib.XFlush.argtypes = (ctypes.c_void_p,)
+        xlib.XQueryPointer.argtypes = (
+            ctypes.c_void_p, ctypes.c_ulong,
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_uint)
+        )
+        xlib.XKeysymToKeycode.argtypes = (ctypes.c_void_p, ctypes.c_ulong)
+        xlib.XKeysymToKeycode.restype = ctypes.c_ubyte
+        xlib.XkbLockGroup.argtypes = (ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint)
+        xlib.XDisplayKeycodes.argtypes = (ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int))
+        xlib.XGetKeyboardMapping.argtypes = (ctypes.c_void_p, ctypes.c_ubyte, ctypes.c_int, ctypes.POINTER(ctypes.c_int))
+        xlib.XGetKeyboardMapping.restype = ctypes.POINTER(ctypes.c_ulong)
+        xlib.XChangeKeyboardMapping.argtypes = (
+            ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_ulong), ctypes.c_int
+        )
+        xlib.XSync.argtypes = (ctypes.c_void_p, ctypes.c_int)
+        xlib.XFree.argtypes = (ctypes.c_void_p,)
+        xtst.XTestFakeMotionEvent.argtypes = (ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong)
+        xtst.XTestFakeButtonEvent.argtypes = (ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong)
+        xtst.XTestFakeKeyEvent.argtypes = (ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong)
+
+        if display is None:
+            display = os.environ.get('DISPLAY')
+        self.display = xlib.XOpenDisplay(display.encode() if display else None)
+        if not self.display:
+            raise OSError(f'Cannot open the X display {display}')
+        self.xlib = xlib
+        self.xtst = xtst
+        self.root = xlib.XDefaultRootWindow(self.display)
+        self.screen = xlib.XDefaultScreen(self.display)
+        self._keycodes = {}
+        # The loaded layouts in the order of the groups of the keymap.
+        self._groups = []
+        self._group = 0
+        self.layout = None
+        # The keysyms of every keycode, the keycodes without keysyms, the spare
+        # keycodes assigned to the keysyms by prepare_key_events and the keysyms
+        # they are mapped to on the server (see _get_unicode_keycode).
+        self._keymap = None
+        self._spare = None
+        self._assigned = {}
+        self._remapped = {}
+        self._next_spare = 0
+
+    def _get_keycode(self, keysym):
+        # Returns the keycode of the keysym in the keymap of the server, 0 if
+        # there is none.
+        keycode = self._keycodes.get(keysym)
+        if keycode is None:
+            keycode = self.xlib.XKeysymToKeycode(self.display, keysym) if keysym is not None else 0
+            self._keycodes[keysym] = keycode
+        return keycode
+
+    def _load_keymap(self):
+        # Reads the keysyms of all the keycodes of the server.
+        minimum, maximum = ctypes.c_int(), ctypes.c_int()
+        self.xlib.XDisplayKeycodes(self.display, ctypes.byref(minimum), ctypes.byref(maximum))
+        count = maximum.value - minimum.value + 1
+        per_keycode = ctypes.c_int()
+        keysyms = self.xlib.XGetKeyboardMapping(self.display, minimum.value, count, ctypes.byref(per_keycode))
+        per_keycode = per_keycode.value
+        self._keymap = {
+            minimum.value + i: tuple(keysyms[i * per_keycode:(i + 1) * per_keycode]) for i in range(count)
+        }
+        self.xlib.XFree(keysyms)
+        # The highest free keycodes are used first, as they are the least likely
+        # to get a key later.
+        self._spare = sorted(
+            (keycode for keycode, symbols in self._keymap.items() if not any(symbols)), reverse=True
+        )
+
+    def _get_unicode_keycode(self, keysym):
+        # Returns a tuple: the keycode that types the keysym and the keysym to map
+        # the keycode to before the event (None if the keymap types it as it is).
+        # OSError is raised if the keymap has no free keycode to map.
+        if self._keymap is None:
+            self._load_keymap()
+        # The columns of the core keymap: the lower and the upper keysyms of the
+        # first group, of the second one and so on.
+        column = 2 * self._group
+        for keycode, symbols in self._keymap.items():
+            if column < len(symbols) and symbols[column] == keysym:
+                return keycode, None
+        # The press and the release of a character get the same keycode.
+        keycode = self._assigned.get(keysym)
+        if keycode is None:
+            if not self._spare:
+                raise OSError(f'The keymap of the X server has no free keycode to type the keysym {keysym:#x}')
+            keycode = self._spare[self._next_spare % len(self._spare)]
+            self._next_spare += 1
+            for assigned, other in list(self._assigned.items()):
+                if other == keycode:
+                    del self._assigned[assigned]
+            self._assigned[keysym] = keycode
+        return keycode, keysym
+
+    def _map_keycode(self, keycode, keysym):
+        # Maps all the columns of the keycode to the keysym (NO_SYMBOL - frees it).
+        per_keycode = len(self._keymap[keycode])
+        keysyms = (ctypes.c_ulong * per_keycode)(*[keysym] * per_keycode)
+        self.xlib.XChangeKeyboardMapping(self.display, keycode, per_keycode, keysyms, 1)
+        # The new mapping is applied before the key event is sent.
+        self.xlib.XSync(self.display, False)
+        if keysym == NO_SYMBOL:
+            self._remapped.pop(keycode, None)
+        else:
+            self._remapped[keycode] = keysym
+
+    def get_cursor_position(self):
+        window = ctypes.c_ulong()
+        root_x, root_y = ctypes.c_int(), ctypes.c_int()
+        window_x, window_y = ctypes.c_int(), ctypes.c_int()
+        mask = ctypes.c_uint()
+        self.xlib.XQueryPointer(
+            self.display, self.root, ctypes.byref(window), ctypes.byref(window),
+            ctypes.byref(root_x), ctypes.byref(root_y),
+            ctypes.byref(window_x), ctypes.byref(window_y), ctypes.byref(mask)
+        )
+        return (root_x.value, root_y.value)
+
+    def set_cursor_position(self, x, y):
+        self.xtst.XTestFakeMotionEvent(self.display, -1, x, y, 0)
+        self.xlib.XFlush(self.display)
+
+    def send_mouse_events(self, flags):
+        sent = 0
+        for flag in flags:
+            button = BUTTONS.get(flag)
+            if button is not None:
+                self.xtst.XTestFakeButtonEvent(self.display, button[0], button[1], 0)
+                sent += 1
+        self.xlib.XFlush(self.display)
+        return sent
+
+    def prepare_key_events(self, vks, flags, scans):
+        # The events are translated into tuples (keycode, press, keysym to map
+        # the keycode to or None); the virtual keys that the keymap cannot type
+        # are dropped. The two halves of a surrogate pair are one event.
+        prepared = []
+        high_surrogates = {}
+        for vk, flag, scan in zip(vks, flags, scans):
+            press = not flag & KEYEVENTF_KEYUP
+            if flag & KEYEVENTF_UNICODE:
+                if 0xD800 <= scan <= 0xDBFF:
+                    high_surrogates[press] = scan
+                    continue
+                if 0xDC00 <= scan <= 0xDFFF and press in high_surrogates:
+                    scan = 0x10000 + (high_surrogates.pop(press) - 0xD800 << 10) + scan - 0xDC00
+                keycode, mapping = self._get_unicode_keycode(get_unicode_keysym(scan))
+                prepared.append((keycode, press, mapping))
+                continue
+            keycode = self._get_keycode(get_keysym(vk))
+            if keycode:
+                prepared.append((keycode, press, None))
+        return prepared
+
+    def send_prepared(self, prepared):
+        fake_key_event = self.xtst.XTestFakeKeyEvent
+        display = self.display
+        for keycode, press, mapping in prepared:
+            if mapping is not None and self._remapped.get(keycode) != mapping:
+                self._map_keycode(keycode, mapping)
+            fake_key_event(display, keycode, press, 0)
+        self.xlib.XFlush(display)
+        return len(prepared)
+
+    def get_screen_size(self):
+        return (
+            self.xlib.XDisplayWidth(self.display, self.screen),
+            self.xlib.XDisplayHeight(self.display, self.screen)
+        )
+
+    def get_keyboard_layout(self, thread_id=0):
+        return self.layout
+
+    def load_keyboard_layout(self, layout_id):
+        handle = int(layout_id, 16)
+        if handle not in self._groups:
+            self._groups.append(handle)
+        return handle
+
+    def switch_keyboard_layout(self, handle):
+        if handle not in self._groups:
+            return False
+        self._group = self._groups.index(handle)
+        self.xlib.XkbLockGroup(self.display, XKB_USE_CORE_KBD, self._group)
+        self.xlib.XFlush(self.display)
+        self.layout = handle & 0xFFFF
+        return True
+
+    def close(self):
+        if self.display:
+            # The spare keycodes are freed for the other clients.
+            for keycode in list(self._remapped):
+                self._map_keycode(keycode, NO_SYMBOL)
+            self.xlib.XCloseDisplay(self.display)
+            self.display = None
@@ -2,38 +2,72 @@
 
 import logging
 logger = logging.getLogger('ruautogui.bezier')
-logger.setLevel(logging.DEBUG)
-
-logConsoleHandler = logging.StreamHandler()
-formatterConsole = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
-logConsoleHandler.setFormatter(formatterConsole)
-logger.addHandler(logConsoleHandler)
-
-logFileHandler = logging.FileHandler(f'ruautogui.log')
-formatterFile = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logFileHandler.setFormatter(formatterFile)
-logger.addHandler(logFileHandler) 
 
+import bisect
+import functools
 import math
+from fractions import Fraction
 import random
 import time
-import ctypes
+
+from ruautogui import backends, lazy
+from ruautogui.trajectory import Trajectory
+
+# NumPy is an optional dependency. If it is installed, the points of the curves
+# are calculated by the vectorized engine (see the function 'evaluate_curve').
+# It is imported at the first use (see the module lazy).
+numpy = lazy.import_optional('numpy')
+
+# The names of the engines that can be used to calculate the points of a curve:
+#   'python' - the pure Python implementation (a loop over the time stamps);
+#   'numpy' - the Bernstein basis matrix is built for all the time stamps at once
+#             and the points are obtained by one matrix product;
+#   'exact' - the points are calculated in exact rational arithmetic with integer
+#             binomial coefficients, so the result does not depend on the order
+#             of the curve (use it for curves with hundreds of control points).
+# 'auto' chooses 'numpy' if NumPy is installed, otherwise 'python'.
+# The orders above MAXIMUM_FLOAT_ORDER are always calculated by 'exact' because
+# the binomial coefficients do not fit into a float.
+ENGINES = ('python', 'numpy', 'exact')
+MAXIMUM_FLOAT_ORDER = 1000
+
+# The maximum number of the Bernstein basis tables kept by the numpy engine.
+# A table is determined by the order of a curve and the grid of time stamps,
+# i.e. the transition time and the step; mouse movements use a small set of them.
+BASIS_CACHE_SIZE = 1024
+
+# The names of the ways to choose the points of a curve:
+#   'uniform' - the points are evenly spaced in time, one point per step;
+#   'adaptive' - the points are spaced along the curve by its length and curvature,
+#                consecutive duplicate pixels are dropped and the time of the dropped
+#                points is given to the remaining ones, so the transition time
+#                stays the same with fewer points.
+SAMPLINGS = ('uniform', 'adaptive')
+# The default time in milliseconds between two points of a curve. The mouse module
+# passes the frame time measured on the host instead (see calibration).
+DEFAULT_FRAME_TIME = 13
+# The adaptive sampling measures the curve on a grid that is this many times
+# denser than the uniform one.
+ADAPTIVE_OVERSAMPLING = 8
+# The minimum distance in pixels between the points chosen by the adaptive sampling.
+ADAPTIVE_MINIMUM_STEP = 2
+# The number of pixels that one radian of turning adds to the length of the curve
+# when the adaptive sampling spaces the points. The more the value, the more points
+# are put on the bends of the curve.
+CURVATURE_WEIGHT = 20
 
 def get_mouse_cursor_position():
-    cursor = POINT()
-    ctypes.windll.user32.GetCursorPos(ctypes.byref(cursor))
-    return (cursor.x, cursor.y)
-    
-class POINT(ctypes.Structure):
-    _fields_ = [("x", ctypes.c_long),
-                ("y", ctypes.c_long)]
+    return backends.get_backend().get_cursor_position()
 
 def get_curve_points(
         begin_pos=None, 
         end_pos=(100,100),
         order=2,
         control_points=[],
-        transition_time=None
+        transition_time=None,
+        engine='auto',
+        sampling='uniform',
+        frame_time=None
     ):
     """ This function gets the following arguments:
     begin_pos - a tuple of x and y coordinates of the starting point 
@@ -50,8 +84,17 @@ def get_curve_points(
                 randomily).
     transition_time - an integer - transition time in milliseconds
                 (default is None - the transition time will be calculated randomily)
+    engine - a string - the name of the engine that calculates the points
+                (default = 'auto' - NumPy is used if it is installed,
+                see ENGINES for the possible values);
+    sampling - a string - the way to choose the points of the curve
+                (default = 'uniform', see SAMPLINGS for the possible values);
+    frame_time - a number - the time between two points in milliseconds
+                (default = None - DEFAULT_FRAME_TIME).
 Returns:
-    points - a tuple of tuples of x and y coordinates of the Bezier curve;
+    points - a Trajectory of x and y coordinates of the Bezier curve with 
+        the time stamps of the points in milliseconds (it iterates and indexes
+        like a tuple of tuples, see the module trajectory);
     control_points - a tuple of tuples of x and y coordinates of the control
         points, including the starting  and the ending points;
     transition_time - an integer in milliseconds of the transition time.
@@ -68,16 +111,56 @@ Returns:
     if transition_time == None:
         transition_time = get_random_travel_time(begin_pos, end_pos)
 
-    logger.debug(f'The transition time is {transition_time}')
 
     # The optimal number of points is calculated keeping in mind that the points of the curve
     # could be used for automatic mouse movement. Therefore, the sleep time between
-    # the movements should be greater than 13 milliseconds.
-    optimal_number_of_points = int(transition_time / 13)
+    # the movements should be greater than the frame time of the host.
+    STEP = get_step(transition_time, frame_time)
+    # The list is copied: neither the default argument nor the list of the caller
+    # may grow from call to call.
+    control_points = list(control_points)
+    _complete_control_points(control_points, begin_pos, end_pos, order)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('The transition time is %s', transition_time)
+        logger.debug('Control points: %s', control_points)
+        logger.debug('ORDER: %s', order)
+
+    # The numpy engine takes the basis table for the grid of time stamps from the cache,
+    # so only a small matrix product is left to calculate the points.
+    engine = _resolve_engine(engine, len(control_points) - 1)
+    milliseconds = range(0, transition_time + 1, STEP)
+    if sampling == 'adaptive':
+        points = _sample_adaptive(control_points, transition_time, STEP, engine)
+        logger.debug('Adaptive sampling: %s points instead of %s', len(points), len(milliseconds))
+    elif sampling != 'uniform':
+        raise ValueError(f'Unknown sampling {sampling}, the possible values are {SAMPLINGS}')
+    elif engine == 'numpy':
+        basis = get_basis_table(len(control_points) - 1, transition_time, STEP)
+        points = Trajectory.from_buffer(_evaluate_basis_array(basis, control_points), milliseconds)
+    else:
+        time_stamps = get_time_stamps(transition_time, STEP, exact=(engine == 'exact'))
+        points = Trajectory(evaluate_curve(control_points, time_stamps, engine), milliseconds)
+
+    return points, tuple(control_points), transition_time
+
+def get_step(transition_time, frame_time=None):
+    """ This function gets the transition time and the frame time (default = None -
+DEFAULT_FRAME_TIME) both in milliseconds.
+Returns the step in milliseconds between two points of the uniform sampling."""
+    if frame_time is None:
+        frame_time = DEFAULT_FRAME_TIME
+    optimal_number_of_points = int(transition_time / frame_time)
     if optimal_number_of_points == 0:
         optimal_number_of_points = 1
-    logger.debug(f'Optimal number of points: {optimal_number_of_points}')
+    step = int(transition_time / optimal_number_of_points)
+    if step == 0:
+        step = 1
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('Optimal number of points: %s', optimal_number_of_points)
+        logger.debug('The optimal step for calculating the points is %s milliseconds.', step)
+    return step
 
+def _complete_control_points(control_points, begin_pos, end_pos, order):
     # The controls point are not passed as an argument to the function.
     # Therefore, they will be chosen randomily. The number of control points
     # are one less than the order of the curve.
@@ -95,18 +178,278 @@ Returns:
         control_points.insert(0, begin_pos)
         control_points.append(end_pos)
 
-    logger.debug(f'Control points: {control_points}')
-    logger.debug(f'ORDER: {order}')
+class CurveStream:
+    """ Yields the points of a Bezier curve one by one, just in time.
+
+The constructor gets the same arguments as get_curve_points (without sampling,
+which is always uniform); the default engine is 'auto' as well and it is resolved
+by the degree of the current control points, so the points are the ones
+get_curve_points returns for the same curve (the numpy engine calculates only
+the row of the basis of the requested point, see get_bernstein_basis).
+
+Iterating over the stream yields tuples (x, y, deadline): the integer coordinates
+of a point and the time in seconds since the beginning of the movement when the
+cursor has to be there. Only the control points are kept in memory, every point
+is evaluated when it is requested, so the end point and the control points can be
+changed between two points (see set_end_pos and set_control_points); the following
+points belong to the changed curve."""
+
+    def __init__(
+            self,
+            begin_pos=None,
+            end_pos=(100,100),
+            order=2,
+            control_points=None,
+            transition_time=None,
+            engine='auto',
+            frame_time=None
+        ):
+        if begin_pos is None:
+            begin_pos = get_mouse_cursor_position()
+        if order < 2:
+            order = 1
+        if transition_time is None:
+            transition_time = get_random_travel_time(begin_pos, end_pos)
+        self.transition_time = transition_time
+        self.step = get_step(transition_time, frame_time)
+        # An unknown or unavailable engine is reported at once.
+        _resolve_engine(engine)
+        self.engine = engine
+        self.control_points = list(control_points or [])
+        _complete_control_points(self.control_points, begin_pos, end_pos, order)
+
+    def __len__(self):
+        return len(range(0, self.transition_time + 1, self.step))
+
+    def __iter__(self):
+        for milliseconds in range(0, self.transition_time + 1, self.step):
+            # The control points (and their number) can change between two points.
+            order = len(self.control_points) - 1
+            engine = _resolve_engine(self.engine, order)
+            if engine == 'numpy':
+                # The same row as in the table of get_curve_points (see get_time_stamps).
+                basis = get_bernstein_basis(order, (milliseconds / self.transition_time,))
+                x, y = _evaluate_basis_array(basis, self.control_points)[0].tolist()
+            else:
+                time_stamp = milliseconds / self.transition_time
+                if engine == 'exact':
+                    time_stamp = Fraction(milliseconds, self.transition_time)
+                x, y = evaluate_curve(self.control_points, (time_stamp,), engine)[0]
+            yield x, y, milliseconds / 1000
+
+    def set_end_pos(self, end_pos):
+        """ Changes the end point of the curve."""
+        self.control_points[-1] = end_pos
+
+    def set_control_points(self, control_points):
+        """ Changes the control points between the begin and the end points 
+(a list of tuples; their number can differ from the current one)."""
+        self.control_points[1:-1] = control_points
+
+def get_path_times(waypoints, transition_time=None):
+    """ This function gets a list of tuples of x and y coordinates of the waypoints
+and the transition time of the path: an integer in milliseconds (it is divided
+between the segments by their lengths), a list of integers (the time of every
+segment) or None (a random time of every segment, see get_random_travel_time).
+Returns a list of the transition times of the segments in milliseconds."""
+    segments = list(zip(waypoints, waypoints[1:]))
+    if transition_time is None:
+        return [get_random_travel_time(begin_pos, end_pos) for begin_pos, end_pos in segments]
+    if not isinstance(transition_time, (int, float)):
+        transition_times = list(transition_time)
+        if len(transition_times) != len(segments):
+            raise ValueError('The number of the transition times differs from the number of the segments')
+        return transition_times
+    lengths = [math.hypot(end_pos[0] - begin_pos[0], end_pos[1] - begin_pos[1]) for begin_pos, end_pos in segments]
+    total = sum(lengths)
+    if total == 0:
+        return [max(1, int(transition_time // len(segments)))] * len(segments)
+    return [max(1, int(transition_time * length / total)) for length in lengths]
+
+def get_path_points(waypoints, transition_times, stops=(), frame_time=None, engine='auto'):
+    """ This function gets the following arguments:
+    waypoints - a list of tuples of x and y coordinates of the waypoints 
+                (at least two), the first one is the starting point;
+    transition_times - a list of integers - the transition time in milliseconds
+                of every segment between two waypoints (see get_path_times);
+    stops - a collection of the indices of the waypoints where the cursor stops,
+                e.g. to click (default = () - it starts from rest at the first
+                waypoint and stops only at the last one);
+    frame_time - the same as of get_curve_points;
+    engine - a string (default = 'auto') - the engine that calculates the points
+                of the segments when NumPy is not used (see ENGINES).
+Every segment is a cubic Bezier curve: the path is a Catmull-Rom spline with
+the tangents scaled by the time, so the direction and the speed of the cursor
+do not jump at the waypoints. The points of all the segments are calculated 
+by one matrix product if NumPy is installed.
+Returns:
+    points - a Trajectory of the points of the path (the waypoints included)
+        with the time stamps in milliseconds from the beginning of the path;
+    control_points - a list of tuples of the four control points of every segment;
+    arrivals - a list of the times in milliseconds the waypoints are reached at."""
+    if len(waypoints) < 2:
+        raise ValueError('A path needs at least two waypoints')
+    arrivals = [0]
+    for transition_time in transition_times:
+        arrivals.append(arrivals[-1] + transition_time)
+
+    # The velocity at every waypoint in pixels per millisecond: the difference of
+    # the neighbours divided by the time between them (zero at the stops, the first
+    # and the last waypoints: the cursor eases in and out).
+    last = len(waypoints) - 1
+    velocities = []
+    for i in range(len(waypoints)):
+        previous = max(i - 1, 0)
+        following = min(i + 1, last)
+        duration = arrivals[following] - arrivals[previous]
+        if i == 0 or i == last or i in stops or duration <= 0:
+            velocities.append((0.0, 0.0))
+        else:
+            velocities.append((
+                (waypoints[following][0] - waypoints[previous][0]) / duration,
+                (waypoints[following][1] - waypoints[previous][1]) / duration
+            ))
+    control_points = []
+    for i, transition_time in enumerate(transition_times):
+        third = transition_time / 3
+        begin_pos = waypoints[i]
+        end_pos = waypoints[i + 1]
+        control_points.append((
+            tuple(begin_pos),
+            (begin_pos[0] + velocities[i][0] * third, begin_pos[1] + velocities[i][1] * third),
+            (end_pos[0] - velocities[i + 1][0] * third, end_pos[1] - velocities[i + 1][1] * third),
+            tuple(end_pos)
+        ))
+
+    # The parameters of the points: every segment gets one point per step,
+    # its last point is the waypoint.
+    segments = [0]
+    parameters = [0.0]
+    milliseconds = [0]
+    for i, transition_time in enumerate(transition_times):
+        count = max(1, transition_time // get_step(max(transition_time, 1), frame_time))
+        for k in range(1, count + 1):
+            segments.append(i)
+            parameters.append(k / count)
+            milliseconds.append(arrivals[i] + transition_time * k / count)
 
-    # Calculated points of the Bezier curve are added to the following list.
+    engine = _resolve_engine(engine, 3)
+    if engine == 'numpy':
+        basis = get_bernstein_basis(3, parameters)
+        controls = numpy.array(control_points, dtype=numpy.float64)[segments]
+        points = numpy.einsum('nk,nkd->nd', basis, controls).astype(numpy.int32)
+        return Trajectory.from_buffer(points, milliseconds), control_points, arrivals
     points = []
+    begin = 0
+    for i in range(len(control_points)):
+        end = bisect.bisect_right(segments, i, begin)
+        points.extend(evaluate_curve(control_points[i], parameters[begin:end], engine))
+        begin = end
+    return Trajectory(points, milliseconds), control_points, arrivals
 
-    STEP = int(transition_time / optimal_number_of_points)
-    if STEP == 0:
-        STEP = 1
-    logger.debug(f'The optimal step for calculating the points is {STEP} milliseconds.')
-    time_stamps = [t / (transition_time) for t in range(0, transition_time + 1, STEP)]
+def evaluate_curve(control_points, time_stamps, engine='auto'):
+    """ This function gets the following arguments:
+    control_points - a list of tuples of x and y coordinates of the control points,
+                including the starting and the ending points;
+    time_stamps - a list of floats from 0 to 1 - the values of the curve parameter
+                (the 'exact' engine also accepts instances of fractions.Fraction);
+    engine - a string - the name of the engine (default = 'auto').
+Returns a list of tuples of integer x and y coordinates of the curve points,
+one point per time stamp."""
+    engine = _resolve_engine(engine, len(control_points) - 1)
+    if engine == 'numpy':
+        return _evaluate_numpy(control_points, time_stamps)
+    elif engine == 'exact':
+        return _evaluate_exact(control_points, time_stamps)
+    return _evaluate_python(control_points, time_stamps)
+
+def _sample_adaptive(control_points, transition_time, step, engine):
+    # The curve is measured on a dense grid of time stamps.
+    dense_count = max(1, transition_time // step) * ADAPTIVE_OVERSAMPLING
+    time_stamps = [k / dense_count for k in range(dense_count + 1)]
+    if engine == 'exact':
+        dense_points = _evaluate_exact(control_points, [Fraction(k, dense_count) for k in range(dense_count + 1)])
+    else:
+        dense_points = _evaluate_float(control_points, time_stamps)
+
+    # The length of every piece of the curve plus the weighted turn of the curve at it.
+    weights = [0.0]
+    previous_angle = None
+    for k in range(dense_count):
+        dx = dense_points[k + 1][0] - dense_points[k][0]
+        dy = dense_points[k + 1][1] - dense_points[k][1]
+        weight = math.hypot(dx, dy)
+        if weight > 0:
+            angle = math.atan2(dy, dx)
+            if previous_angle is not None:
+                turn = abs((angle - previous_angle + math.pi) % (2 * math.pi) - math.pi)
+                weight += CURVATURE_WEIGHT * turn
+            previous_angle = angle
+        weights.append(weights[-1] + weight)
 
+    # The points are evenly spaced by the weighted length. Every point keeps the time
+    # at which the cursor passes it on the curve, so the movement itself is the same,
+    # but there are never more points than steps of the uniform sampling.
+    number_of_points = max(1, min(transition_time // step, int(weights[-1] / ADAPTIVE_MINIMUM_STEP)))
+    begin_pos = (int(dense_points[0][0]), int(dense_points[0][1]))
+    points = [begin_pos]
+    milliseconds = [0]
+    for j in range(1, number_of_points + 1):
+        if j == number_of_points:
+            k = dense_count
+        else:
+            k = bisect.bisect_left(weights, weights[-1] * j / number_of_points)
+        point = (int(dense_points[k][0]), int(dense_points[k][1]))
+        time_stamp = transition_time * k / dense_count
+        # Consecutive duplicates are dropped, the time goes to the next point.
+        if point == points[-1]:
+            continue
+        # The points must not be closer in time than one step; the last point
+        # replaces the previous one (but not the starting one) if they are too close.
+        if time_stamp - milliseconds[-1] < step:
+            if j < number_of_points:
+                continue
+            if len(points) > 1:
+                points.pop()
+                milliseconds.pop()
+            if point == points[-1]:
+                continue
+        points.append(point)
+        milliseconds.append(time_stamp)
+    return Trajectory(points, milliseconds)
+
+def _evaluate_float(control_points, time_stamps):
+    # The same as evaluate_curve, but the coordinates are not truncated.
+    order = len(control_points) - 1
+    if numpy is not None and order <= MAXIMUM_FLOAT_ORDER:
+        basis = get_bernstein_basis(order, time_stamps)
+        return (basis @ numpy.array(control_points, dtype=numpy.float64)).tolist()
+    coefficients = binomial_coefficients(order)
+    points = []
+    for time_stamp in time_stamps:
+        point_x = 0
+        point_y = 0
+        for i in range(0, order + 1):
+            coeff = coefficients[i] * (1 - time_stamp) ** (order - i) * time_stamp ** i
+            point_x += coeff * control_points[i][0]
+            point_y += coeff * control_points[i][1]
+        points.append((point_x, point_y))
+    return points
+
+def _resolve_engine(engine, order=1):
+    if engine == 'auto':
+        if order > MAXIMUM_FLOAT_ORDER:
+            return 'exact'
+        return 'numpy' if numpy is not None else 'python'
+    if engine not in ENGINES:
+        raise ValueError(f'Unknown engine {engine}, the possible values are {ENGINES}')
+    if engine == 'numpy' and numpy is None:
+        raise ImportError('The numpy engine requires NumPy to be installed')
+    return engine
+
+def _evaluate_python(control_points, time_stamps):
+    order = len(control_points) - 1
+    points = []
     for time_stamp in time_stamps:
         point_x = 0
         point_y = 0 
@@ -115,8 +458,110 @@ Returns:
             point_x += coeff * control_points[i][0] 
             point_y += coeff * control_points[i][1]
         points.append((int(point_x), int(point_y))) 
+    return points
+
+def _evaluate_numpy(control_points, time_stamps):
+    order = len(control_points) - 1
+    return _evaluate_basis(get_bernstein_basis(order, time_stamps), control_points)
+
+def _evaluate_exact(control_points, time_stamps):
+    order = len(control_points) - 1
+    # The setup: the control points are multiplied by the exact binomial coefficients
+    # and brought to the common denominator, so the loop below works with integers only.
+    weighted_x = []
+    weighted_y = []
+    for coefficient, control_point in zip(binomial_coefficients(order), control_points):
+        weighted_x.append(coefficient * Fraction(control_point[0]))
+        weighted_y.append(coefficient * Fraction(control_point[1]))
+    common_denominator = 1
+    for weight in weighted_x + weighted_y:
+        common_denominator *= weight.denominator // math.gcd(common_denominator, weight.denominator)
+    weighted_x = [int(weight * common_denominator) for weight in weighted_x]
+    weighted_y = [int(weight * common_denominator) for weight in weighted_y]
+
+    points = []
+    for time_stamp in time_stamps:
+        time_stamp = Fraction(time_stamp)
+        # t = b / d, 1 - t = a / d. The point is the sum of the weighted control
+        # points multiplied by a ** (order - i) * b ** i and divided by d ** order.
+        # The sum is calculated by the homogeneous Horner scheme, i.e. O(order)
+        # operations per point with no rounding at all.
+        b = time_stamp.numerator
+        d = time_stamp.denominator
+        a = d - b
+        point_x = weighted_x[order]
+        point_y = weighted_y[order]
+        power_of_a = 1
+        for i in range(order - 1, -1, -1):
+            power_of_a *= a
+            point_x = point_x * b + weighted_x[i] * power_of_a
+            point_y = point_y * b + weighted_y[i] * power_of_a
+        denominator = d ** order * common_denominator
+        points.append((
+            _truncated_division(point_x, denominator),
+            _truncated_division(point_y, denominator)
+        ))
+    return points
+
+def _truncated_division(numerator, denominator):
+    # Rounds towards zero just as int() does for a float (the denominator is positive).
+    quotient = abs(numerator) // denominator
+    return quotient if numerator >= 0 else -quotient
+
+def _evaluate_basis(basis, control_points):
+    return [tuple(point) for point in _evaluate_basis_array(basis, control_points).tolist()]
+
+def _evaluate_basis_array(basis, control_points):
+    # One matrix product gives the coordinates of all the points.
+    # The conversion to int truncates towards zero just as int() does.
+    points = basis @ numpy.array(control_points, dtype=numpy.float64)
+    return points.astype(numpy.int32)
+
+def get_bernstein_basis(order, time_stamps):
+    """ This function gets the order of a Bezier curve and a list of time stamps.
+Returns a NumPy matrix of shape (number of time stamps, order + 1): the row k holds
+the Bernstein polynomials of the given order evaluated at the time stamp k."""
+    t = numpy.asarray(time_stamps, dtype=numpy.float64)[:, numpy.newaxis]
+    i = numpy.arange(order + 1)
+    coefficients = numpy.array(binomial_coefficients(order), dtype=numpy.float64)
+    return coefficients * (1 - t) ** (order - i) * t ** i
+
+def get_time_stamps(transition_time, step, exact=False):
+    """ This function gets the transition time and the step both in milliseconds.
+Returns a tuple of the time stamps (floats from 0 to 1) of the uniform grid.
+If exact is True, the time stamps are instances of fractions.Fraction."""
+    if exact:
+        return tuple(Fraction(t, transition_time) for t in range(0, transition_time + 1, step))
+    return tuple(t / transition_time for t in range(0, transition_time + 1, step))
+
+@functools.lru_cache(maxsize=BASIS_CACHE_SIZE)
+def get_basis_table(order, transition_time, step):
+    """ This function gets the order of a Bezier curve, the transition time and 
+the step of the grid of time stamps both in milliseconds.
+Returns the read-only Bernstein basis matrix for the grid (see get_bernstein_basis).
+The tables are kept in a bounded LRU cache, see get_basis_cache_info and 
+clear_basis_cache."""
+    table = get_bernstein_basis(order, get_time_stamps(transition_time, step))
+    # The table is shared by all the callers, it must not be changed in place.
+    table.flags.writeable = False
+    return table
+
+def get_basis_cache_info():
+    """ Returns a named tuple (hits, misses, maxsize, currsize) of the cache 
+of the Bernstein basis tables."""
+    return get_basis_table.cache_info()
+
+def clear_basis_cache():
+    """ Removes all the Bernstein basis tables from the cache and resets its counters."""
+    get_basis_table.cache_clear()
 
-    return tuple(points), tuple(control_points), transition_time
+def binomial_coefficients(n):
+    """ This function gets an integer n.
+Returns a list of the exact integer binomial coefficients C(n, 0) ... C(n, n)."""
+    coefficients = [1]
+    for i in range(n):
+        coefficients.append(coefficients[-1] * (n - i) // (i + 1))
+    return coefficients
 
 def get_random_control_point(
         begin_pos=(300,10), 
@@ -169,7 +614,7 @@ The transition time slightly correlates with the distance."""
     # The distance is calculated using the Pythagorean theorem.
     distance = int(math.sqrt((end_pos[0] - begin_pos[0]) ** 2 + (end_pos[1] - begin_pos[1]) ** 2))
     
-    logger.debug(f'The distance between the two points is {distance}')
+    logger.debug('The distance between the two points is %s', distance)
     resulting_random_transition_time = distance // (random.randint(3,4))
     if resulting_random_transition_time < MINIMUM_TRANSITION_TIME_MILLISECONDS:
         resulting_random_transition_time = MINIMUM_TRANSITION_TIME_MILLISECONDS + random.randint(10,100)
@@ -177,7 +622,7 @@ The transition time slightly correlates with the distance."""
     if resulting_random_transition_time > MAXIMUM_TRANSITION_TIME_MILLISECONDS:
         resulting_random_transition_time = MAXIMUM_TRANSITION_TIME_MILLISECONDS - random.randint(10,100)
     
-    logger.debug(f'Random transition time has been chosen: {resulting_random_transition_time} milliseconds.')
+    logger.debug('Random transition time has been chosen: %s milliseconds.', resulting_random_transition_time)
     return resulting_random_transition_time
 
 def number_of_combinations(n, i):
@@ -3,33 +3,19 @@
 import logging
 logger = logging.getLogger('ruautogui.bezier_draftsman')
 
-logger.setLevel(logging.DEBUG)
-
-logConsoleHandler = logging.StreamHandler()
-formatterConsole = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
-logConsoleHandler.setFormatter(formatterConsole)
-logger.addHandler(logConsoleHandler)
-
-logFileHandler = logging.FileHandler(f'ruautogui.log')
-formatterFile = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logFileHandler.setFormatter(formatterFile)
-logger.addHandler(logFileHandler)  
-
 import sys
-if sys.platform == 'win32':
-    try:
-        import cv2
-        import numpy
-        import ctypes
-        if __name__ == '__main__':
-            import bezier
-        else:
-            from ruautogui import bezier
-    except Exception as exc:
-        print(f'Cannot import required module: {exc}')
-        sys.exit()
+import ctypes
+if __name__ == '__main__':
+    import bezier
+    import lazy
 else:
-    raise Exception('Currently supports only Windows OS!')
+    from ruautogui import bezier
+    from ruautogui import lazy
+
+# OpenCV and NumPy are needed only to draw the curves, they are imported at
+# the first use (see the module lazy).
+cv2 = lazy.import_optional('cv2')
+numpy = lazy.import_optional('numpy')
 
 class POINT(ctypes.Structure):
     _fields_ = [("x", ctypes.c_long),
@@ -50,6 +36,10 @@ def get_blank_image(width, height):
     return numpy.zeros(shape=[height, width, 3], dtype=numpy.uint8)
 
 def draftsman():
+    if sys.platform != 'win32':
+        raise OSError('Currently supports only Windows OS!')
+    if cv2 is None or numpy is None:
+        raise ImportError('The draftsman requires OpenCV (cv2) and NumPy to be installed')
     try:
         SCREEN_WIDTH, SCREEN_HEIGHT = get_screen_size()
     except Exception as exc:
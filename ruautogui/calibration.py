@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# calibration.py - a module from ruautogui package that measures the timing
+#                  capabilities of the host.
+# Features:
+#   - measures the real granularity of time.sleep;
+#   - measures the cost of one input injection call;
+#   - calculates the frame time, i.e. the minimum time between two steps
+#     of a movement that the host can keep;
+#   - the measurement is made once per process and cached; if the host was
+#     measured without an injection probe (e.g. by keyboard), the injection
+#     cost is measured and merged the first time a probe is supplied.
+
+import statistics
+import time
+from collections import namedtuple
+
+# The result of the calibration (all the times are in seconds):
+#   sleep_granularity - the time the shortest sleep actually takes;
+#   injection_cost - the time of one input injection call;
+#   frame_time - the minimum time between two steps of a movement.
+Calibration = namedtuple('Calibration', 'sleep_granularity injection_cost frame_time')
+
+# The frame time is never less than this number of seconds: faster steps
+# are not visible on the screen anyway.
+MINIMUM_FRAME_TIME = 0.004
+# The duration of the sleep used to measure the granularity.
+SLEEP_PROBE_TIME = 0.0005
+# The number of the measurements; the median of them is taken.
+NUMBER_OF_SAMPLES = 10
+
+_calibration = None
+# True if the cached calibration includes the injection cost.
+_injection_measured = False
+
+def measure_sleep_granularity(samples=NUMBER_OF_SAMPLES):
+    """ Returns the median time in seconds that the shortest sleep takes."""
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        time.sleep(SLEEP_PROBE_TIME)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+def measure_injection_cost(probe, samples=NUMBER_OF_SAMPLES):
+    """ This function gets a function that makes one input injection call.
+Returns the median time of the call in seconds."""
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        probe()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+def calibrate(probe=None, samples=NUMBER_OF_SAMPLES):
+    """ This function gets the following arguments:
+    probe - a function that makes one input injection call (default = None -
+            the injection cost is not measured);
+    samples - an integer - the number of the measurements.
+Measures the host, caches the result and returns it as Calibration."""
+    global _calibration, _injection_measured
+    sleep_granularity = measure_sleep_granularity(samples)
+    injection_cost = measure_injection_cost(probe, samples) if probe is not None else 0.0
+    frame_time = max(MINIMUM_FRAME_TIME, sleep_granularity + injection_cost)
+    _calibration = Calibration(sleep_granularity, injection_cost, frame_time)
+    _injection_measured = probe is not None
+    return _calibration
+
+def add_injection_cost(probe, samples=NUMBER_OF_SAMPLES):
+    """ This function gets the same arguments as 'calibrate'.
+Measures the injection cost by the probe and merges it into the cached
+Calibration (the sleep granularity is kept). Returns the new Calibration."""
+    global _calibration, _injection_measured
+    if _calibration is None:
+        return calibrate(probe, samples)
+    injection_cost = measure_injection_cost(probe, samples)
+    _calibration = _calibration._replace(
+        injection_cost=injection_cost,
+        frame_time=max(MINIMUM_FRAME_TIME, _calibration.sleep_granularity + injection_cost)
+    )
+    _injection_measured = True
+    return _calibration
+
+def get_calibration(probe=None):
+    """ Returns the cached Calibration, the host is measured on the first call
+(see calibrate for the argument). If the cached Calibration was measured
+without a probe, the injection cost of the first probe passed is added to it
+(see add_injection_cost)."""
+    if _calibration is None:
+        return calibrate(probe)
+    if probe is not None and not _injection_measured:
+        return add_injection_cost(probe)
+    return _calibration
+
+def reset_calibration():
+    """ Drops the cached Calibration, the next get_calibration measures the host again."""
+    global _calibration, _injection_measured
+    _calibration = None
+    _injection_measured = False
+# True if the cached calibration includes the injection cost.
+_injection_measured = False
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# clocks.py - a module from ruautogui package with the clock the package
+#             waits by.
+# Features:
+#   - every wait of the package (the steps of the movements, the clicks,
+#     the delays between the keystrokes) goes through the current clock;
+#   - SystemClock (the default) is the real time: time.perf_counter and
+#     time.sleep;
+#   - VirtualClock does not wait: a sleep advances its time at once, so
+#     a long script is run in milliseconds with the exact planned timing
+#     (see the module simulation).
+
+import time
+
+class SystemClock:
+    """ The real time of the host."""
+
+    # The clock really waits.
+    virtual = False
+
+    # Returns the current time in seconds. It is time.perf_counter itself:
+    # the scheduler calls it in a busy loop.
+    time = staticmethod(time.perf_counter)
+
+    def sleep(self, seconds):
+        """ Sleeps the given number of seconds."""
+        time.sleep(seconds)
+
+    async def sleep_async(self, seconds):
+        """ Sleeps the given number of seconds without blocking the event loop."""
+        # asyncio is imported only by the programs that use it (see the module lazy).
+        import asyncio
+        await asyncio.sleep(seconds)
+
+class VirtualClock:
+    """ The time that moves only when somebody sleeps.
+
+The constructor gets the time in seconds the clock starts at (default = 0.0)."""
+
+    virtual = True
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        """ Returns the current virtual time in seconds."""
+        return self.now
+
+    def sleep(self, seconds):
+        """ Advances the time by the given number of seconds at once."""
+        if seconds > 0:
+            self.now += seconds
+
+    def sleep_until(self, deadline):
+        """ Advances the time to the deadline exactly (the time never goes back)."""
+        if deadline > self.now:
+            self.now = deadline
+
+    async def sleep_async(self, seconds):
+        """ Advances the time and lets the event loop run the other tasks."""
+        import asyncio
+        self.sleep(seconds)
+        await asyncio.sleep(0)
+
+_clock = SystemClock()
+
+def get_clock():
+    """ Returns the current clock of the package."""
+    return _clock
+
+def set_clock(clock):
+    """ This function gets a clock (SystemClock, VirtualClock or any object with
+the same methods), None - the real time.
+Makes it the current clock of the package and returns the previous one."""
+    global _clock
+    previous = _clock
+    _clock = clock if clock is not None else SystemClock()
+    return previous
+
+def now():
+    """ Returns the current time of the package clock in seconds."""
+    return _clock.time()
+
+def sleep(seconds):
+    """ Sleeps the given number of seconds by the package clock."""
+    _clock.sleep(seconds)
+
+async def sleep_async(seconds):
+    """ Sleeps the given number of seconds by the package clock without
+blocking the event loop."""
+    await _clock.sleep_async(seconds)
@@ -6,44 +6,37 @@
 #   - simulates typing by using the so-called virtual keys;
 #   - cyrillic (russian) alphabet is supported;
 #   - tuned typing speed;
-#   - hotkeys are supported.
+#   - hotkeys are supported;
+#   - the input is injected by the current backend (see the subpackage backends);
+#   - the waits go through the clock of the package (see the module clocks).
 
 import logging
 
 logger = logging.getLogger('ruautogui.keyboard')
-logger.setLevel(logging.DEBUG)
-
-logConsoleHandler = logging.StreamHandler()
-formatterConsole = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
-logConsoleHandler.setFormatter(formatterConsole)
-logger.addHandler(logConsoleHandler)
-
-logFileHandler = logging.FileHandler(f'ruautogui.log')
-formatterFile = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logFileHandler.setFormatter(formatterFile)
-logger.addHandler(logFileHandler)  
-
-import sys
-
-if sys.platform == 'win32':
-    import os
-    
-    import ctypes
-    from ctypes import wintypes
-    import time, random
-else:
-    raise Exception('Currently supports only Windows OS!')
-
-  
-
-KEYEVENTF_KEYDOWN = 0x0000
-KEYEVENTF_KEYUP = 0x0002
-
-wintypes.ULONG_PTR = wintypes.WPARAM
 
-INPUT_MOUSE    = 0
-INPUT_KEYBOARD = 1
-INPUT_HARDWARE = 2
+import functools
+import time, random
+from collections import namedtuple
+if __name__ == '__main__':
+    import backends
+    import calibration
+    import clocks
+    import layouts
+    import program as keystroke_program
+    import streaming
+    import timing
+    from backends.base import KEYEVENTF_KEYDOWN, KEYEVENTF_KEYUP, KEYEVENTF_UNICODE
+    from scheduler import StepScheduler
+else:
+    from ruautogui import backends
+    from ruautogui import calibration
+    from ruautogui import clocks
+    from ruautogui import layouts
+    from ruautogui import program as keystroke_program
+    from ruautogui import streaming
+    from ruautogui import timing
+    from ruautogui.backends.base import KEYEVENTF_KEYDOWN, KEYEVENTF_KEYUP, KEYEVENTF_UNICODE
+    from ruautogui.scheduler import StepScheduler
 
 # The following two constants indicate a hotkey that changes the keyboard layout
 # in the system. Replace them in accordance with the 'mapping' dictionary keys 
@@ -51,40 +44,19 @@ INPUT_HARDWARE = 2
 CHANGE_KEYBOARD_LAYOUT_KEY1 = 'leftalt'
 CHANGE_KEYBOARD_LAYOUT_KEY2 = 'shift'
 
-class POINT(ctypes.Structure):
-    _fields_ = [("x", ctypes.c_long),
-                ("y", ctypes.c_long)]
-
-class MOUSEINPUT(ctypes.Structure):
-    _fields_ = (("dx",          wintypes.LONG),
-                ("dy",          wintypes.LONG),
-                ("mouseData",   wintypes.DWORD),
-                ("dwFlags",     wintypes.DWORD),
-                ("time",        wintypes.DWORD),
-                ("dwExtraInfo", wintypes.ULONG_PTR))
-
-class KEYBDINPUT(ctypes.Structure):
-    _fields_ = (("wVk",         wintypes.WORD),
-                ("wScan",       wintypes.WORD),
-                ("dwFlags",     wintypes.DWORD),
-                ("time",        wintypes.DWORD),
-                ("dwExtraInfo", wintypes.ULONG_PTR))
-
-class HARDWAREINPUT(ctypes.Structure):
-    _fields_ = (("uMsg",    wintypes.DWORD),
-                ("wParamL", wintypes.WORD),
-                ("wParamH", wintypes.WORD))
-
-class INPUT(ctypes.Structure):
-    class _INPUT(ctypes.Union):
-        _fields_ = (("ki", KEYBDINPUT),
-                    ("mi", MOUSEINPUT),
-                    ("hi", HARDWAREINPUT))
-    _anonymous_ = ("_input",)
-    _fields_ = (("type",   wintypes.DWORD),
-                ("_input", _INPUT))
-
-user32 = ctypes.WinDLL('user32', use_last_error=True)
+# The keyboard layout identifiers (KLID) of the supported languages. The layouts
+# are switched directly by their handles (see LayoutManager), the hotkey above 
+# is used only if that fails. The characters of every layout are translated
+# into keystrokes by the tables of the module layouts, so a new layout needs
+# only its identifier here.
+LAYOUT_IDS = {
+    'english': '00000409',
+    'russian': '00000419'
+}
+
+# The scheduler that sends the groups of the key events of a program.
+# A keystroke is never dropped, even if it is late.
+scheduler = StepScheduler(drop_late=False)
 
 # The following dictionary is used to set the average typing speed.
 # The keys of the dictionary are the names of the modes.
@@ -94,13 +66,23 @@ user32 = ctypes.WinDLL('user32', use_last_error=True)
 #       for instance, typorate of 20 means that for every 20 symbols in average
 #       there will be a typo (typos are not allowed by default,
 #                             all the typos will be corrected automatically).
+# 'batch' (optional) - if True, the keystrokes of the whole message are sent by
+#       as few SendInput calls as the delays allow: the keystrokes separated by
+#       delays shorter than the sleep granularity of the host go in one call.
+# 'timing' (optional) - the speed of the digraph timing model (see the module
+#       timing): the interval between two keystrokes depends on the keys and
+#       the switches of the layout, it is divided by the speed; 'min' and 'max'
+#       are used only for the typos and by 'press'.
 modes = {
     'ultraslow' : {'min': 0.9, 'max': 3, 'typorate': 10},
     'slow' : {'min': 0.4, 'max': 0.9, 'typorate': 20},
     'standard': {'min': 0.15, 'max': 0.4, 'typorate': 20},
     'fast': {'min': 0.08, 'max': 0.15, 'typorate': 20},
-    'ultrafast': {'min': 0.01, 'max': 0.05, 'typorate': 30},
-    'instant': {'min': 0, 'max': 0, 'typorate': False}
+    'ultrafast': {'min': 0.01, 'max': 0.05, 'typorate': 30, 'batch': True},
+    'instant': {'min': 0, 'max': 0, 'typorate': False, 'batch': True},
+    'natural_slow': {'min': 0.2, 'max': 0.6, 'typorate': 20, 'timing': 0.6},
+    'natural': {'min': 0.1, 'max': 0.35, 'typorate': 25, 'timing': 1.0},
+    'natural_fast': {'min': 0.05, 'max': 0.2, 'typorate': 30, 'timing': 1.6}
 }
 
 # The following dictionary is used to map a symbol or a button of a typical
@@ -191,11 +173,11 @@ mapping = {
     "numpad7": 0x67, #VK_NUMPAD7
     "numpad8": 0x68, #VK_NUMPAD8
     "numpad9": 0x69, #VK_NUMPAD9
-    "*": 0x6A, #VK_MULTIPLY
-    "+": 0x6B, #VK_ADD
-    "-": 0x6D, #VK_SUBTRACT
-    ".": 0x6E, #VK_DECIMAL
-    "/": 0x6F, #VK_DIVIDE
+    "multiply": 0x6A, #VK_MULTIPLY
+    "add": 0x6B, #VK_ADD
+    "subtract": 0x6D, #VK_SUBTRACT
+    "decimal": 0x6E, #VK_DECIMAL
+    "divide": 0x6F, #VK_DIVIDE
     "f1": 0x70, #VK_F1
     "f2": 0x71, #VK_F2
     "f3": 0x72, #VK_F3
@@ -336,25 +318,79 @@ ru_mapping = {
     ' ': ' '
 }
 
+# The ways to type the characters of a message:
+#   'vk' - the virtual keys of 'mapping' in the english or russian layout
+#          (the characters that are not in the tables are skipped);
+#   'unicode' - every character is sent as Unicode, the layout does not matter;
+#   'mixed' - the virtual keys for the characters in the tables, Unicode for the rest.
+METHODS = ('vk', 'unicode', 'mixed')
+
+# The characters that are sent by their virtual keys in the 'unicode' method too,
+# since the applications do not treat them as text.
+UNICODE_CONTROL_KEYS = {
+    '\n': 'enter',
+    '\r': 'enter',
+    '\t': 'tab',
+    '\b': 'backspace'
+}
+
+# A run of a message: the characters typed in one keyboard layout.
+#   language - 'english', 'russian' or None (the run has only neutral characters,
+#              i.e. the ones typed by the same keys in all the layouts);
+#   keystrokes - a list of tuples (virtual-key code, modifiers), see the module
+#                layouts; for the characters that are sent as Unicode the tuple
+#                is (character, None).
+LayoutRun = namedtuple('LayoutRun', 'language keystrokes')
+
+# The statistics of a typed message:
+#   characters - the number of the typed characters;
+#   runs - the number of the layout runs;
+#   layout_checks - the number of the times the keyboard layout was queried;
+#   layout_switches - the number of the times the keyboard layout was changed.
+TypingStatistics = namedtuple('TypingStatistics', 'characters runs layout_checks layout_switches')
+
 def get_keyboard_layout(thread_id=0):
     """ Returns the keyboard layout of the foreground window as a string:
-        'russian', 'english' or 'unknown'"""
-    current_window = ctypes.windll.user32.GetForegroundWindow()
-    if thread_id == 0: 
-        thread_id = ctypes.windll.user32.GetWindowThreadProcessId(current_window, 0) 
-    # keyboard_language_id made up of 0xAAABBBB, where 
-    # AAA = HKL (handle object), BBBB = language ID
-    keyboard_language_id = ctypes.windll.user32.GetKeyboardLayout(thread_id)
-    # Language ID -> low 10 bits, Sub-language ID -> high 6 bits
-    language_id = keyboard_language_id & (2**16 - 1)
-    # Convert language ID from decimal to hexadecimal
-    language_id_hex = hex(language_id)
-    if '409' in language_id_hex:
-        return 'english'
-    elif '419' in language_id_hex:
-        return 'russian'
-    else:
-        return 'unknown'
+        a key of LAYOUT_IDS ('russian', 'english') or 'unknown'"""
+    language_id = backends.get_backend().get_keyboard_layout(thread_id)
+    for language, layout_id in LAYOUT_IDS.items():
+        if int(layout_id, 16) & (2**16 - 1) == language_id:
+            return language
+    return 'unknown'
+
+class LayoutManager:
+    """ Switches the keyboard layout of the foreground window directly.
+The handles of the layouts are loaded by the backend once on the first switch.
+On Windows a switch posts WM_INPUTLANGCHANGEREQUEST to the foreground window
+(the window handles it before the keystrokes that follow), so there is no need
+to poll the layout afterwards."""
+
+    def __init__(self):
+        self.handles = None
+
+    def load(self):
+        """ Loads the handles of the layouts from LAYOUT_IDS.
+Returns a dictionary language -> handle (the layouts that cannot be loaded are omitted)."""
+        if self.handles is None:
+            self.handles = {}
+            backend = backends.get_backend()
+            for language, layout_id in LAYOUT_IDS.items():
+                handle = backend.load_keyboard_layout(layout_id)
+                if handle:
+                    self.handles[language] = handle
+                else:
+                    logger.warning('Cannot load the %s keyboard layout %s', language, layout_id)
+        return self.handles
+
+    def switch(self, language):
+        """ Switches the layout of the foreground window to the language.
+Returns True if the switch has been requested, False otherwise."""
+        handle = self.load().get(language)
+        if handle is None:
+            return False
+        return backends.get_backend().switch_keyboard_layout(handle)
+
+layout_manager = LayoutManager()
 
 def change_keyboard_layout(thread_id=0, language='russian'):
     """ This function gets:
@@ -362,53 +398,186 @@ def change_keyboard_layout(thread_id=0, language='russian'):
                         target language on;
             language - a string (default = 'russian') - the target language 
                         to switch on.
-ы        
+
         This function returns None.
 
-        Changes the keyboard layout language by simulating the press of the 
-        default hotkey. The number of attemps equals to five: 
-        if the target language is found, stops its attemps."""
+        Changes the keyboard layout language directly (see LayoutManager).
+        If it fails, simulates the press of the default hotkey: the number 
+        of attemps equals to five, if the target language is found, stops 
+        its attemps."""
+
+    if layout_manager.switch(language):
+        logger.debug('Switched to %s keyboard layout', language)
+        return None
 
     trials = 5
     while get_keyboard_layout() != language:
         hotkey(CHANGE_KEYBOARD_LAYOUT_KEY1, CHANGE_KEYBOARD_LAYOUT_KEY2)
-        logger.debug(f'Switched to {get_keyboard_layout(thread_id)} keyboard layout')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Switched to %s keyboard layout', get_keyboard_layout(thread_id))
         trials -= 1
-        time.sleep(0.1)
+        clocks.sleep(0.1)
         if trials == 0:
             raise Exception('Cannot get the target keyboard layout.')
 
+class LayoutState:
+    """ Tracks the keyboard layout of the foreground window while a message
+is being typed and counts the queries and the switches of the layout.
+The layout found at the first query can be restored at the end (see 'restore')."""
+
+    def __init__(self):
+        self.layout = None
+        self.initial = None
+        self.checks = 0
+        self.switches = 0
+
+    def ensure(self, language):
+        """ Makes sure that the layout is the given language (None - any layout)."""
+        if language is None:
+            return
+        self.layout = get_keyboard_layout()
+        self.checks += 1
+        if self.initial is None:
+            self.initial = self.layout
+        if self.layout != language:
+            change_keyboard_layout(language=language)
+            self.layout = language
+            self.switches += 1
+
+    def restore(self):
+        """ Switches the layout back to the one found at the first query if it
+has been changed since (the layouts not in LAYOUT_IDS are not restored)."""
+        if self.initial in LAYOUT_IDS and self.layout != self.initial:
+            change_keyboard_layout(language=self.initial)
+            self.layout = self.initial
+            self.switches += 1
+
+def get_character_table():
+    """ Returns the translation table of all the layouts of LAYOUT_IDS: a dictionary
+code point -> {language: (virtual-key code, modifiers)}. If a character is typed
+by the same keystroke in all the layouts, its only language is None.
+The table is built on the first call (see layouts.get_translation_table)."""
+    global _character_table
+    if _character_table is None:
+        handles = layout_manager.load()
+        backend = backends.get_backend()
+        table = {}
+        for language, layout_id in LAYOUT_IDS.items():
+            query = None
+            if handles.get(language) and backend.queries_layouts:
+                query = functools.partial(backend.query_keyboard_layout, handles[language])
+            layout_table = layouts.get_translation_table(language, layout_id, query, backend.name)
+            for code_point, keystroke in layout_table.items():
+                table.setdefault(code_point, {})[language] = keystroke
+        for code_point, options in table.items():
+            keystrokes = set(options.values())
+            if len(options) == len(LAYOUT_IDS) and len(keystrokes) == 1:
+                table[code_point] = {None: keystrokes.pop()}
+        _character_table = table
+    return _character_table
+
+_character_table = None
+
+def clear_layout_caches(backend=None):
+    """ Drops the handles of the layouts (see LayoutManager) and the character
+table loaded from the backend, they are loaded again on the next use.
+It is called by backends.set_backend with the new backend."""
+    global _character_table
+    layout_manager.handles = None
+    _character_table = None
+
+backends.add_listener(clear_layout_caches)
+
+def resolve_character(character):
+    """ This function gets a character.
+Returns a dictionary {language: (virtual-key code, modifiers)} of the layouts
+the character can be typed in (the language is None if the character is typed
+the same way in all the layouts). The dictionary is empty if the character 
+cannot be typed by the virtual keys."""
+    return get_character_table().get(ord(character), {})
+
+def segment_message(message, method='vk'):
+    """ This function gets a string and the method of typing (see METHODS).
+Returns a list of LayoutRun: the consecutive characters that can be typed in
+the same layout form one run, the neutral characters (and the Unicode ones)
+join the current run. The characters that cannot be typed are skipped."""
+    table = get_character_table() if method != 'unicode' else {}
+    runs = []
+    for character in message:
+        options = table.get(ord(character))
+        if not options:
+            if method == 'vk':
+                logger.error('Symbol "%s" not found in virtual keys! Skipping...', character)
+                continue
+            language, keystroke = None, (character, None)
+        elif None in options:
+            language, keystroke = None, options[None]
+        else:
+            # The character stays in the layout of the current run if it can.
+            language = runs[-1].language if runs else None
+            if language not in options:
+                language = next(iter(options))
+            keystroke = options[language]
+        if runs and (language is None or runs[-1].language in (None, language)):
+            if runs[-1].language is None and language is not None:
+                runs[-1] = LayoutRun(language, runs[-1].keystrokes)
+            runs[-1].keystrokes.append(keystroke)
+        else:
+            runs.append(LayoutRun(language, [keystroke]))
+    return runs
+
 def hotkey(*args, **kwargs):
     """ This function gets:
     *args - strings of keys that form a hotkey;
-    **kwargs - actually are not used here.
+    **kwargs - interval - a float (default = 0.0) - the delay in seconds
+               between the keys.
 
 This function return None.
 
 Simulates the press of a hotkey by pressing the passed keys one by one
 and releasing them in the reverse order.
-Any number of keys can be passed as the arguments."""
+Any number of keys can be passed as the arguments. Without an interval 
+the whole chord is sent by one SendInput call, i.e. atomically."""
 
     interval = float(kwargs.get("interval", 0.0))
-    for key in args:
-        if len(key) > 1:
-            key = key.lower()
-        ctypes.windll.user32.keybd_event(mapping[key], 0, KEYEVENTF_KEYDOWN, 0)
-        time.sleep(interval)
-    for key in reversed(args):
-        if len(key) > 1:
-            key = key.lower()
-        ctypes.windll.user32.keybd_event(mapping[key], 0, KEYEVENTF_KEYUP, 0)
-        time.sleep(interval)
-
-def type(message, mode='standard', typo=False):
+    batch = _EventBatch()
+    _add_hotkey(batch, args, interval)
+    batch.flush()
+
+def compile_hotkey(*args, **kwargs):
+    """ This function gets the same arguments as 'hotkey'.
+Returns program.KeystrokeProgram of the hotkey that can be typed by 'play'
+(without an interval the whole chord is one group of events)."""
+    builder = keystroke_program.ProgramBuilder()
+    _add_hotkey(builder, args, float(kwargs.get("interval", 0.0)))
+    return builder.build()
+
+def _add_hotkey(batch, keys, interval):
+    # The keys are pressed one by one and released in the reverse order.
+    keys = [key.lower() if len(key) > 1 else key for key in keys]
+    for key in keys:
+        batch.add(mapping[key], KEYEVENTF_KEYDOWN)
+        batch.wait(interval)
+    for key in reversed(keys):
+        batch.add(mapping[key], KEYEVENTF_KEYUP)
+        batch.wait(interval)
+
+def compile(message, mode='standard', typo=False, method='vk'):
     """This function gets:
     message - a string of symbols to type in;
     mode - a string of the name of the typing mode;
     typo - a bollean - True if typos are allowed, False if are not.
                        (all the typos will be corrected).
+    method - a string (default = 'vk') - the way to type the characters:
+                       by the virtual keys, as Unicode or mixed (see METHODS).
 
-This function returns None."""
+The message is split into the runs of the layouts (see segment_message),
+the typos and the delays of the whole message are drawn at once
+(see program.sample_keystrokes and, for the modes with 'timing', 
+timing.sample_intervals).
+
+This function returns program.KeystrokeProgram that can be typed by 'play'
+any number of times, as well as saved and loaded."""
 
     if isinstance(message, str) == False:
         raise Exception('The message is not a string')
@@ -416,49 +585,221 @@ This function returns None."""
         mode = 'standard'
     if isinstance(typo, bool) == False:
         typo=False
-
-    if typo:
-        typorate = modes[mode]['typorate']
-
-    for i in range(len(message)):
-
-        if message[i] in shift_mapping.keys():
-            symbol = message[i]
-            shift = True
-            if get_keyboard_layout() != 'english':
-                change_keyboard_layout(language='english')
-
-        elif message[i].lower() in ru_mapping.keys():
-            symbol = ru_mapping[message[i].lower()]
-            if message[i] in ru_mapping.keys():
-                shift = False
+    if method not in METHODS:
+        logger.warning('Unknown method %s, the virtual keys are used', method)
+        method = 'vk'
+
+    runs = segment_message(message, method)
+    number_of_characters = sum(len(run.keystrokes) for run in runs)
+    samples = keystroke_program.sample_keystrokes(
+        number_of_characters,
+        modes[mode]['min'],
+        modes[mode]['max'],
+        modes[mode]['typorate'] if typo else False
+    )
+    typo_symbols = list(ru_mapping.values())
+    if 'timing' in modes[mode]:
+        keys = []
+        languages = []
+        for run in runs:
+            for vk, modifiers in run.keystrokes:
+                keys.append(0 if modifiers is None else vk)
+                languages.append(run.language)
+        intervals = iter(timing.sample_intervals(keys, languages, modes[mode]['timing']))
+    else:
+        intervals = None
+
+    builder = keystroke_program.ProgramBuilder()
+    samples = iter(samples)
+    for run in runs:
+        builder.start_run(run.language)
+        for vk, modifiers in run.keystrokes:
+            sample = next(samples)
+            if sample[keystroke_program.TYPO]:
+                index = int(sample[keystroke_program.TYPO_SYMBOL] * len(typo_symbols))
+                random_symbol = typo_symbols[min(index, len(typo_symbols) - 1)]
+                typo_delays = sample[keystroke_program.TYPO_DELAY1:keystroke_program.TYPO_DELAY2 + 1]
+                if modifiers is None:
+                    _add_unicode_keystroke(builder, random_symbol, typo_delays)
+                else:
+                    _add_vk_keystroke(builder, mapping[random_symbol], 0, typo_delays)
+                builder.wait(sample[keystroke_program.TYPO_PAUSE])
+                _add_vk_keystroke(
+                    builder, mapping['backspace'], 0,
+                    sample[keystroke_program.BACKSPACE_DELAY1:keystroke_program.BACKSPACE_DELAY2 + 1]
+                )
+
+            if intervals is not None:
+                interval = next(intervals)
+                delays = (interval / 2, interval / 2)
             else:
-                shift = True
-            if get_keyboard_layout() != 'russian':
-                change_keyboard_layout()
-
-        elif message[i].lower() in mapping.keys():
-            symbol = message[i].lower()
-            if message[i] in mapping.keys():
-                shift = False
+                delays = sample[keystroke_program.DELAY1:keystroke_program.DELAY2 + 1]
+            if modifiers is None:
+                _add_unicode_keystroke(builder, vk, delays)
             else:
-                shift = True
-            if get_keyboard_layout() != 'english':
-                change_keyboard_layout(language='english')
+                _add_vk_keystroke(builder, vk, modifiers, delays)
+    return builder.build(mode=mode, characters=number_of_characters)
 
+def play(program, layout=None, should_stop=None):
+    """ This function gets:
+    program - a program.KeystrokeProgram (see 'compile');
+    layout - a LayoutState (default = None - a new one, the layout of
+             the foreground window is restored at the end) - the layout of 
+             the foreground window known from the previous programs;
+    should_stop - a function without arguments (default = None) - if it 
+             returns True, the typing stops (see scheduler.StepScheduler.run).
+
+Types the program: the keyboard layout is checked and switched only at 
+the beginning of a run, the events are sent in groups by the module scheduler
+(in the batch modes the delays shorter than the sleep granularity of the host
+do not interrupt a group).
+
+If the typing stops between the press and the release of a key (e.g. shift
+is held for the next delay), the key is released (see release_keys).
+
+This function returns TypingStatistics; if the typing has been stopped,
+the number of the characters is estimated by the share of the sent events."""
+
+    restore = layout is None
+    if restore:
+        layout = LayoutState()
+    sent = [0]
+    try:
+        for run in program.split(get_batch_threshold(program.mode)):
+            layout.ensure(run.language)
+            step = get_group_sender(program, run, sent)
+            if scheduler.run(run.deadlines, step, run.duration, should_stop).cancelled:
+                break
+    finally:
+        release_keys(program, sent[0])
+        if restore:
+            layout.restore()
+    return get_typing_statistics(program, sent[0], layout)
+
+def get_batch_threshold(mode):
+    """ Returns the threshold in seconds of the delays that interrupt a group of
+key events typed in the mode (see program.KeystrokeProgram.split): the sleep
+granularity of the host in the batch modes, otherwise zero."""
+    if modes.get(mode, {}).get('batch', False):
+        return calibration.get_calibration().sleep_granularity
+    return 0.0
+
+def get_group_sender(program, run, sent=None):
+    """ This function gets a program.KeystrokeProgram, one of its runs
+(see program.KeystrokeProgram.split) and a list of one integer (default = None)
+that is set to the number of the events of the program sent so far.
+Returns the step function for scheduler.StepScheduler.run that sends the group i
+of the run. The batches of the backend are prepared before the first group is sent."""
+    backend = backends.get_backend()
+    batches = [
+        backend.prepare_key_events(program.vk[begin:end], program.flags[begin:end], program.scan[begin:end])
+        for begin, end in run.groups
+    ]
+    send_prepared = backend.send_prepared
+
+    def step(i):
+        send_prepared(batches[i])
+        if sent is not None:
+            sent[0] = run.groups[i][1]
+    return step
+
+def get_held_keys(program, sent_events):
+    """ This function gets a program and the number of its events that have been
+sent. Returns a list of tuples (virtual-key code, flags, scan code) - the releases
+of the keys pressed by the sent events and not released yet, the last pressed
+key first."""
+    held = {}
+    for vk, flags, scan in zip(program.vk[:sent_events], program.flags[:sent_events], program.scan[:sent_events]):
+        key = (vk, scan) if flags & KEYEVENTF_UNICODE else (vk, 0)
+        if flags & KEYEVENTF_KEYUP:
+            held.pop(key, None)
         else:
-            logger.error(f'Symbol "{symbol}" not found in virtual keys! Skipping...')
-            continue
-        if typo and random.randint(0, typorate) > typorate - 1:
-            logger.debug('Let\'s make a typo!')
-            random_symbol = ru_mapping[random.choice(list(ru_mapping.keys()))]
+            held[key] = (vk, flags | KEYEVENTF_KEYUP, scan)
+    return list(reversed(list(held.values())))
+
+def release_keys(program, sent_events):
+    """ This function gets a program and the number of its events that have been
+sent (e.g. the typing has been stopped). Releases the keys that are still held
+(see get_held_keys). Returns the number of the released keys."""
+    releases = get_held_keys(program, sent_events)
+    if releases:
+        logger.debug('Releasing %s held keys', len(releases))
+        send_key_events(releases)
+    return len(releases)
+
+def get_typing_statistics(program, sent_events, layout):
+    """ This function gets a program, the number of its events that have been
+sent and the LayoutState of the typing. Returns TypingStatistics; if the typing
+has been stopped, the number of the characters is estimated."""
+    characters = program.characters
+    if sent_events < len(program):
+        characters = characters * sent_events // len(program)
+    statistics = TypingStatistics(characters, len(program.runs), layout.checks, layout.switches)
+    logger.debug('Typing statistics: %s', statistics)
+    return statistics
+
+def type(message, mode='standard', typo=False, method='vk'):
+    """This function gets:
+    message - a string of symbols to type in;
+    mode - a string of the name of the typing mode;
+    typo - a bollean - True if typos are allowed, False if are not.
+                       (all the typos will be corrected).
+    method - a string (default = 'vk') - the way to type the characters:
+                       by the virtual keys, as Unicode or mixed (see METHODS).
 
-            press(random_symbol, mode)
-            time.sleep(random.uniform(modes[mode]['min'] * 3, modes[mode]['max'] * 3))
+The message is compiled into a keystroke program (see 'compile') that is
+typed at once (see 'play').
 
-            press('backspace', mode)
+This function returns TypingStatistics."""
 
-        press(symbol, mode, shift=shift)         
+    return play(compile(message, mode, typo, method))
+
+def type_stream(source, mode='standard', typo=False, method='vk', chunk_size=1024, progress=None, cancel=None):
+    """This function gets:
+    source - a string, a text file object or any iterable of strings 
+             (e.g. a generator of the lines of a log);
+    mode, typo, method - the same as of 'type';
+    chunk_size - an integer (default = 1024) - the number of the characters
+             compiled at once;
+    progress - a function (default = None) - it gets the number of 
+             the characters typed so far after every chunk;
+    cancel - a threading.Event (default = None) - once it is set, the typing
+             stops as soon as possible (the held keys are released, see 'play').
+
+The source is read in chunks (see streaming.iter_chunks) with constant memory:
+the next chunks are compiled by a background thread while the current one 
+is being typed (see streaming.pipeline). The characters of a slow source 
+(e.g. the lines of a log being written) are typed once it has been idle for
+streaming.IDLE_TIMEOUT seconds, not held back until a chunk is full.
+The keyboard layout of the window is restored at the end (see LayoutState).
+
+This function returns TypingStatistics of the typed characters."""
+
+    should_stop = cancel.is_set if cancel is not None else None
+    layout = LayoutState()
+    # The table is built before the compiling thread starts.
+    get_character_table()
+    totals = [0, 0]
+
+    def consume(program):
+        statistics = play(program, layout=layout, should_stop=should_stop)
+        totals[0] += statistics.characters
+        totals[1] += statistics.runs
+        if progress is not None:
+            progress(totals[0])
+
+    try:
+        streaming.pipeline(
+            streaming.iter_chunks(source, chunk_size, idle_timeout=streaming.IDLE_TIMEOUT),
+            lambda chunk: compile(chunk, mode, typo, method),
+            consume,
+            should_stop=should_stop
+        )
+    finally:
+        layout.restore()
+    statistics = TypingStatistics(totals[0], totals[1], layout.checks, layout.switches)
+    logger.debug('Typing statistics: %s', statistics)
+    return statistics
 
 def press(symbol, mode='standard', shift=False):
     """This function gets:
@@ -469,30 +810,88 @@ def press(symbol, mode='standard', shift=False):
 
 This function returns None."""
 
-    if shift:
-        x = INPUT(type=INPUT_KEYBOARD, 
-                  ki=KEYBDINPUT(wVk=mapping['shift'])
-            )
-        user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
-
-    x = INPUT(type=INPUT_KEYBOARD, 
-              ki=KEYBDINPUT(wVk=mapping[symbol])
-              )
-    user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
-    
-    x = INPUT(type=INPUT_KEYBOARD, 
-              ki=KEYBDINPUT(wVk=mapping[symbol], dwFlags=KEYEVENTF_KEYUP)
-              )
-    user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
-    time.sleep(random.uniform(modes[mode]['min'], modes[mode]['max']))
-
-    if shift:
-        x = INPUT(type=INPUT_KEYBOARD, 
-                  ki=KEYBDINPUT(wVk=mapping['shift'], dwFlags=KEYEVENTF_KEYUP)
-                  )
-        user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
-
-    time.sleep(random.uniform(modes[mode]['min'], modes[mode]['max']))
+    batch = _EventBatch()
+    _add_keystroke(batch, symbol, mode, shift)
+    batch.flush()
+
+def compile_keystroke(symbol, mode='standard', shift=False):
+    """ This function gets the same arguments as 'press'.
+Returns program.KeystrokeProgram of the keystroke that can be typed by 'play'."""
+    builder = keystroke_program.ProgramBuilder()
+    _add_keystroke(builder, symbol, mode, shift)
+    return builder.build(mode=mode, characters=1)
+
+def _add_keystroke(batch, symbol, mode, shift=False):
+    delays = [random.uniform(modes[mode]['min'], modes[mode]['max']) for _ in range(2)]
+    _add_vk_keystroke(batch, mapping[symbol], layouts.SHIFT if shift else 0, delays)
+
+def _add_vk_keystroke(batch, vk, modifiers, delays):
+    # The keystroke of a virtual key: the modifiers are released after the first delay.
+    modifier_keys = [
+        mapping[name] for bit, name in ((layouts.CTRL, 'ctrl'), (layouts.ALT, 'alt'), (layouts.SHIFT, 'shift'))
+        if modifiers & bit
+    ]
+    for modifier_key in modifier_keys:
+        batch.add(modifier_key, KEYEVENTF_KEYDOWN)
+    batch.add(vk, KEYEVENTF_KEYDOWN)
+    batch.add(vk, KEYEVENTF_KEYUP)
+    batch.wait(delays[0])
+    for modifier_key in reversed(modifier_keys):
+        batch.add(modifier_key, KEYEVENTF_KEYUP)
+    batch.wait(delays[1])
+
+def _add_unicode_keystroke(batch, character, delays):
+    # The keystroke of a character sent as Unicode: the characters outside 
+    # the BMP are sent as a surrogate pair, one code unit after another.
+    if character in UNICODE_CONTROL_KEYS:
+        _add_vk_keystroke(batch, mapping[UNICODE_CONTROL_KEYS[character]], 0, delays)
+        return None
+    code_units = memoryview(character.encode('utf-16-le', 'surrogatepass')).cast('H')
+    for code_unit in code_units:
+        batch.add(0, KEYEVENTF_UNICODE, code_unit)
+        batch.add(0, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP, code_unit)
+    batch.wait(delays[0])
+    batch.wait(delays[1])
+
+def send_key_events(events):
+    """ This function gets a list of tuples (virtual-key code, flags) or 
+(virtual-key code, flags, scan code); the scan code of a Unicode event 
+(KEYEVENTF_UNICODE) is a UTF-16 code unit.
+Sends all the key events at once (by one SendInput call on Windows).
+Returns the number of the events inserted into the input stream."""
+    return backends.get_backend().send_key_events(
+        [event[0] for event in events],
+        [event[1] for event in events],
+        [event[2] if len(event) > 2 else 0 for event in events]
+    )
+
+class _EventBatch:
+    """ Collects the key events and sends them by as few SendInput calls as
+the delays between them allow. The delays shorter than the threshold (seconds)
+are summed up; once the sum reaches the threshold, the collected events are
+sent and the sum is slept. With the zero threshold every delay is slept."""
+
+    def __init__(self, threshold=0.0):
+        self.threshold = threshold
+        self.events = []
+        self.delay = 0.0
+
+    def add(self, vk, flags, scan=0):
+        # The event is sent after the delay that has been collected so far.
+        if self.delay > 0 and self.delay >= self.threshold:
+            self.flush()
+        self.events.append((vk, flags, scan))
+
+    def wait(self, delay):
+        self.delay += delay
+
+    def flush(self):
+        if self.events:
+            send_key_events(self.events)
+            self.events = []
+        if self.delay > 0:
+            clocks.sleep(self.delay)
+        self.delay = 0.0
 
 if __name__ == '__main__':
     message = 'ПРЕИМУЩЕСТВЕННО равноценные БОЙКОТЫ грандиозных событий. Ещё желаемые запретные категории стандартных упрощённых целей. Въезд и льготы на парашюты.'
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# layouts.py - a module from ruautogui package that translates characters
+#              into keystrokes of a keyboard layout.
+# Features:
+#   - a translation table maps a code point to a tuple (virtual-key code,
+#     modifiers), so a character is resolved by one dictionary lookup;
+#   - the table is queried from the OS by the input backend (on Windows by
+#     VkKeyScanExW for every character of the BMP), so any installed layout
+#     is supported;
+#   - the queried tables are cached on disk between the runs, by the backend
+#     and the build of the OS they are queried from; a cache file is written
+#     atomically (a temporary file replaces it), so a concurrent run never
+#     reads a half-written one;
+#   - the backends that do not query the OS (e.g. 'recording') use the layout
+#     files shipped with the package (ruautogui/data/layout_<language>.json)
+#     and never the disk cache.
+
+import json
+import logging
+import os
+import re
+import sys
+
+logger = logging.getLogger('ruautogui.layouts')
+
+# The modifiers of a keystroke (the same bits as the high byte of VkKeyScanExW).
+SHIFT = 0x01
+CTRL = 0x02
+ALT = 0x04
+
+# The version of the format of the cached tables. Change it to drop the old caches.
+CACHE_VERSION = 2
+
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+_tables = {}
+
+def get_cache_directory():
+    """ Returns the directory where the tables queried from the OS are cached."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ruautogui')
+
+def load_layout_file(language):
+    """ This function gets the name of a language, e.g. 'english'.
+Returns the translation table from the layout file shipped with the package."""
+    path = os.path.join(DATA_DIRECTORY, f'layout_{language}.json')
+    with open(path, 'r', encoding='utf-8') as fd:
+        keys = json.load(fd)['keys']
+    return {ord(character): (vk, modifiers) for character, (vk, modifiers) in keys.items()}
+
+def get_os_build():
+    """ Returns the build of the OS the tables are queried from, e.g. '10.0.19045'."""
+    # platform and tempfile (see _write_cache) are needed only with a backend
+    # that queries the OS, so the other programs do not import them.
+    import platform
+    return platform.version()
+
+def _cache_path(layout_id, backend):
+    # The name of the file tells the backend and the build of the OS the table
+    # is queried from: another build may map the characters differently.
+    build = re.sub(r'[^0-9A-Za-z.]+', '_', get_os_build()) or 'unknown'
+    return os.path.join(get_cache_directory(), f'layout-{layout_id}-{backend}-{build}-v{CACHE_VERSION}.json')
+
+def _read_cache(layout_id, backend):
+    try:
+        with open(_cache_path(layout_id, backend), 'r', encoding='utf-8') as fd:
+            keys = json.load(fd)
+    except (OSError, ValueError):
+        return None
+    return {int(code_point): tuple(keystroke) for code_point, keystroke in keys.items()}
+
+def _write_cache(layout_id, backend, table):
+    import tempfile
+    path = _cache_path(layout_id, backend)
+    temporary = None
+    try:
+        os.makedirs(get_cache_directory(), exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=get_cache_directory(), suffix='.tmp', delete=False
+            ) as fd:
+            temporary = fd.name
+            json.dump({code_point: list(keystroke) for code_point, keystroke in table.items()}, fd)
+        os.replace(temporary, path)
+    except OSError as exc:
+        logger.warning('Cannot cache the keyboard layout %s: %s', layout_id, exc)
+        if temporary is not None:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+def get_translation_table(language, layout_id, query=None, backend=None):
+    """ This function gets the following arguments:
+    language - a string - the name of the language, e.g. 'english';
+    layout_id - a string - the keyboard layout identifier (KLID), e.g. '00000409';
+    query - a function without arguments that queries the table from the OS,
+             it returns None if it cannot (default = None - the OS is not
+             queried), see backends.base.Backend.query_keyboard_layout;
+    backend - a string (default = None) - the name of the backend the table
+             is queried by, the disk cache is kept per backend.
+Returns the translation table of the layout: a dictionary code point -> 
+(virtual-key code, modifiers). The table is built once per process and backend.
+If the OS can be queried, the table is read from the disk cache of this backend
+and OS build or queried (and cached); otherwise, as well as if the query fails,
+it is loaded from the shipped layout file."""
+    key = (backend, layout_id)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+    if query is not None:
+        table = _read_cache(layout_id, backend)
+        if table is None:
+            try:
+                table = query()
+            except (AttributeError, OSError) as exc:
+                logger.warning('Cannot query the keyboard layout %s: %s', layout_id, exc)
+            else:
+                if table is not None:
+                    _write_cache(layout_id, backend, table)
+    if table is None:
+        table = load_layout_file(language)
+    _tables[key] = table
+    return table
+
+def clear_tables():
+    """ Drops the translation tables built in this process (the disk cache stays)."""
+    _tables.clear()
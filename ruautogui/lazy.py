@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+#
+# lazy.py - a module from ruautogui package that defers the imports of
+#           the optional heavy dependencies (NumPy, OpenCV).
+# Features:
+#   - import_optional finds the module without executing it: the module is
+#     executed at the first access to its attributes, so importing the package
+#     costs nothing when the dependency is never used;
+#   - after the first access the module is an ordinary module, there is no
+#     overhead on the hot paths;
+#   - a dependency that is not installed is None, just as after
+#     'try: import numpy except ImportError: numpy = None'.
+
+import importlib.util
+import sys
+
+def import_optional(name):
+    """ This function gets the name of a module (e.g. 'numpy').
+Returns the module (it is executed at the first access to its attributes),
+None if the module is not installed."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None or spec.loader is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    # The module is registered at once, so 'import numpy' elsewhere gets
+    # the same object and it is executed only once.
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# logs.py - a module from ruautogui package that configures the logging of
+#           the package.
+# Features:
+#   - the package is silent by default: the loggers have no handlers of their
+#     own, a disabled debug message costs one level check;
+#   - configure_logging installs the console and file handlers once for all
+#     the modules of the package (the loggers 'ruautogui.*');
+#   - the records can be written by a background thread (QueueHandler and
+#     QueueListener), so the mouse and keyboard loops never wait for the I/O.
+
+import atexit
+import logging
+
+CONSOLE_FORMAT = '%(name)s - %(levelname)s - %(message)s'
+FILE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+logger = logging.getLogger('ruautogui')
+
+# The handlers installed by configure_logging and the listener of the queue.
+_handlers = []
+_listener = None
+
+def configure_logging(level=logging.DEBUG, console=True, filename=None, asynchronous=False):
+    """ This function gets the following arguments:
+    level - an integer (default = logging.DEBUG) - the level of the package logger;
+    console - a boolean (default = True) - if True, the records are written
+              to sys.stderr;
+    filename - a string (default = None) - the path of the log file
+              (e.g. 'ruautogui.log'), None - no file;
+    asynchronous - a boolean (default = False) - if True, the records are
+              put into a queue and written by a background thread.
+The handlers installed by a previous call are removed.
+Returns the logger of the package."""
+    global _listener
+    stop_logging()
+    handlers = []
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+    if filename is not None:
+        file_handler = logging.FileHandler(filename)
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        handlers.append(file_handler)
+
+    logger.setLevel(level)
+    if asynchronous and handlers:
+        # logging.handlers imports socket, pickle and others, it is not needed
+        # unless the records are written by a thread.
+        from logging.handlers import QueueHandler, QueueListener
+        import queue
+        records = queue.Queue()
+        _listener = QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+        _handlers.append(QueueHandler(records))
+    else:
+        _handlers.extend(handlers)
+    for handler in _handlers:
+        logger.addHandler(handler)
+    # The records written by the queue thread are closed with the handlers.
+    _handlers.extend(handler for handler in handlers if handler not in _handlers)
+    return logger
+
+def stop_logging():
+    """ Removes the handlers installed by configure_logging: the records in
+the queue are written, the files are closed. The package is silent again."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for handler in _handlers:
+        logger.removeHandler(handler)
+        handler.close()
+    del _handlers[:]
+    logger.setLevel(logging.NOTSET)
+
+atexit.register(stop_logging)
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+#
+# motion.py - a module from ruautogui package that runs the mouse movements
+#             in a background thread.
+# Features:
+#   - the movements and the clicks are put into a queue and performed one
+#     after another by a worker thread, the caller gets a future at once;
+#   - a movement in progress can be cancelled, the queued ones are cancelled
+#     by their futures;
+#   - the target of a movement in progress can be changed: the rest of
+#     the movement is replanned from the current position and continues
+#     in the current direction of the cursor.
+
+import bisect
+import math
+import queue
+import threading
+from concurrent.futures import Future
+
+# The distance from the current position to the control point of the replanned
+# tail of a movement, as a share of the distance to the new target.
+TAIL_CONTROL_DISTANCE = 0.3
+
+class MotionWorker:
+    """ Performs the movements and the other actions of the mouse in a thread.
+
+The constructor gets the following arguments:
+    plan - a function that gets the begin and the end points, the order of
+           the curve, the transition time in milliseconds (or None) and
+           the control points (or None - random ones); it returns a tuple
+           (Trajectory with the time stamps, transition time);
+    execute - a function that gets the Trajectory, the transition time and
+           a function should_stop; it moves the cursor and returns
+           scheduler.ScheduleStatistics;
+    get_position - a function that returns the current position of the cursor.
+
+The thread is started by the constructor and stopped by 'close'."""
+
+    def __init__(self, plan, execute, get_position):
+        self.plan = plan
+        self.execute = execute
+        self.get_position = get_position
+        self._commands = queue.Queue()
+        self._lock = threading.Lock()
+        self._current = None
+        self._cancelled = False
+        self._target = None
+        # True while the movement in progress can be retargeted.
+        self._retargetable = False
+        # The number of the calls of cancel(None): the commands queued before
+        # the last one are never performed, even if the worker has taken them.
+        self._generation = 0
+        self._thread = threading.Thread(target=self._run, name='ruautogui-motion', daemon=True)
+        self._thread.start()
+
+    def move(self, end_pos, order=2, transition_time=None):
+        """ This method gets the same arguments as mouse.move.
+Queues the movement. Returns a concurrent.futures.Future of its
+ScheduleStatistics (if the movement is stopped by 'cancel', the statistics
+have cancelled = True)."""
+        return self.submit(self._move, end_pos, order, transition_time)
+
+    def submit(self, function, *args, **kwargs):
+        """ Queues a call of the function (e.g. a click) after the movements
+queued before it. Returns a concurrent.futures.Future of its result."""
+        future = Future()
+        with self._lock:
+            self._commands.put((function, args, kwargs, future, self._generation))
+        return future
+
+    def cancel(self, future=None):
+        """ This method gets a future returned by the worker (default = None -
+the movement in progress and all the queued commands).
+Cancels the command: a queued one is never performed, a movement in progress
+stops where the cursor is. Returns True if something has been cancelled."""
+        with self._lock:
+            if future is None:
+                self._generation += 1
+                cancelled = False
+                while True:
+                    try:
+                        _, _, _, queued, _ = self._commands.get_nowait()
+                    except queue.Empty:
+                        break
+                    if queued is None:
+                        # The worker is being closed.
+                        self._commands.put((None, None, None, None, None))
+                        break
+                    cancelled = queued.cancel() or cancelled
+                future = self._current
+            else:
+                cancelled = False
+            if future is not None and future is self._current:
+                self._cancelled = True
+                return True
+        if future is not None and future.cancel():
+            return True
+        return cancelled
+
+    def retarget(self, end_pos, transition_time=None):
+        """ This method gets the new target of the movement in progress and
+the transition time in milliseconds of the rest of the movement
+(default = None - a random one).
+Returns True if the movement in progress has been retargeted, False if there
+is none or it has already ended (queue a new movement instead)."""
+        with self._lock:
+            if self._current is None or not self._retargetable:
+                return False
+            self._target = (end_pos, transition_time)
+            return True
+
+    def close(self):
+        """ Performs the queued commands and stops the thread."""
+        self._commands.put((None, None, None, None, None))
+        self._thread.join()
+
+    def _should_stop(self):
+        return self._cancelled or self._target is not None
+
+    def _run(self):
+        while True:
+            function, args, kwargs, future, generation = self._commands.get()
+            if function is None:
+                return
+            # The command becomes the current one under the lock of 'cancel':
+            # a command taken from the queue just before cancel(None) is dropped.
+            with self._lock:
+                stale = generation != self._generation
+                if not stale:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    self._current = future
+                    self._cancelled = False
+                    self._target = None
+                    self._retargetable = False
+            if stale:
+                future.cancel()
+                continue
+            try:
+                result = function(*args, **kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+            finally:
+                with self._lock:
+                    self._current = None
+                    self._retargetable = False
+
+    def _move(self, end_pos, order, transition_time):
+        begin_pos = self.get_position()
+        points, transition_time = self.plan(begin_pos, end_pos, order, transition_time, None)
+        with self._lock:
+            self._retargetable = True
+        while True:
+            statistics = self.execute(points, transition_time, self._should_stop)
+            with self._lock:
+                target = self._target
+                self._target = None
+                # A pending target is never dropped, even if it has come after
+                # the last step: the tail starts from where the cursor is.
+                if target is None or self._cancelled:
+                    self._retargetable = False
+                    return statistics
+            # The rest of the movement goes to the new target: the tail is
+            # a quadratic curve tangent to the current direction of the cursor.
+            end_pos, transition_time = target
+            begin_pos = self.get_position()
+            control_points = None
+            direction = get_direction(points, statistics.actual_duration * 1000)
+            if direction is not None:
+                distance = math.hypot(end_pos[0] - begin_pos[0], end_pos[1] - begin_pos[1])
+                control_points = [(
+                    int(begin_pos[0] + direction[0] * distance * TAIL_CONTROL_DISTANCE),
+                    int(begin_pos[1] + direction[1] * distance * TAIL_CONTROL_DISTANCE)
+                )]
+            points, transition_time = self.plan(begin_pos, end_pos, 2, transition_time, control_points)
+
+def get_direction(points, elapsed):
+    """ This function gets a Trajectory with the time stamps (milliseconds) and
+the time in milliseconds since the beginning of the movement.
+Returns the unit vector (x, y) of the direction of the movement at the time,
+None if the cursor does not move then."""
+    time_stamps = points.time_stamps
+    if time_stamps is None or len(points) < 2:
+        return None
+    index = min(max(bisect.bisect_right(time_stamps, elapsed), 1), len(points) - 1)
+    (x0, y0), (x1, y1) = points[index - 1], points[index]
+    length = math.hypot(x1 - x0, y1 - y0)
+    if length == 0:
+        return None
+    return ((x1 - x0) / length, (y1 - y0) / length)
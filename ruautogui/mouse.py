@@ -5,97 +5,143 @@
 # Features:
 #   - simulates a random mouse movement when a user grabs the mouse controller;
 #   - moves the mouse controller through the passed coordinates (Bezier curve);
+#   - moves the mouse controller through several waypoints along one smooth path
+#     with optional clicks and pauses at them;
 #   - clicks any mouse buttons at the current location 
-#     (double-clicks are allowed).
+#     (double-clicks are allowed);
+#   - the input is injected by the current backend (see the subpackage backends);
+#   - the waits go through the clock of the package (see the module clocks).
 
 import logging
 logger = logging.getLogger('ruautogui.mouse')
-logger.setLevel(logging.DEBUG)
-
-logConsoleHandler = logging.StreamHandler()
-formatterConsole = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
-logConsoleHandler.setFormatter(formatterConsole)
-logger.addHandler(logConsoleHandler)
-
-logFileHandler = logging.FileHandler(f'ruautogui.log')
-formatterFile = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logFileHandler.setFormatter(formatterFile)
-logger.addHandler(logFileHandler)   
-
-import sys
-if sys.platform == 'win32':
-    import os
-    import ctypes
-    from ctypes import wintypes
-    import random
-    import math
-    import time
-    if __name__ == '__main__':
-        import bezier
-    else:
-        from ruautogui import bezier
+
+import random
+import math
+import time
+from collections import namedtuple
+if __name__ == '__main__':
+    import backends
+    import bezier
+    import calibration
+    from backends.base import (
+        MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP, MOUSEEVENTF_RIGHTDOWN,
+        MOUSEEVENTF_RIGHTUP, MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP
+    )
+    from motion import MotionWorker
+    from pool import TrajectoryPool
+    from scheduler import StepScheduler
 else:
-    raise Exception('Currently supports only Windows OS!')
-    sys.exit()
+    from ruautogui import backends
+    from ruautogui import bezier
+    from ruautogui import calibration
+    from ruautogui.backends.base import (
+        MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP, MOUSEEVENTF_RIGHTDOWN,
+        MOUSEEVENTF_RIGHTUP, MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP
+    )
+    from ruautogui.motion import MotionWorker
+    from ruautogui.pool import TrajectoryPool
+    from ruautogui.scheduler import StepScheduler
 
+# The minimum time between two steps of a movement in seconds. It is replaced
+# by the frame time measured on the host before the first movement 
+# (see get_frame_time).
 MINIMUM_SLEEP_TIME = 0.013
 
-MOUSEEVENTF_LEFTDOWN = 0x0002
-MOUSEEVENTF_LEFTUP = 0x0004
-MOUSEEVENTF_RIGHTDOWN = 0x0008
-MOUSEEVENTF_RIGHTUP = 0x0010
-MOUSEEVENTF_MIDDLEDOWN = 0x0020
-MOUSEEVENTF_MIDDLEUP = 0x0040
-
-wintypes.ULONG_PTR = wintypes.WPARAM
-
-INPUT_MOUSE    = 0
-INPUT_KEYBOARD = 1
-INPUT_HARDWARE = 2
-
-class POINT(ctypes.Structure):
-    _fields_ = [("x", ctypes.c_long),
-                ("y", ctypes.c_long)]
-
-class MOUSEINPUT(ctypes.Structure):
-    _fields_ = (("dx",          wintypes.LONG),
-                ("dy",          wintypes.LONG),
-                ("mouseData",   wintypes.DWORD),
-                ("dwFlags",     wintypes.DWORD),
-                ("time",        wintypes.DWORD),
-                ("dwExtraInfo", wintypes.ULONG_PTR))
-
-class KEYBDINPUT(ctypes.Structure):
-    _fields_ = (("wVk",         wintypes.WORD),
-                ("wScan",       wintypes.WORD),
-                ("dwFlags",     wintypes.DWORD),
-                ("time",        wintypes.DWORD),
-                ("dwExtraInfo", wintypes.ULONG_PTR))
-
-class HARDWAREINPUT(ctypes.Structure):
-    _fields_ = (("uMsg",    wintypes.DWORD),
-                ("wParamL", wintypes.WORD),
-                ("wParamH", wintypes.WORD))
-
-class INPUT(ctypes.Structure):
-    class _INPUT(ctypes.Union):
-        _fields_ = (("ki", KEYBDINPUT),
-                    ("mi", MOUSEINPUT),
-                    ("hi", HARDWAREINPUT))
-    _anonymous_ = ("_input",)
-    _fields_ = (("type",   wintypes.DWORD),
-                ("_input", _INPUT))
+# The scheduler that runs the steps of the mouse movements.
+scheduler = StepScheduler()
+
+# The pool of the pregenerated curves used by 'move' and 'grab' (see enable_pool).
+pool = None
+
+# The thread that performs the movements of move_async and click_async
+# (see get_worker).
+worker = None
+
+_calibrated = False
+
+# The time in seconds a mouse button is held down by a click.
+CLICK_TIME = 0.13
+
+# A waypoint of a path (see move_path): the coordinates, the pause in seconds
+# after reaching it, the name of the mouse button to click there (None - no click)
+# and whether the click is a double-click.
+Waypoint = namedtuple('Waypoint', 'x y dwell click double_click')
+Waypoint.__new__.__defaults__ = (0.0, None, False)
 
 def get_mouse_cursor_position():
-    cursor = POINT()
-    ctypes.windll.user32.GetCursorPos(ctypes.byref(cursor))
-    return (cursor.x, cursor.y)
+    """ Returns a tuple of x and y coordinates of the cursor (see backends.get_backend)."""
+    return backends.get_backend().get_cursor_position()
+
+def _injection_probe():
+    backend = backends.get_backend()
+    backend.set_cursor_position(*backend.get_cursor_position())
+
+def get_frame_time():
+    """ Returns the minimum time between two steps of a movement in seconds.
+On the first call the sleep granularity and the cost of SetCursorPos are
+measured (see calibration.get_calibration), the result is used for the number
+of the points of the curves and by the scheduler of the steps."""
+    global _calibrated, MINIMUM_SLEEP_TIME
+    if not _calibrated:
+        host = calibration.get_calibration(probe=_injection_probe)
+        MINIMUM_SLEEP_TIME = host.frame_time
+        # The scheduler spins for the time the sleep can oversleep.
+        scheduler.spin_threshold = max(scheduler.spin_threshold, host.sleep_granularity)
+        _calibrated = True
+        logger.debug('Calibration: %s', host)
+    return MINIMUM_SLEEP_TIME
+
+def enable_pool(size=8, **kwargs):
+    """ This function gets the number of the curves kept for every order and
+duration and the other arguments of pool.TrajectoryPool.
+Starts the pool of the pregenerated curves: after that 'move' and 'grab' take
+the curves from the pool instead of planning them (the sampling is uniform).
+Returns the TrajectoryPool, e.g. to get its statistics."""
+    global pool
+    disable_pool()
+    kwargs.setdefault('frame_time', get_frame_time() * 1000)
+    pool = TrajectoryPool(size=size, **kwargs)
+    pool.start()
+    return pool
+
+def disable_pool():
+    """ Stops the pool of the pregenerated curves (see enable_pool)."""
+    global pool
+    if pool is not None:
+        pool.stop()
+        pool = None
+
+def plan_curve(begin_pos, end_pos, order=2, transition_time=None, sampling='adaptive', control_points=None):
+    """ This function gets the begin and the end points of a movement and
+the other arguments of 'move' (control_points - the same as of
+bezier.get_curve_points). Returns the same tuple as bezier.get_curve_points:
+the points, the control points and the transition time of the curve.
+The curve with random control points is taken from the pool if it is enabled
+(see enable_pool), otherwise it is calculated."""
+    if pool is not None and not control_points:
+        return pool.get_curve_points(begin_pos, end_pos, order, transition_time)
+    return bezier.get_curve_points(
+        begin_pos=begin_pos, 
+        end_pos=end_pos, 
+        order=order, 
+        control_points=list(control_points or []), 
+        transition_time=transition_time,
+        sampling=sampling,
+        frame_time=get_frame_time() * 1000
+    )
 
-def grab():
+def grab(sampling='adaptive'):
     """ This function is used to create a tuple of coordinates to simulate
 a random mouse movement when a user grabs the mouse controller.
 Calls the function 'move' and passes the obtained random coordinates and the 
 transition time to it.
+
+This function gets the following arguments:
+    sampling - a string (default = 'adaptive') - the way to choose the points
+            of the curve (see bezier.SAMPLINGS).
+
+This function returns scheduler.ScheduleStatistics of the movement
+(see move_through_coordinates).
 """
     transition_time = random.randint(95, 145)
     random_angle_rad = random.uniform(0, 2 * math.pi)
@@ -105,16 +151,10 @@ transition time to it.
     distance_y = distance * math.sin(random_angle_rad)
     end_pos = (int(begin_pos[0] + distanse_x), int(begin_pos[1] + distance_y))
     order = random.randint(1,5)
-    points, _, _ = bezier.get_curve_points(
-        begin_pos=begin_pos, 
-        end_pos=end_pos, 
-        order=order, 
-        control_points=[], 
-        transition_time=transition_time
-    )
-    move_through_coordinates(points, transition_time)
+    points, _, _ = plan_curve(begin_pos, end_pos, order, transition_time, sampling)
+    return move_through_coordinates(points, transition_time)
 
-def move(end_pos, order=2, transition_time=None):
+def move(end_pos, order=2, transition_time=None, sampling='adaptive'):
     """ This function is used to generate the points on the Bezier curve,
 as well as a random transition time and to call the 'move_through_coordinates'
 function to move the mouse cursor through the points.
@@ -127,58 +167,224 @@ This function gets the following arguments:
     transition_time an integer (default = None) - milliseconds of the
             transition time of the movement. If None, the transition
             time will be chosen randomily.
+    sampling - a string (default = 'adaptive') - the way to choose the points
+            of the curve (see bezier.SAMPLINGS): the adaptive sampling
+            drops the points that would not move the cursor.
+            If the pool of the curves is enabled (see enable_pool), the curve
+            is taken from the pool.
 
-This function returns None."""
+This function returns scheduler.ScheduleStatistics of the movement
+(see move_through_coordinates), None if there is no end point."""
 
     if len(end_pos) == 0:
         return None
     begin_pos = get_mouse_cursor_position()
-    points, _, transition_time_random = bezier.get_curve_points(
-        begin_pos=begin_pos, 
-        end_pos=end_pos, 
-        order=order, 
-        control_points=[], 
-        transition_time=transition_time
-    )
+    points, _, transition_time_random = plan_curve(begin_pos, end_pos, order, transition_time, sampling)
     if transition_time == None:
         transition_time = transition_time_random
-    move_through_coordinates(points, transition_time)
+    return move_through_coordinates(points, transition_time)
+
+def get_worker():
+    """ Returns the motion.MotionWorker of the module (it is started on the first call)."""
+    global worker
+    if worker is None:
+        def plan(begin_pos, end_pos, order, transition_time, control_points):
+            points, _, transition_time = plan_curve(
+                begin_pos, end_pos, order, transition_time, 'adaptive', control_points
+            )
+            return points, transition_time
+
+        def execute(points, transition_time, should_stop):
+            return move_through_coordinates(points, transition_time, should_stop=should_stop)
+
+        worker = MotionWorker(plan, execute, get_mouse_cursor_position)
+    return worker
+
+def move_async(end_pos, order=2, transition_time=None):
+    """ This function gets the same arguments as 'move' (the sampling is adaptive).
+Queues the movement to the worker thread and returns at once.
+Returns a concurrent.futures.Future of the ScheduleStatistics of the movement.
+The queued movements and clicks are performed back to back; the movement in
+progress can be stopped (see cancel_motion) or retargeted (see retarget)."""
+    return get_worker().move(end_pos, order, transition_time)
+
+def click_async(button='left', double_click=False):
+    """ This function gets the same arguments as 'click'.
+Queues the click after the queued movements. Returns a concurrent.futures.Future."""
+    return get_worker().submit(click, button, double_click)
+
+def cancel_motion(future=None):
+    """ This function gets a future of move_async or click_async (default = None -
+the movement in progress and all the queued commands).
+Returns True if something has been cancelled (see motion.MotionWorker.cancel)."""
+    return get_worker().cancel(future)
+
+def retarget(end_pos, transition_time=None):
+    """ This function gets the new target of the movement in progress and 
+the transition time in milliseconds of the rest of the movement.
+The rest of the movement is replanned from the current position of the cursor
+and continues in its current direction.
+Returns True if there has been a movement to retarget."""
+    return get_worker().retarget(end_pos, transition_time)
+
+def move_through_stream(stream, should_stop=None):
+    """ This function moves the mouse controller along a stream of points.
 
-def move_through_coordinates(coordinates, transition_time, polynom=False):
+This function gets the following arguments:
+    stream - an iterable of tuples (x, y, deadline in seconds), e.g. a 
+             bezier.CurveStream (create it with frame_time=get_frame_time() * 1000);
+             every point is requested just before it is reached, so a CurveStream
+             can be changed from another thread while the cursor moves 
+             (e.g. stream.set_end_pos(...));
+    should_stop - the same as of move_through_coordinates.
+
+This function returns scheduler.ScheduleStatistics of the movement."""
+
+    set_cursor_position = backends.get_backend().set_cursor_position
+
+    def step(point):
+        set_cursor_position(point[0], point[1])
+
+    return scheduler.follow(stream, step, should_stop)
+
+def move_path(waypoints, transition_time=None, should_stop=None):
+    """ This function moves the mouse controller through the waypoints along one
+smooth path: the cursor does not stop at a waypoint unless it clicks or pauses
+there.
+
+This function gets the following arguments:
+    waypoints - a list of tuples (x, y) or of Waypoint (x, y, dwell, click,
+                double_click) - the path starts at the current position of
+                the cursor;
+    transition_time - an integer, a list of integers or None (default) - 
+                the time of the movement in milliseconds without the clicks and
+                the pauses (see bezier.get_path_times);
+    should_stop - the same as of move_through_coordinates.
+
+The points of the whole path are calculated at once (see bezier.get_path_points),
+the movement, the clicks and the pauses are run by one pass of the module
+scheduler; the steps of the movement can be dropped, the clicks never are.
+
+This function returns scheduler.ScheduleStatistics."""
+
+    waypoints = [Waypoint(*waypoint) for waypoint in waypoints]
+    if not waypoints:
+        return None
+    positions = [get_mouse_cursor_position()] + [(waypoint.x, waypoint.y) for waypoint in waypoints]
+    stops = {i + 1 for i, waypoint in enumerate(waypoints) if waypoint.dwell or waypoint.click}
+    points, _, arrivals = bezier.get_path_points(
+        positions,
+        bezier.get_path_times(positions, transition_time),
+        stops,
+        frame_time=get_frame_time() * 1000
+    )
+
+    backend = backends.get_backend()
+    deadlines, steps, droppable = [], [], []
+    time_stamps = points.time_stamps
+    # The time in seconds the clicks and the pauses have taken so far.
+    offset = 0.0
+    index = 1
+    for i, waypoint in enumerate(waypoints, 1):
+        # The segment ends with the waypoint at its arrival time.
+        while index < len(points) and time_stamps[index] <= arrivals[i]:
+            deadlines.append(offset + time_stamps[index] / 1000)
+            steps.append([(backend.set_cursor_position, points[index])])
+            droppable.append(True)
+            index += 1
+        if waypoint.click:
+            edges = get_click_edges(waypoint.click, waypoint.double_click)
+            if edges is None:
+                raise ValueError(f'Unknown mouse button {waypoint.click}')
+            arrival = deadlines[-1]
+            for time_stamp, flags in edges:
+                if time_stamp == 0:
+                    # The first press goes with the arrival at the waypoint.
+                    steps[-1].append((backend.send_mouse_events, (flags,)))
+                    droppable[-1] = False
+                else:
+                    deadlines.append(arrival + time_stamp)
+                    steps.append([(backend.send_mouse_events, (flags,))])
+                    droppable.append(False)
+            offset += edges[-1][0]
+        offset += waypoint.dwell
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('Path: %s waypoints, %s steps', len(waypoints), len(steps))
+    duration = offset + arrivals[-1] / 1000
+    return scheduler.run(deadlines, get_step_function(steps), duration, should_stop, droppable)
+
+def get_step_function(steps):
+    """ This function gets a list of the steps of a run: every step is a list of
+tuples of a function and its arguments (e.g. the functions of the backend).
+Returns the step function for scheduler.StepScheduler.run that calls
+the functions of the step i."""
+    def step(i):
+        for function, arguments in steps[i]:
+            function(*arguments)
+    return step
+
+def get_deadlines(coordinates, transition_time):
+    """ This function gets the coordinates and the transition time of a movement
+(see move_through_coordinates).
+Returns a tuple: the list of the deadlines of the steps in seconds and 
+the duration of the movement in seconds (None - the last deadline)."""
+    number_of_steps = len(coordinates)
+    time_stamps = getattr(coordinates, 'time_stamps', None)
+    # The first point is the current position of the cursor, it is not a step.
+    if time_stamps is not None:
+        # The time of the dropped points is not lost: the movement takes
+        # the whole transition time.
+        return [time_stamp / 1000 for time_stamp in time_stamps[1:]], transition_time / 1000
+    step_time = round(transition_time / number_of_steps / 1000, 6)
+    if step_time < get_frame_time():
+        step_time = get_frame_time()
+    logger.debug('Step time: %s seconds.', step_time)
+    return [i * step_time for i in range(number_of_steps - 1)], None
+
+def move_through_coordinates(coordinates, transition_time, polynom=False, should_stop=None):
     """ This function moves the mouse controller through the passed coordinates.
+The steps are run by the module scheduler (see scheduler.StepScheduler) at 
+absolute deadlines; it can be tuned, e.g. mouse.scheduler.cpu_budget = 0.05.
 
 This function gets the following arguments:
-    coordinates - a tuple of tuples that represent the points on the Bezier
-                  curve.
+    coordinates - a Trajectory or a tuple of tuples that represent the points
+                  on the Bezier curve. If the Trajectory has time stamps, every
+                  point is reached at its time stamp and the whole movement
+                  takes the transition time.
     transition_time - an integer - the amount of time to make the whole movement.
     polynom - boolean (default = False) - currently is not used.
+    should_stop - a function without arguments (default = None) - if it returns
+                  True, the movement stops where the cursor is.
 
-This function returns None."""
+This function returns scheduler.ScheduleStatistics of the movement 
+(the jitter, the overruns and the dropped steps)."""
 
-    logger.debug('#### MOVING MOUSE ####')
-    step_time = round(transition_time / len(coordinates) / 1000, 6)
-    if step_time < MINIMUM_SLEEP_TIME:
-        step_time = MINIMUM_SLEEP_TIME
-    number_of_steps = len(coordinates)
-    logger.debug(f'Number of steps: {number_of_steps}')
-    logger.debug(f'Step time: {step_time} seconds.')
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug('#### MOVING MOUSE ####')
+        logger.debug('Number of steps: %s', len(coordinates))
 
-    st_time = time.perf_counter()
+    deadlines, duration = get_deadlines(coordinates, transition_time)
+    set_cursor_position = backends.get_backend().set_cursor_position
 
-    for i in range(1, number_of_steps):
+    def step(i):
+        x, y = coordinates[i + 1]
         if polynom:
-            ctypes.windll.user32.SetCursorPos(coordinates[i][0], 
-                                              int(polynom(coordinates[i][0]))
-                                              )
+            set_cursor_position(x, int(polynom(x)))
         else:
-            ctypes.windll.user32.SetCursorPos(coordinates[i][0], coordinates[i][1])
-        if i < number_of_steps - 1:
-            time.sleep(step_time)
-    end_time = time.perf_counter()
-    logger.debug(f'Measured transition time = {end_time - st_time}')
-    logger.debug(f'#######################')
-
-def click(button='left', double_click=False):
+            set_cursor_position(x, y)
+
+    statistics = scheduler.run(deadlines, step, duration, should_stop)
+    if debug:
+        logger.debug('Measured transition time = %s', statistics.actual_duration)
+        logger.debug('Jitter: mean %s, max %s; overruns: %s, dropped steps: %s',
+                     statistics.mean_jitter, statistics.max_jitter,
+                     statistics.overruns, statistics.dropped)
+        logger.debug('#######################')
+    return statistics
+
+def click(button='left', double_click=False, hold=None):
     """ This function is used to click at the current mouse position.
 
 This function gets the following arguments:
@@ -186,51 +392,58 @@ This function gets the following arguments:
              ('left', 'right', and 'middle').
     double_click - boolean (default = False) - if True the double-click
              will be performed.
+    hold - a float (default = None - CLICK_TIME) - the time in seconds 
+             the button is held down.
+
+The button events are run by the module scheduler at their deadlines (see
+get_click_edges), they are never dropped.
 
 This function returns None."""
 
-    if button == 'right':
-        dwFlags1 = MOUSEEVENTF_RIGHTDOWN
-        dwFlags2 = MOUSEEVENTF_RIGHTUP
-    elif button == 'left':
-        dwFlags1 = MOUSEEVENTF_LEFTDOWN
-        dwFlags2 = MOUSEEVENTF_LEFTUP
-    elif button == 'middle':
-        dwFlags1 = MOUSEEVENTF_MIDDLEDOWN
-        dwFlags2 = MOUSEEVENTF_MIDDLEUP  
-    else:
-        logger.warning(f'Cannot find mouse button {button}')
+    edges = get_click_edges(button, double_click, hold)
+    if edges is None:
         return None
+    send_mouse_events = backends.get_backend().send_mouse_events
 
-    x = INPUT(type=INPUT_MOUSE, 
-              mi=MOUSEINPUT(mouseData=0, dwFlags=dwFlags1)
-            )
-    user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
-    time.sleep(0.13)
-    x = INPUT(type=INPUT_MOUSE, 
-              mi=MOUSEINPUT(mouseData=0, dwFlags=dwFlags2)
-            )
-    user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
+    def step(i):
+        send_mouse_events(edges[i][1])
+
+    scheduler.run([edge[0] for edge in edges], step, droppable=[False] * len(edges))
 
+def get_click_edges(button='left', double_click=False, hold=None):
+    """ This function gets the same arguments as 'click'.
+Returns a list of tuples: the time in seconds from the beginning of the click
+and a tuple of the flags of the button events sent at that time (the release
+and the second press of a double-click are sent together); None if there is
+no such button."""
+    flags = get_button_flags(button)
+    if flags is None:
+        return None
+    if hold is None:
+        hold = CLICK_TIME
     if double_click:
-        x = INPUT(type=INPUT_MOUSE, 
-              mi=MOUSEINPUT(mouseData=0, dwFlags=dwFlags1)
-            )
-        user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
-        time.sleep(0.13)
-        x = INPUT(type=INPUT_MOUSE, 
-                 mi=MOUSEINPUT(mouseData=0, dwFlags=dwFlags2)
-                )
-        user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
+        return [(0.0, flags[:1]), (hold, flags[1:] + flags[:1]), (2 * hold, flags[1:])]
+    return [(0.0, flags[:1]), (hold, flags[1:])]
+
+def get_button_flags(button):
+    """ This function gets the name of a mouse button ('left', 'right' or 'middle').
+Returns a tuple of the flags of the press and the release of the button,
+None if there is no such button."""
+    if button == 'right':
+        return (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP)
+    elif button == 'left':
+        return (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP)
+    elif button == 'middle':
+        return (MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP)
+    logger.warning('Cannot find mouse button %s', button)
+    return None
 
-user32 = ctypes.WinDLL('user32', use_last_error=True)
+def send_button_event(flags):
+    """ Sends a mouse button event with the flags (e.g. MOUSEEVENTF_LEFTDOWN)."""
+    backends.get_backend().send_mouse_events((flags,))
 
 if __name__ == '__main__':
     # The following piece of code can be used to test the capabilities of 
     # the module.
-    class POINT(ctypes.Structure):
-        _fields_ = [("x", ctypes.c_long),
-                    ("y", ctypes.c_long)]
-    cursor = POINT()
     time.sleep(5)
     click(button='right')
\ No newline at end of file
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+#
+# pool.py - a module from ruautogui package that keeps a reservoir of
+#           pregenerated mouse trajectories.
+# Features:
+#   - the curves are generated by bezier.get_curve_points in advance and kept
+#     normalized: the curve begins at 0 and ends at 1 of the complex plane;
+#   - the curves are grouped by the order and the duration (bucket);
+#   - a curve is moved to the real begin and end points by one affine
+#     transform (rotation, scaling and translation), so taking a curve from
+#     the pool costs the same for any movement;
+#   - a background thread refills the pool, the hits and the misses are counted.
+
+import math
+import random
+import threading
+from array import array
+from collections import deque, namedtuple
+
+from ruautogui import bezier, lazy
+from ruautogui.trajectory import Trajectory
+
+# NumPy is an optional dependency. If it is installed, the curves are
+# transformed by vectorized operations.
+# It is imported at the first use (see the module lazy).
+numpy = lazy.import_optional('numpy')
+
+# The length in pixels of the curves generated for the pool (before they are
+# normalized): it is long enough for the rounding of the points not to matter.
+UNIT_LENGTH = 10000
+
+# The orders and the durations (milliseconds) of the curves kept in the pool.
+# A movement takes a curve of the nearest duration and the curve is stretched
+# in time to the exact transition time.
+ORDERS = (1, 2, 3, 4, 5)
+DURATIONS = tuple(range(150, 901, 50))
+
+# The statistics of a pool:
+#   hits - the number of the curves taken from the pool;
+#   misses - the number of the curves generated on demand (the bucket was empty);
+#   generated - the number of the curves generated by the refill thread;
+#   hit_rate - hits / (hits + misses).
+PoolStatistics = namedtuple('PoolStatistics', 'hits misses generated hit_rate')
+
+# A normalized curve: the points and the control points as complex numbers
+# (NumPy arrays or tuples) and the time stamps of the points in milliseconds.
+_Curve = namedtuple('_Curve', 'points control_points time_stamps')
+
+class TrajectoryPool:
+    """ Keeps the normalized random curves of every order and duration.
+
+The constructor gets the following arguments:
+    size - an integer (default = 8) - the number of the curves kept for every
+           order and duration;
+    orders - a sequence of integers (default = ORDERS) - the orders of the curves;
+    durations - a sequence of integers (default = DURATIONS) - the durations
+           of the curves in milliseconds;
+    frame_time - a number (default = None) - the time between two points in
+           milliseconds (see bezier.get_curve_points);
+    engine - a string (default = 'auto') - the engine of bezier.get_curve_points.
+
+The pool is empty until it is filled by 'fill' or by the background thread
+(see 'start')."""
+
+    def __init__(self, size=8, orders=ORDERS, durations=DURATIONS, frame_time=None, engine='auto'):
+        self.size = size
+        self.durations = tuple(sorted(durations))
+        self.frame_time = frame_time
+        self.engine = engine
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self._curves = {(order, duration): deque() for order in orders for duration in self.durations}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """ Starts the background thread that keeps the pool full."""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._refill, name='ruautogui-pool', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """ Stops the background thread (the curves in the pool stay)."""
+        if self._thread is not None:
+            self._running = False
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+
+    def fill(self):
+        """ Fills the pool in the calling thread."""
+        key = self._next_key()
+        while key is not None:
+            self._add(key, self.generate(*key))
+            key = self._next_key()
+
+    def statistics(self):
+        """ Returns PoolStatistics."""
+        with self._lock:
+            requests = self.hits + self.misses
+            return PoolStatistics(
+                self.hits, self.misses, self.generated,
+                self.hits / requests if requests else 0.0
+            )
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(curves) for curves in self._curves.values())
+
+    def bucket(self, transition_time):
+        """ Returns the duration of the pool nearest to the transition time."""
+        return min(self.durations, key=lambda duration: abs(duration - transition_time))
+
+    def generate(self, order, duration):
+        """ Generates a normalized random curve of the order and the duration."""
+        # The direction of the curve is random, so the curves keep the shapes
+        # get_random_control_point gives to the different directions.
+        angle = random.uniform(0, 2 * math.pi)
+        end_pos = (round(UNIT_LENGTH * math.cos(angle)), round(UNIT_LENGTH * math.sin(angle)))
+        points, control_points, _ = bezier.get_curve_points(
+            begin_pos=(0, 0),
+            end_pos=end_pos,
+            order=order,
+            control_points=[],
+            transition_time=duration,
+            engine=self.engine,
+            frame_time=self.frame_time
+        )
+        scale = 1 / complex(*end_pos)
+        if numpy is not None:
+            coordinates = numpy.frombuffer(points, dtype=numpy.int32).reshape(-1, 2)
+            normalized = (coordinates[:, 0] + 1j * coordinates[:, 1]) * scale
+        else:
+            normalized = tuple(complex(x, y) * scale for x, y in points)
+        return _Curve(
+            normalized,
+            tuple(complex(x, y) * scale for x, y in control_points),
+            points.time_stamps
+        )
+
+    def take(self, order, transition_time):
+        """ Returns a normalized curve of the order and the duration nearest to
+the transition time: from the pool if there is one, otherwise a new one."""
+        key = (order, self.bucket(transition_time))
+        curve = None
+        with self._lock:
+            curves = self._curves.get(key)
+            if curves:
+                curve = curves.popleft()
+                self.hits += 1
+            else:
+                self.misses += 1
+        self._wake.set()
+        if curve is None:
+            curve = self.generate(*key)
+        return curve, key[1]
+
+    def get_curve_points(self, begin_pos, end_pos, order=2, transition_time=None):
+        """ This function gets the same arguments as bezier.get_curve_points
+(the control points are always random).
+Returns the same values: a Trajectory, a tuple of the control points and
+the transition time; the curve is taken from the pool."""
+        if order < 2:
+            order = 1
+        if transition_time is None:
+            transition_time = bezier.get_random_travel_time(begin_pos, end_pos)
+        curve, duration = self.take(order, transition_time)
+        return retarget(curve, begin_pos, end_pos, transition_time / duration) + (transition_time,)
+
+    def _next_key(self):
+        # The order and the duration with the fewest curves, None if the pool is full.
+        with self._lock:
+            if not self._curves:
+                return None
+            key, curves = min(self._curves.items(), key=lambda item: len(item[1]))
+            return key if len(curves) < self.size else None
+
+    def _add(self, key, curve):
+        with self._lock:
+            self._curves[key].append(curve)
+            self.generated += 1
+
+    def _refill(self):
+        while self._running:
+            self._wake.clear()
+            key = self._next_key()
+            if key is None:
+                self._wake.wait()
+                continue
+            self._add(key, self.generate(*key))
+
+def retarget(curve, begin_pos, end_pos, time_scale=1.0):
+    """ This function gets a normalized curve (see TrajectoryPool.generate),
+the begin and the end points and the factor of the time stamps.
+Returns a tuple: the Trajectory of the curve from the begin to the end point
+and the tuple of its control points."""
+    begin = complex(*begin_pos)
+    direction = complex(*end_pos) - begin
+    time_stamps = array('d', (time_stamp * time_scale for time_stamp in curve.time_stamps))
+    if numpy is not None and isinstance(curve.points, numpy.ndarray):
+        moved = curve.points * direction + begin
+        coordinates = numpy.empty((len(moved), 2), dtype=numpy.int32)
+        coordinates[:, 0] = numpy.rint(moved.real)
+        coordinates[:, 1] = numpy.rint(moved.imag)
+        points = Trajectory.from_buffer(coordinates, time_stamps)
+    else:
+        points = Trajectory(_round(point * direction + begin) for point in curve.points)
+        points.time_stamps = time_stamps
+    control_points = tuple(_round(point * direction + begin) for point in curve.control_points)
+    return points, control_points
+
+def _round(point):
+    return (int(round(point.real)), int(round(point.imag)))
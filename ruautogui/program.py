@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+#
+# program.py - a module from ruautogui package that keeps a typed message
+#              as a precompiled keystroke program.
+# Features:
+#   - a program is an immutable sequence of key events: the virtual-key codes,
+#     the scan codes, the flags and the delay after every event;
+#   - the random values of a whole message (the typos and the delays) are
+#     drawn at once, by one NumPy call if NumPy is installed;
+#   - the events are split into the groups sent by one SendInput call and
+#     the deadlines of the groups, so a replay does no work between them;
+#   - a program can be saved to a file and loaded back, e.g. to prepare the
+#     programs of the form-filling templates offline.
+
+import json
+import random
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+from ruautogui import lazy
+
+# NumPy is an optional dependency. If it is installed, the random values of
+# a message are drawn by one vectorized call (see sample_keystrokes).
+# It is imported at the first use (see the module lazy).
+numpy = lazy.import_optional('numpy')
+
+# The columns of the random values drawn per character (see sample_keystrokes):
+# the typo decision (1.0 - make a typo), the choice of the typo symbol (from 0 to 1),
+# the delays of the typo keystroke, the pause after the typo, the delays of
+# the backspace and the delays of the keystroke of the character itself.
+(
+    TYPO, TYPO_SYMBOL,
+    TYPO_DELAY1, TYPO_DELAY2, TYPO_PAUSE,
+    BACKSPACE_DELAY1, BACKSPACE_DELAY2,
+    DELAY1, DELAY2
+) = range(9)
+NUMBER_OF_SAMPLES = 9
+
+# The pause after a typo is this number of times longer than a keystroke delay.
+TYPO_PAUSE_FACTOR = 3
+
+# The header of a saved program: the magic bytes, the version of the format
+# and the length of the JSON description that follows it.
+MAGIC = b'RAKP'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHI')
+
+# A run of a program: the events typed in one keyboard layout.
+#   language - the layout of the run or None (the layout is not checked);
+#   groups - a list of tuples (begin, end) - the events sent by one SendInput call;
+#   deadlines - a list of floats - the time in seconds since the beginning of
+#               the run to send every group;
+#   duration - a float - the time of the run including the last delay.
+ProgramRun = namedtuple('ProgramRun', 'language groups deadlines duration')
+
+def sample_keystrokes(number_of_characters, minimum, maximum, typorate=False):
+    """ This function gets the number of the characters of a message, the minimum
+and the maximum delay of a keystroke in seconds and the typo rate of the mode
+(on average one typo per typorate characters, False - no typos).
+Returns a list of lists (one per character) of NUMBER_OF_SAMPLES values,
+the columns are TYPO, TYPO_SYMBOL and the delays (see the constants above).
+All the values are drawn at once."""
+    probability = 1 / (typorate + 1) if typorate else 0
+    spread = maximum - minimum
+    if numpy is not None:
+        samples = numpy.random.random_sample((number_of_characters, NUMBER_OF_SAMPLES))
+        values = minimum + samples * spread
+        values[:, TYPO_PAUSE] *= TYPO_PAUSE_FACTOR
+        values[:, TYPO] = samples[:, TYPO] < probability
+        values[:, TYPO_SYMBOL] = samples[:, TYPO_SYMBOL]
+        return values.tolist()
+
+    rows = []
+    for _ in range(number_of_characters):
+        row = [minimum + random.random() * spread for _ in range(NUMBER_OF_SAMPLES)]
+        row[TYPO_PAUSE] *= TYPO_PAUSE_FACTOR
+        row[TYPO] = float(random.random() < probability)
+        row[TYPO_SYMBOL] = random.random()
+        rows.append(row)
+    return rows
+
+class ProgramBuilder:
+    """ Collects the key events of a program. It has the same methods 'add' and
+'wait' as the batch of the keyboard module, so a keystroke is added to
+a program the same way it is sent."""
+
+    def __init__(self):
+        self.vk = array('H')
+        self.scan = array('H')
+        self.flags = array('I')
+        self.delays = array('d')
+        self.runs = []
+
+    def start_run(self, language):
+        # The following events are typed in the layout of the language.
+        self.runs.append((len(self.vk), language))
+
+    def add(self, vk, flags, scan=0):
+        self.vk.append(vk)
+        self.scan.append(scan)
+        self.flags.append(flags)
+        self.delays.append(0.0)
+
+    def wait(self, delay):
+        # The delay follows the last event added.
+        if self.delays:
+            self.delays[-1] += delay
+
+    def build(self, mode='standard', characters=0):
+        """ Returns the KeystrokeProgram of the collected events."""
+        return KeystrokeProgram(
+            self.vk, self.scan, self.flags, self.delays, self.runs,
+            mode=mode, characters=characters
+        )
+
+class KeystrokeProgram:
+    """ An immutable sequence of key events.
+
+The constructor gets the following arguments:
+    vk, scan, flags - sequences of integers - the virtual-key codes, the scan
+            codes and the flags of the events (see keyboard.send_key_events);
+    delays - a sequence of floats - the delay in seconds after every event;
+    runs - a sequence of tuples (index of the first event, language) -
+            the events typed in one keyboard layout;
+    mode - a string (default = 'standard') - the typing mode of the program;
+    characters - an integer (default = 0) - the number of the typed characters.
+
+The events are available as read-only memoryviews: program.vk, program.scan,
+program.flags and program.delays. Two programs with the same events are equal."""
+
+    def __init__(self, vk, scan, flags, delays, runs=(), mode='standard', characters=0):
+        self._vk = array('H', vk).tobytes()
+        self._scan = array('H', scan).tobytes()
+        self._flags = array('I', flags).tobytes()
+        self._delays = array('d', delays).tobytes()
+        number_of_events = len(self._vk) // 2
+        if not (len(self._scan) // 2 == len(self._flags) // 4 == len(self._delays) // 8 == number_of_events):
+            raise ValueError('The events of a keystroke program must have the same length')
+        self.runs = tuple((int(start), language) for start, language in runs)
+        self.mode = mode
+        self.characters = characters
+
+    @property
+    def vk(self):
+        return memoryview(self._vk).cast('H')
+
+    @property
+    def scan(self):
+        return memoryview(self._scan).cast('H')
+
+    @property
+    def flags(self):
+        return memoryview(self._flags).cast('I')
+
+    @property
+    def delays(self):
+        return memoryview(self._delays).cast('d')
+
+    @property
+    def duration(self):
+        """ The sum of the delays in seconds."""
+        return sum(self.delays)
+
+    def __len__(self):
+        return len(self._vk) // 2
+
+    def __eq__(self, other):
+        if not isinstance(other, KeystrokeProgram):
+            return NotImplemented
+        return self.to_bytes() == other.to_bytes()
+
+    def __hash__(self):
+        return hash(self.to_bytes())
+
+    def __repr__(self):
+        return (f'KeystrokeProgram(events={len(self)}, characters={self.characters}, '
+                f'runs={len(self.runs)}, mode={self.mode!r})')
+
+    def split(self, threshold=0.0):
+        """ This function gets the threshold in seconds: the delays shorter than
+it are summed up and do not interrupt a group of events (0 - every delay does).
+Returns a list of ProgramRun: the groups of the events of every run and
+the deadlines to send them."""
+        delays = self.delays
+        bounds = [start for start, _ in self.runs] + [len(self)]
+        if not self.runs or bounds[0] > 0:
+            bounds.insert(0, 0)
+            languages = [None] + [language for _, language in self.runs]
+        else:
+            languages = [language for _, language in self.runs]
+        result = []
+        for language, start, end in zip(languages, bounds, bounds[1:]):
+            groups = []
+            deadlines = []
+            elapsed = 0.0
+            pending = 0.0
+            begin = start
+            for index in range(start, end):
+                pending += delays[index]
+                if pending > 0 and pending >= threshold:
+                    groups.append((begin, index + 1))
+                    deadlines.append(elapsed)
+                    elapsed += pending
+                    pending = 0.0
+                    begin = index + 1
+            if begin < end:
+                groups.append((begin, end))
+                deadlines.append(elapsed)
+                elapsed += pending
+            if groups:
+                result.append(ProgramRun(language, groups, deadlines, elapsed))
+        return result
+
+    def to_bytes(self):
+        """ Returns the program serialized to bytes (see from_bytes)."""
+        description = json.dumps({
+            'mode': self.mode,
+            'characters': self.characters,
+            'runs': self.runs,
+            'events': len(self)
+        }).encode('utf-8')
+        arrays = [self._vk, self._scan, self._flags, self._delays]
+        if sys.byteorder == 'big':
+            arrays = [_swap_bytes(data, code) for data, code in zip(arrays, 'HHId')]
+        return b''.join([HEADER.pack(MAGIC, FORMAT_VERSION, len(description)), description] + arrays)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """ This function gets the bytes returned by to_bytes.
+Returns the KeystrokeProgram."""
+        magic, version, length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError('The data is not a keystroke program of a supported version')
+        offset = HEADER.size + length
+        description = json.loads(bytes(data[HEADER.size:offset]).decode('utf-8'))
+        events = description['events']
+        arrays = []
+        for code in 'HHId':
+            item = array(code)
+            size = events * item.itemsize
+            item.frombytes(bytes(data[offset:offset + size]))
+            if sys.byteorder == 'big':
+                item.byteswap()
+            arrays.append(item)
+            offset += size
+        return cls(
+            *arrays, runs=description['runs'],
+            mode=description['mode'], characters=description['characters']
+        )
+
+    def save(self, path):
+        """ Saves the program to the file."""
+        with open(path, 'wb') as fd:
+            fd.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """ Returns the program saved to the file (see save)."""
+        with open(path, 'rb') as fd:
+            return cls.from_bytes(fd.read())
+
+def _swap_bytes(data, code):
+    item = array(code)
+    item.frombytes(data)
+    item.byteswap()
+    return item.tobytes()
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+#
+# scheduler.py - a module from ruautogui package that runs the steps of
+#                a movement at their planned time.
+# Features:
+#   - the steps are bound to absolute deadlines from the clock, so 
+#     the overhead of the steps and the timer slop do not add up;
+#   - hybrid waiting: the scheduler sleeps until shortly before a deadline
+#     and then spins, the time spent spinning is limited by a CPU budget;
+#   - under pressure the late steps are dropped (the last one never is);
+#   - a run can be cancelled between the steps and during the waits;
+#   - a run can be awaited in an asyncio event loop (see run_async);
+#   - every run returns the jitter and overrun statistics;
+#   - by default the time is the clock of the package (see the module clocks):
+#     with a virtual clock the runs take no real time.
+
+from collections import namedtuple
+if __name__ == '__main__':
+    import clocks
+else:
+    from ruautogui import clocks
+
+# The statistics of one run (all the times are in seconds):
+#   planned_duration - the time the run had to take;
+#   actual_duration - the measured time of the run;
+#   steps - the number of the steps that have been performed;
+#   dropped - the number of the steps dropped because they were late;
+#   overruns - the number of the steps performed later than the tolerance;
+#   mean_jitter, max_jitter - the mean and maximum lateness of the steps;
+#   spin_time - the time spent spinning;
+#   cancelled - True if the run has been stopped before the last step.
+ScheduleStatistics = namedtuple(
+    'ScheduleStatistics',
+    'planned_duration actual_duration steps dropped overruns mean_jitter max_jitter spin_time cancelled'
+)
+
+class StepScheduler:
+    """ Runs the steps at their deadlines.
+
+The constructor gets the following arguments:
+    spin_threshold - a float (default = 0.002) - the number of seconds before
+                     a deadline when the scheduler stops sleeping and starts 
+                     spinning;
+    cpu_budget - a float from 0 to 1 (default = 0.1) - the maximum share of
+                 the time of a run that can be spent spinning; when it is
+                 exhausted the scheduler only sleeps;
+    overrun_tolerance - a float (default = 0.002) - a step performed later 
+                 than its deadline by this number of seconds is an overrun;
+    drop_late - a boolean (default = True) - if True, a step is dropped when
+                the deadline of the next step has already passed;
+    clock - a function that returns the current time in seconds
+            (default = None - the clock of the package, see clocks.get_clock);
+    sleep - a function that sleeps the given number of seconds
+            (default = None - the clock of the package);
+    stop_check_interval - a float (default = 0.05) - the longest sleep in 
+            seconds between two checks whether a run has to stop."""
+
+    def __init__(
+            self,
+            spin_threshold=0.002,
+            cpu_budget=0.1,
+            overrun_tolerance=0.002,
+            drop_late=True,
+            clock=None,
+            sleep=None,
+            stop_check_interval=0.05
+        ):
+        self.spin_threshold = spin_threshold
+        self.cpu_budget = cpu_budget
+        self.overrun_tolerance = overrun_tolerance
+        self.drop_late = drop_late
+        self.clock = clock
+        self.sleep = sleep
+        self.stop_check_interval = stop_check_interval
+
+    def run(self, deadlines, action, duration=None, should_stop=None, droppable=None):
+        """ This method gets the following arguments:
+    deadlines - a sequence of floats - the deadlines of the steps in seconds
+                from the beginning of the run in ascending order;
+    action - a function that performs a step, it gets the index of the step;
+    duration - a float (default = None) - the planned duration of the run in
+               seconds; if it is longer than the last deadline, the scheduler
+               waits until the end of the run;
+    should_stop - a function without arguments (default = None) - if it returns
+               True, the run stops: it is called before every step and at least
+               every stop_check_interval seconds of a wait;
+    droppable - a sequence of booleans (default = None - every step) - 
+               the steps that can be dropped when they are late (e.g. a button
+               event never is).
+
+This method returns ScheduleStatistics."""
+        timer = self.get_timer()
+        clock = timer[0]
+        tally = _Tally(self, deadlines, duration, clock(), droppable)
+        spin_time = 0.0
+
+        for i in range(len(deadlines)):
+            spin, stopped = self._wait(timer, tally.start + deadlines[i], tally.start, spin_time, should_stop)
+            spin_time += spin
+            if stopped or (should_stop is not None and should_stop()):
+                tally.cancelled = True
+                break
+            if tally.due(i, clock()):
+                action(i)
+
+        if not tally.cancelled:
+            # A run stopped during the wait for its end is cancelled as well.
+            spin, tally.cancelled = self._wait(timer, tally.start + tally.duration, tally.start, spin_time, should_stop)
+            spin_time += spin
+        return tally.statistics(clock(), spin_time)
+
+    async def run_async(self, deadlines, action, duration=None, should_stop=None, droppable=None):
+        """ This coroutine gets the same arguments as 'run'.
+Runs the steps without blocking the event loop: the waits are asyncio.sleep
+(there is no spinning, so the jitter is the resolution of the loop timers).
+
+This coroutine returns ScheduleStatistics."""
+        timer = self.get_timer()
+        clock = timer[0]
+        tally = _Tally(self, deadlines, duration, clock(), droppable)
+
+        for i in range(len(deadlines)):
+            await _sleep_until(timer, tally.start + deadlines[i])
+            if should_stop is not None and should_stop():
+                tally.cancelled = True
+                break
+            if tally.due(i, clock()):
+                action(i)
+
+        if not tally.cancelled:
+            await _sleep_until(timer, tally.start + tally.duration)
+        return tally.statistics(clock(), 0.0)
+
+    def follow(self, stream, action, should_stop=None):
+        """ This method gets the following arguments:
+    stream - an iterable of tuples, the last item of a tuple is the deadline
+             of the step in seconds from the beginning of the run (e.g. 
+             bezier.CurveStream); the next tuple is requested after the step;
+    action - a function that performs a step, it gets the tuple;
+    should_stop - the same as of 'run'.
+The steps are never dropped: the deadline of the next step is unknown.
+
+This method returns ScheduleStatistics."""
+        timer = self.get_timer()
+        clock = timer[0]
+        tally = _Tally(self, (), 0, clock())
+        spin_time = 0.0
+        for item in stream:
+            deadline = tally.start + item[-1]
+            spin, stopped = self._wait(timer, deadline, tally.start, spin_time, should_stop)
+            spin_time += spin
+            if stopped or (should_stop is not None and should_stop()):
+                tally.cancelled = True
+                break
+            tally.record(clock() - deadline)
+            action(item)
+            tally.duration = item[-1]
+        return tally.statistics(clock(), spin_time)
+
+    def get_timer(self):
+        """ Returns a tuple of the clock and the sleep functions of a run and
+the virtual clock of the package (None if the time is real or the functions
+have been given to the constructor)."""
+        source = clocks.get_clock()
+        if self.clock is None and self.sleep is None and source.virtual:
+            return source.time, source.sleep, source
+        return self.clock or source.time, self.sleep or source.sleep, None
+
+    def _wait(self, timer, deadline, start, spin_time, should_stop=None):
+        # Sleeps until shortly before the deadline and spins the rest of the time
+        # if the CPU budget allows. Returns a tuple: the time spent spinning and
+        # True if the wait has been stopped by should_stop.
+        clock, sleep, virtual = timer
+        if virtual is not None:
+            return self._wait_virtual(virtual, deadline, should_stop)
+        remaining = deadline - clock()
+        if remaining <= 0:
+            return 0.0, False
+        budget = self.cpu_budget * (deadline - start) - spin_time
+        if remaining > self.spin_threshold or remaining > budget:
+            sleep_time = remaining - min(self.spin_threshold, max(budget, 0))
+            if should_stop is None:
+                sleep(sleep_time)
+            else:
+                # The sleep is cut into slices to check whether to stop.
+                wake_up = clock() + sleep_time
+                while not should_stop():
+                    left = wake_up - clock()
+                    if left <= 0:
+                        break
+                    sleep(min(left, self.stop_check_interval))
+                else:
+                    return 0.0, True
+        spin_start = clock()
+        while clock() < deadline:
+            pass
+        return clock() - spin_start, False
+
+    def _wait_virtual(self, virtual, deadline, should_stop=None):
+        # The virtual time jumps to the deadline exactly, there is nothing
+        # to spin; should_stop is checked every stop_check_interval of it.
+        if should_stop is not None:
+            while deadline - virtual.time() > self.stop_check_interval:
+                if should_stop():
+                    return 0.0, True
+                virtual.sleep(self.stop_check_interval)
+        virtual.sleep_until(deadline)
+        return 0.0, False
+
+class _Tally:
+    # The statistics of a run being collected.
+
+    def __init__(self, scheduler, deadlines, duration, start, droppable=None):
+        self.scheduler = scheduler
+        self.deadlines = deadlines
+        self.droppable = droppable
+        self.start = start
+        self.duration = duration if duration is not None else (deadlines[-1] if len(deadlines) else 0)
+        self.steps = 0
+        self.dropped = 0
+        self.overruns = 0
+        self.total_jitter = 0.0
+        self.max_jitter = 0.0
+        self.cancelled = False
+
+    def due(self, i, now):
+        # Returns True if the step i has to be performed now, False if it is dropped.
+        deadlines = self.deadlines
+        # The step is dropped if the next one is already due.
+        if (self.scheduler.drop_late and i < len(deadlines) - 1 and now >= self.start + deadlines[i + 1]
+                and (self.droppable is None or self.droppable[i])):
+            self.dropped += 1
+            return False
+        self.record(now - (self.start + deadlines[i]))
+        return True
+
+    def record(self, jitter):
+        # A step has been performed later than its deadline by jitter seconds.
+        self.steps += 1
+        self.total_jitter += jitter
+        if jitter > self.max_jitter:
+            self.max_jitter = jitter
+        if jitter > self.scheduler.overrun_tolerance:
+            self.overruns += 1
+
+    def statistics(self, now, spin_time):
+        return ScheduleStatistics(
+            planned_duration=self.duration,
+            actual_duration=now - self.start,
+            steps=self.steps,
+            dropped=self.dropped,
+            overruns=self.overruns,
+            mean_jitter=self.total_jitter / self.steps if self.steps else 0.0,
+            max_jitter=self.max_jitter,
+            spin_time=spin_time,
+            cancelled=self.cancelled
+        )
+
+async def _sleep_until(timer, deadline):
+    # asyncio is imported only by the programs that use it (see the module lazy).
+    import asyncio
+    clock, _, virtual = timer
+    if virtual is not None:
+        virtual.sleep_until(deadline)
+        # The other tasks of the loop run between the steps.
+        await asyncio.sleep(0)
+        return None
+    remaining = deadline - clock()
+    if remaining > 0:
+        await asyncio.sleep(remaining)
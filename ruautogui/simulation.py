@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# simulation.py - a module from ruautogui package that runs the scripts in
+#                 virtual time.
+# Features:
+#   - the package waits by a virtual clock (see clocks.VirtualClock): the sleeps
+#     of the movements, the clicks and the typing take no real time;
+#   - the events are recorded with their virtual time stamps instead of being
+#     injected (see backends.recording), so the planned timing and the order
+#     of the events can be asserted exactly;
+#   - the calibration of the host is replaced by a fixed one, so a simulation
+#     gives the same result on every host;
+#   - the clock, the backend, the calibration and the keyboard layouts loaded
+#     from the backend are restored when the simulation stops.
+
+if __name__ == '__main__':
+    import backends
+    import calibration
+    import clocks
+    import keyboard
+    import mouse
+    from backends.recording import RecordingBackend
+else:
+    from ruautogui import backends
+    from ruautogui import calibration
+    from ruautogui import clocks
+    from ruautogui import keyboard
+    from ruautogui import mouse
+    from ruautogui.backends.recording import RecordingBackend
+
+# The host a simulation pretends to run on: the sleep is exact to a millisecond
+# and the injection takes no time.
+CALIBRATION = calibration.Calibration(
+    sleep_granularity=0.001,
+    injection_cost=0.0,
+    frame_time=calibration.MINIMUM_FRAME_TIME
+)
+
+class Simulation:
+    """ Runs the package in virtual time and records its input events.
+It is a context manager:
+
+    with Simulation() as simulation:
+        mouse.move((300, 200), transition_time=500)
+        mouse.click()
+    events = simulation.get_events()
+
+The constructor gets the following arguments:
+    start - a float (default = 0.0) - the virtual time in seconds the simulation
+            starts at;
+    host - a calibration.Calibration (default = CALIBRATION) - the calibration
+            used during the simulation;
+    the other keyword arguments are passed to backends.recording.RecordingBackend
+    (e.g. screen_size, position)."""
+
+    def __init__(self, start=0.0, host=CALIBRATION, **kwargs):
+        self.clock = clocks.VirtualClock(start)
+        self.backend = RecordingBackend(clock=self.clock.time, **kwargs)
+        self.host = host
+        self._saved = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """ Makes the virtual clock, the recording backend and the calibration
+the current ones of the package, the keyboard layouts are loaded from
+the recording backend."""
+        if self._saved is not None:
+            raise RuntimeError('The simulation has already been started.')
+        self._saved = (
+            clocks.set_clock(self.clock),
+            backends._backend,
+            calibration._calibration,
+            calibration._injection_measured,
+            mouse._calibrated,
+            mouse.MINIMUM_SLEEP_TIME,
+            mouse.scheduler.spin_threshold,
+            keyboard.layout_manager.handles,
+            keyboard._character_table
+        )
+        # The layouts of the recording backend are loaded on the first use
+        # (see keyboard.clear_layout_caches).
+        backends.set_backend(self.backend)
+        calibration._calibration = self.host
+        calibration._injection_measured = True
+        # The mouse takes the frame time of the simulated host.
+        mouse._calibrated = False
+
+    def stop(self):
+        """ Restores the clock, the backend, the calibration and the keyboard
+layouts of the package."""
+        if self._saved is None:
+            return None
+        (clock, backends._backend, calibration._calibration,
+         calibration._injection_measured, mouse._calibrated,
+         mouse.MINIMUM_SLEEP_TIME, mouse.scheduler.spin_threshold,
+         keyboard.layout_manager.handles, keyboard._character_table) = self._saved
+        clocks.set_clock(clock)
+        self._saved = None
+
+    @property
+    def elapsed(self):
+        """ The virtual time in seconds since the beginning of the recording."""
+        return self.clock.time() - self.backend.start
+
+    def get_events(self, kind=None):
+        """ Returns the recorded events (see backends.recording.RecordingBackend.get_events)."""
+        return self.backend.get_events(kind)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+#
+# streaming.py - a module from ruautogui package that processes large or
+#                unbounded text sources in bounded chunks.
+# Features:
+#   - a string, a text file or any iterable of strings is cut into chunks of
+#     a fixed number of characters, the whole text is never held in memory;
+#   - a two-stage pipeline: the next chunks are prepared by a background
+#     thread while the current one is consumed by the calling thread;
+#   - the queue between the stages is bounded, so the memory stays constant;
+#   - the pipeline can be cancelled, the errors of the background thread are
+#     raised in the calling one;
+#   - the characters of a slow source (e.g. a log being written) are not held
+#     back: a partial chunk is yielded once the source has been idle for
+#     a while (see iter_chunks).
+
+import queue
+import threading
+
+# The number of the prepared chunks that can wait in the queue.
+PIPELINE_DEPTH = 2
+
+# The longest time in seconds the stages wait for each other before they check
+# whether the pipeline has been stopped.
+POLL_INTERVAL = 0.05
+
+# The time in seconds a source can be idle before its pending characters are
+# yielded as a partial chunk (see iter_chunks).
+IDLE_TIMEOUT = 0.2
+
+_END = object()
+
+def iter_chunks(source, chunk_size=1024, idle_timeout=None):
+    """ This function gets the following arguments:
+    source - a string, a text file object (anything with the method 'read')
+             or an iterable of strings;
+    chunk_size - an integer (default = 1024) - the number of the characters
+             of a chunk;
+    idle_timeout - a float (default = None - never) - if an iterable source 
+             gives no string for this number of seconds, the characters 
+             received so far are yielded as a shorter chunk (the iterable is
+             read by a background thread then).
+Yields the strings of chunk_size characters (the last one can be shorter)."""
+    if chunk_size < 1:
+        raise ValueError('The size of a chunk must be positive')
+    if isinstance(source, str):
+        for begin in range(0, len(source), chunk_size):
+            yield source[begin:begin + chunk_size]
+        return
+    read = getattr(source, 'read', None)
+    if read is not None:
+        while True:
+            chunk = read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    if idle_timeout is not None:
+        source = _iter_pieces(source, idle_timeout)
+    rest = ''
+    try:
+        for piece in source:
+            if piece is None:
+                # The source is idle: the pending characters are not held back.
+                if rest:
+                    yield rest
+                    rest = ''
+                continue
+            if rest:
+                piece = rest + piece
+            end = len(piece) - len(piece) % chunk_size
+            for begin in range(0, end, chunk_size):
+                yield piece[begin:begin + chunk_size]
+            rest = piece[end:]
+    finally:
+        if idle_timeout is not None:
+            # The reading thread stops when the chunks are not needed any more.
+            source.close()
+    if rest:
+        yield rest
+
+def _iter_pieces(source, idle_timeout):
+    # Yields the strings of the source read by a background thread and None
+    # every time no string has come for idle_timeout seconds. When the generator
+    # is closed, the thread is stopped: it stops at the next string of the source
+    # (it is not waited for longer than POLL_INTERVAL if the source is blocked).
+    pieces = queue.Queue(maxsize=PIPELINE_DEPTH)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pieces.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def reader():
+        try:
+            for piece in source:
+                if not put((piece, None)):
+                    return
+        except BaseException as exc:
+            put((None, exc))
+            return
+        put((_END, None))
+
+    thread = threading.Thread(target=reader, name='ruautogui-source', daemon=True)
+    thread.start()
+    try:
+        while True:
+            try:
+                piece, error = pieces.get(timeout=idle_timeout)
+            except queue.Empty:
+                yield None
+                continue
+            if error is not None:
+                raise error
+            if piece is _END:
+                return
+            yield piece
+    finally:
+        stop.set()
+        # The reader blocked by the full queue is released at once.
+        while not pieces.empty():
+            pieces.get_nowait()
+        thread.join(POLL_INTERVAL)
+
+def pipeline(items, produce, consume, depth=PIPELINE_DEPTH, should_stop=None):
+    """ This function gets the following arguments:
+    items - an iterable - the input of the pipeline;
+    produce - a function that gets an item and returns its result, it is
+              called in a background thread;
+    consume - a function that gets a result, it is called in the calling
+              thread in the order of the items;
+    depth - an integer (default = PIPELINE_DEPTH) - the maximum number of
+              the results waiting to be consumed;
+    should_stop - a function without arguments (default = None) - if it
+              returns True, the pipeline stops.
+Returns True if all the items have been consumed, False if the pipeline has
+been stopped. An exception raised by 'produce' is raised by this function.
+A stopped pipeline returns at once: the background thread (a daemon) is not
+waited for if it is blocked by the items or by 'produce'."""
+    results = queue.Queue(maxsize=depth)
+    finished = threading.Event()
+
+    def put(result):
+        while not finished.is_set():
+            try:
+                results.put(result, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def producer():
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if finished.is_set() or not put((produce(item), None)):
+                    return
+        except BaseException as exc:
+            put((None, exc))
+            return
+        finally:
+            # A generator of the items (e.g. iter_chunks) releases its resources.
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+        put((_END, None))
+
+    thread = threading.Thread(target=producer, name='ruautogui-pipeline', daemon=True)
+    thread.start()
+    try:
+        while True:
+            if should_stop is not None and should_stop():
+                return False
+            try:
+                result, error = results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if error is not None:
+                raise error
+            if result is _END:
+                return True
+            consume(result)
+    finally:
+        finished.set()
+        thread.join(POLL_INTERVAL)
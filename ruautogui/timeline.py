@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+#
+# timeline.py - a module from ruautogui package that runs the mouse and
+#               the keyboard events on one timeline.
+# Features:
+#   - the movements, the mouse button events and the key events of several
+#     actions are merged by their time into one sequence (heapq.merge) and run
+#     by one deadline scheduler (the scheduler of the module mouse);
+#   - the actions can overlap: e.g. a drag-and-drop along a Bezier curve while
+#     ctrl is held, a shift-click;
+#   - the events due at the same time are sent together: the key events by one
+#     SendInput call, the button events by another, of the movements only
+#     the last one;
+#   - a late step of a movement can be dropped, the button and the key events
+#     never are.
+
+import heapq
+import logging
+logger = logging.getLogger('ruautogui.timeline')
+
+if __name__ == '__main__':
+    import backends
+    import keyboard
+    import mouse
+    from backends.base import KEYEVENTF_KEYDOWN, KEYEVENTF_KEYUP
+else:
+    from ruautogui import backends
+    from ruautogui import keyboard
+    from ruautogui import mouse
+    from ruautogui.backends.base import KEYEVENTF_KEYDOWN, KEYEVENTF_KEYUP
+
+# The kinds of the events of a timeline.
+MOVE = 0    # the fields are x, y;
+BUTTON = 1  # the field is the flags (MOUSEEVENTF_*);
+KEY = 2     # the fields are the virtual-key code, the flags (KEYEVENTF_*), the scan code.
+
+# The pause in seconds between the modifiers and the action they modify and
+# between the press of a button and the movement of a drag.
+PAUSE = 0.05
+
+class Timeline:
+    """ Plans the input events of several actions at their time and runs them
+in one pass.
+
+The constructor gets the position of the cursor the first movement begins at
+(default = None - the position of the cursor when the movement is planned).
+
+The times are in seconds from the beginning of the run. An action gets its
+start time (default = None - the end of the timeline, i.e. after the actions
+added so far) and returns the time it ends at, e.g.:
+
+    timeline = Timeline()
+    timeline.hold('ctrl', 0.0, timeline.drag((500, 300), start=0.1) + 0.1)
+    timeline.run()"""
+
+    def __init__(self, position=None):
+        # Every action adds a track: a list of the events sorted by time.
+        self.tracks = []
+        self.position = position
+        self.end = 0.0
+        self._count = 0
+
+    def __len__(self):
+        return sum(len(track) for track in self.tracks)
+
+    def add(self, events):
+        """ This method gets an iterable of tuples (time, kind, *fields)
+sorted by time (see the kinds above). Adds them as a track of the timeline.
+Returns the time of the last event."""
+        track = []
+        for event in events:
+            # The events of the same time keep the order they are added in.
+            track.append((event[0], self._count, event[1], tuple(event[2:])))
+            self._count += 1
+        if not track:
+            return self.end
+        self.tracks.append(track)
+        self.end = max(self.end, track[-1][0])
+        return track[-1][0]
+
+    def move(self, end_pos, start=None, order=2, transition_time=None, sampling='adaptive', control_points=None):
+        """ This method gets the start time and the arguments of mouse.move
+(control_points - the same as of bezier.get_curve_points).
+Adds a movement from the end of the previous movement of the timeline.
+Returns the time the movement ends at."""
+        start = self._get_start(start)
+        begin_pos = self.position if self.position is not None else mouse.get_mouse_cursor_position()
+        points, _, random_time = mouse.plan_curve(begin_pos, end_pos, order, transition_time, sampling, control_points)
+        if transition_time is None:
+            transition_time = random_time
+        deadlines, duration = mouse.get_deadlines(points, transition_time)
+        self.add((start + deadline, MOVE, x, y) for deadline, (x, y) in zip(deadlines, points[1:]))
+        self.position = tuple(points[-1])
+        end = start + (duration if duration is not None else (deadlines[-1] if deadlines else 0.0))
+        self.end = max(self.end, end)
+        return end
+
+    def button(self, time, button='left', down=True):
+        """ Adds the press (down=True) or the release of the mouse button.
+Returns the time."""
+        flags = mouse.get_button_flags(button)
+        if flags is None:
+            raise ValueError(f'Unknown mouse button {button}')
+        return self.add([(time, BUTTON, flags[0] if down else flags[1])])
+
+    def click(self, start=None, button='left', double_click=False, hold=None, keys=()):
+        """ This method gets the start time, the arguments of mouse.click and
+the keys held during the click (e.g. ('shift',) for a shift-click).
+Returns the time the click ends at."""
+        start = self._get_start(start)
+        begin = start + PAUSE if keys else start
+        edges = mouse.get_click_edges(button, double_click, hold)
+        if edges is None:
+            raise ValueError(f'Unknown mouse button {button}')
+        end = self.add((begin + time, BUTTON, flag) for time, flags in edges for flag in flags)
+        if keys:
+            end = self.hold(keys, start, end + PAUSE)
+        return end
+
+    def drag(self, end_pos, start=None, button='left', keys=(), order=2, transition_time=None, sampling='adaptive'):
+        """ This method gets the target of the drag, the start time, the mouse
+button and the keys held during the drag, the other arguments are the same
+as of 'move'. Presses the button, moves the cursor and releases the button
+with a PAUSE between them. Returns the time the drag ends at."""
+        start = self._get_start(start)
+        time = start + PAUSE if keys else start
+        self.button(time, button)
+        time = self.move(end_pos, time + PAUSE, order, transition_time, sampling) + PAUSE
+        self.button(time, button, down=False)
+        if keys:
+            time = self.hold(keys, start, time + PAUSE)
+        return time
+
+    def press(self, time, *keys):
+        """ Adds the presses of the keys (the names of keyboard.mapping or
+virtual-key codes) one after another. Returns the time."""
+        return self.add((time, KEY, get_vk(key), KEYEVENTF_KEYDOWN, 0) for key in keys)
+
+    def release(self, time, *keys):
+        """ Adds the releases of the keys in the reverse order. Returns the time."""
+        return self.add((time, KEY, get_vk(key), KEYEVENTF_KEYUP, 0) for key in reversed(keys))
+
+    def hold(self, keys, start, end):
+        """ This method gets a key or a tuple of keys, the time to press them and
+the time to release them. Returns the time of the release."""
+        if isinstance(keys, (str, int)):
+            keys = (keys,)
+        self.press(start, *keys)
+        return self.release(end, *keys)
+
+    def merge(self):
+        """ Returns an iterator of the events of all the tracks sorted by time:
+tuples (time, sequence number, kind, fields)."""
+        return heapq.merge(*self.tracks)
+
+    def compile(self, backend=None):
+        """ This method gets a backend (default = None - the current one).
+Returns a tuple: the deadlines of the steps, the steps (lists of tuples of
+a function of the backend and its arguments) and the droppable flags of
+the steps (see scheduler.StepScheduler.run)."""
+        if backend is None:
+            backend = backends.get_backend()
+        deadlines, steps, droppable = [], [], []
+        segments = None
+        for time, _, kind, fields in self.merge():
+            if not deadlines or time != deadlines[-1]:
+                deadlines.append(time)
+                segments = []
+                steps.append(segments)
+            # The events of the same kind that follow each other at the same time
+            # are one segment, i.e. one call of the backend.
+            if segments and segments[-1][0] == kind:
+                segments[-1][1].append(fields)
+            else:
+                segments.append((kind, [fields]))
+        for i, segments in enumerate(steps):
+            steps[i] = [_bind(backend, kind, fields) for kind, fields in segments]
+            droppable.append(all(kind == MOVE for kind, _ in segments))
+        return deadlines, steps, droppable
+
+    def run(self, should_stop=None):
+        """ Runs the events at their time by the scheduler of the module mouse
+(see mouse.scheduler), should_stop is the same as of its method 'run'.
+Returns scheduler.ScheduleStatistics."""
+        deadlines, steps, droppable = self.compile()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Timeline: %s events in %s steps', len(self), len(steps))
+        return mouse.scheduler.run(deadlines, mouse.get_step_function(steps), self.end, should_stop, droppable)
+
+    async def run_async(self):
+        """ The same as 'run' without blocking the event loop (see aio)."""
+        deadlines, steps, droppable = self.compile()
+        return await mouse.scheduler.run_async(deadlines, mouse.get_step_function(steps), self.end, droppable=droppable)
+
+    def _get_start(self, start):
+        return self.end if start is None else start
+
+def get_vk(key):
+    """ This function gets the name of a key (see keyboard.mapping) or
+a virtual-key code. Returns the virtual-key code."""
+    if isinstance(key, int):
+        return key
+    return keyboard.mapping[key.lower() if len(key) > 1 else key]
+
+def _bind(backend, kind, fields):
+    # Returns a tuple of the function of the backend and its arguments.
+    if kind == MOVE:
+        # Only the last position of the cursor matters.
+        return backend.set_cursor_position, fields[-1]
+    if kind == BUTTON:
+        return backend.send_mouse_events, (tuple(field[0] for field in fields),)
+    return backend.send_prepared, (backend.prepare_key_events(*zip(*fields)),)
+
+def click(button='left', double_click=False, hold=None, keys=()):
+    """ This function gets the arguments of Timeline.click.
+Clicks at the current mouse position while the keys are held (e.g. a shift-click).
+Returns scheduler.ScheduleStatistics."""
+    timeline = Timeline()
+    timeline.click(0.0, button, double_click, hold, keys)
+    return timeline.run()
+
+def drag(end_pos, button='left', keys=(), order=2, transition_time=None, sampling='adaptive'):
+    """ This function gets the arguments of Timeline.drag.
+Drags from the current mouse position to the end point along a Bezier curve
+while the keys are held. Returns scheduler.ScheduleStatistics."""
+    timeline = Timeline()
+    timeline.drag(end_pos, 0.0, button, keys, order, transition_time, sampling)
+    return timeline.run()
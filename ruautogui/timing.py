@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+#
+# timing.py - a module from ruautogui package that models the intervals
+#             between the keystrokes of a human typist.
+# Features:
+#   - the interval depends on the pair of the keys (digraph): the keys of
+#     the alternate hands are fast, the keys of the same finger are slow,
+#     the measured digraphs of a timing file have their own intervals;
+#   - a switch of the keyboard layout adds a pause;
+#   - the tables of every language are built once from the timing files
+#     (DATA_DIRECTORY/timing_<language>.json) into flat arrays indexed by
+#     the pair of virtual-key codes;
+#   - the files shipped with the package are per-class estimates (see their
+#     "source"): every pair of keys has the interval of its class and there
+#     are no digraphs. Point DATA_DIRECTORY to the files with the digraphs
+#     measured from real typists for a finer model;
+#   - the intervals of a whole message are drawn at once, by one NumPy call
+#     if NumPy is installed.
+
+import json
+import math
+import os
+import random
+from array import array
+
+from ruautogui import layouts, lazy
+
+# NumPy is an optional dependency. If it is installed, the intervals of
+# a message are drawn by one vectorized call (see sample_intervals).
+# It is imported at the first use (see the module lazy).
+numpy = lazy.import_optional('numpy')
+
+# The languages with the timing files. The tables are indexed by the virtual-key
+# codes, so the russian characters (and the keys of keyboard.ru_mapping) use
+# the physical keys they are typed by.
+LANGUAGES = ('english', 'russian')
+
+# The number of the virtual-key codes: the table of a language has
+# NUMBER_OF_KEYS ** 2 entries, the entry of the pair (a, b) is a * NUMBER_OF_KEYS + b.
+NUMBER_OF_KEYS = 256
+
+# The rows of the physical keys (by the english characters) and the finger
+# of every key: 0-3 - the fingers of the left hand from the little one,
+# 4-7 - the fingers of the right hand from the index one.
+KEY_ROWS = ('`1234567890-=', 'qwertyuiop[]\\', "asdfghjkl;'", 'zxcvbnm,./')
+KEY_FINGERS = (
+    (0, 0, 1, 2, 3, 3, 4, 4, 5, 6, 7, 7, 7),
+    (0, 1, 2, 3, 3, 4, 4, 5, 6, 7, 7, 7, 7),
+    (0, 1, 2, 3, 3, 4, 4, 5, 6, 7, 7),
+    (0, 1, 2, 3, 3, 4, 4, 5, 6, 7)
+)
+SPACE_KEY = 0x20
+
+LANGUAGE_CODES = {language: code for code, language in enumerate(LANGUAGES)}
+
+# The directory of the timing files, it can be changed before the first use.
+DATA_DIRECTORY = layouts.DATA_DIRECTORY
+
+_models = {}
+_tables = None
+
+class TimingModel:
+    """ The intervals between the keystrokes of one language.
+
+The constructor gets the following arguments:
+    mu, sigma - sequences of NUMBER_OF_KEYS ** 2 floats - the parameters of
+            the lognormal distribution of the interval (in seconds) of every
+            pair of keys;
+    switch - a tuple (mu, sigma) - the parameters of the pause before
+            a keystroke that follows a switch of the layout."""
+
+    def __init__(self, mu, sigma, switch):
+        if numpy is not None:
+            self.mu = numpy.asarray(mu, dtype=numpy.float32)
+            self.sigma = numpy.asarray(sigma, dtype=numpy.float32)
+        else:
+            self.mu = array('f', mu)
+            self.sigma = array('f', sigma)
+        self.switch = switch
+
+    @classmethod
+    def load(cls, language):
+        """ Returns the model built from the timing file of the language
+(see DATA_DIRECTORY): the intervals of the classes of the pairs of keys,
+overridden by the intervals of the digraphs of the file."""
+        path = os.path.join(DATA_DIRECTORY, f'timing_{language}.json')
+        with open(path, 'r', encoding='utf-8') as fd:
+            data = json.load(fd)
+        classes = {name: _lognormal(*values) for name, values in data['classes'].items()}
+
+        mu = array('f', [classes['other'][0]]) * NUMBER_OF_KEYS ** 2
+        sigma = array('f', [classes['other'][1]]) * NUMBER_OF_KEYS ** 2
+        keys = get_physical_keys()
+        for first, (first_hand, first_finger) in keys.items():
+            for second, (second_hand, second_finger) in keys.items():
+                if first == second:
+                    name = 'same_key'
+                elif SPACE_KEY in (first, second):
+                    name = 'space'
+                elif first_finger == second_finger:
+                    name = 'same_finger'
+                elif first_hand == second_hand:
+                    name = 'same_hand'
+                else:
+                    name = 'other_hand'
+                index = first * NUMBER_OF_KEYS + second
+                mu[index], sigma[index] = classes[name]
+
+        table = layouts.load_layout_file(language)
+        for digraph, values in data.get('digraphs', {}).items():
+            first, second = (table.get(ord(character), (0, 0))[0] for character in digraph)
+            index = first * NUMBER_OF_KEYS + second
+            mu[index], sigma[index] = _lognormal(*values)
+        return cls(mu, sigma, _lognormal(*data['layout_switch']))
+
+def get_physical_keys():
+    """ Returns a dictionary virtual-key code -> (hand, finger) of the keys of
+KEY_ROWS and the space bar (the hand of the space bar is 2, it is typed by
+a thumb)."""
+    table = layouts.load_layout_file('english')
+    keys = {SPACE_KEY: (2, 8)}
+    for row, fingers in zip(KEY_ROWS, KEY_FINGERS):
+        for character, finger in zip(row, fingers):
+            keys[table[ord(character)][0]] = (finger // 4, finger)
+    return keys
+
+def get_model(language):
+    """ Returns the TimingModel of the language (built on the first call).
+The languages without a timing file use the model of LANGUAGES[0]."""
+    if language not in LANGUAGES:
+        language = LANGUAGES[0]
+    model = _models.get(language)
+    if model is None:
+        model = _models[language] = TimingModel.load(language)
+    return model
+
+def sample_intervals(keys, languages, speed=1.0):
+    """ This function gets the following arguments:
+    keys - a sequence of integers - the virtual-key codes of the keystrokes
+           of a message (0 - a key that is not on the keyboard, e.g. a character
+           sent as Unicode);
+    languages - a sequence of strings - the layout of every keystroke
+           (None - the layout of the previous keystroke);
+    speed - a float (default = 1.0) - the intervals are divided by it.
+Returns a list of floats - the interval in seconds after every keystroke, i.e.
+before the next one; the interval after the last keystroke is the one before
+an unknown key. A pause is added before a keystroke that follows a switch
+of the layout. All the intervals are drawn at once."""
+    number_of_keys = len(keys)
+    if number_of_keys == 0:
+        return []
+    # The index of the layout of every keystroke in LANGUAGES (or -1 - the previous one).
+    codes = [LANGUAGE_CODES.get(language, 0) if language is not None else -1 for language in languages]
+
+    if numpy is not None:
+        mu, sigma, switch = get_tables()
+        codes = numpy.asarray(codes, dtype=numpy.intp)
+        if codes[0] < 0:
+            codes[0] = 0
+        undefined = codes < 0
+        if undefined.any():
+            # The previous layout is carried forward.
+            positions = numpy.where(undefined, 0, numpy.arange(number_of_keys))
+            codes = codes[numpy.maximum.accumulate(positions)]
+        # The interval after a keystroke is determined by the next one.
+        keys = numpy.asarray(keys, dtype=numpy.intp)
+        pairs = keys * NUMBER_OF_KEYS
+        pairs[:-1] += keys[1:]
+        next_codes = numpy.empty_like(codes)
+        next_codes[:-1] = codes[1:]
+        next_codes[-1] = codes[-1]
+        pairs += next_codes * NUMBER_OF_KEYS ** 2
+        normal = numpy.random.standard_normal((2, number_of_keys))
+        intervals = numpy.exp(mu[pairs] + sigma[pairs] * normal[0])
+        switches = codes != next_codes
+        if switches.any():
+            intervals[switches] += numpy.exp(
+                switch[next_codes[switches], 0] + switch[next_codes[switches], 1] * normal[1][switches]
+            )
+        if speed != 1.0:
+            intervals /= speed
+        return intervals.tolist()
+
+    models = [get_model(language) for language in LANGUAGES]
+    intervals = []
+    current = max(codes[0], 0)
+    for index in range(number_of_keys):
+        following = keys[index + 1] if index + 1 < number_of_keys else 0
+        next_code = codes[index + 1] if index + 1 < number_of_keys else -1
+        if next_code < 0:
+            next_code = current
+        model = models[next_code]
+        pair = keys[index] * NUMBER_OF_KEYS + following
+        interval = random.lognormvariate(model.mu[pair], model.sigma[pair])
+        if next_code != current:
+            interval += random.lognormvariate(*model.switch)
+        intervals.append(interval / speed)
+        current = next_code
+    return intervals
+
+def get_tables():
+    """ Returns the tables of all the LANGUAGES stacked into NumPy arrays 
+(mu, sigma, switch): the entry of the pair of keys (a, b) in the language l 
+is l * NUMBER_OF_KEYS ** 2 + a * NUMBER_OF_KEYS + b, the row l of switch is
+(mu, sigma) of the pause after a switch to the language l."""
+    global _tables
+    if _tables is None:
+        models = [get_model(language) for language in LANGUAGES]
+        _tables = (
+            numpy.concatenate([model.mu for model in models]),
+            numpy.concatenate([model.sigma for model in models]),
+            numpy.array([model.switch for model in models])
+        )
+    return _tables
+
+def _lognormal(mean, deviation):
+    # The parameters (mu, sigma) of the lognormal distribution of the interval
+    # in seconds with the given mean and standard deviation in milliseconds.
+    mean, deviation = mean / 1000, deviation / 1000
+    variance = math.log(1 + (deviation / mean) ** 2)
+    return (math.log(mean) - variance / 2, math.sqrt(variance))
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+#
+# trajectory.py - a module from ruautogui package that stores the points of
+#                 a mouse movement in a compact form.
+# Features:
+#   - all the coordinates are kept in one interleaved int32 buffer
+#     (x0, y0, x1, y1, ...) instead of a tuple of tuples;
+#   - optional per-point time stamps in milliseconds;
+#   - supports the buffer protocol, so the coordinates can be read without
+#     copying, e.g. numpy.frombuffer(trajectory, dtype='int32').reshape(-1, 2);
+#   - iterates, indexes, searches (in, index, count), concatenates and
+#     repeats like the old tuple of (x, y) tuples;
+#   - the list methods (append, extend, insert, pop, remove, reverse and
+#     the assignment and deletion of items) change the points and keep
+#     the time stamps in step.
+
+import array
+
+# The type code of the buffer. 'i' is a 32-bit signed integer on all the
+# supported platforms.
+TYPECODE = 'i'
+
+class Trajectory(array.array):
+    """ A sequence of (x, y) points of a mouse movement.
+
+The constructor gets the following arguments:
+    points - an iterable of tuples of x and y coordinates (default = empty);
+    time_stamps - an iterable of floats - the time of every point in 
+                  milliseconds from the beginning of the movement
+                  (default = None - the trajectory has no time stamps).
+
+The length, the indexing, the iteration, the search ('in', index and count),
+the concatenation and the repetition work with points, i.e. trajectory[i] is
+a tuple (x, y), while the underlying buffer holds 2 * len(trajectory) integers.
+A trajectory is concatenated with another one or with a tuple or a list of
+points; the result has time stamps if both operands have them, the time stamps
+of the second one (of every repetition) follow the duration of the first one.
+The trajectory is changed by points as well: append, extend, insert, pop,
+remove, reverse, trajectory[i] = (x, y) and del trajectory[i]; a point added
+to a trajectory with time stamps needs its time stamp."""
+
+    def __new__(cls, points=(), time_stamps=None):
+        return super().__new__(cls, TYPECODE)
+
+    def __init__(self, points=(), time_stamps=None):
+        self.fromlist([coordinate for point in points for coordinate in point])
+        if time_stamps is not None:
+            time_stamps = array.array('d', time_stamps)
+            if len(time_stamps) != len(self):
+                raise ValueError('The number of time stamps differs from the number of points')
+        self.time_stamps = time_stamps
+
+    @classmethod
+    def from_buffer(cls, buffer, time_stamps=None):
+        """ This method gets an object that supports the buffer protocol and holds
+interleaved int32 coordinates (for instance, a NumPy array of shape (n, 2)) and
+optional time stamps.
+Returns a new trajectory."""
+        trajectory = cls()
+        trajectory.frombytes(memoryview(buffer).cast('B'))
+        if time_stamps is not None:
+            time_stamps = array.array('d', time_stamps)
+            if len(time_stamps) != len(trajectory):
+                raise ValueError('The number of time stamps differs from the number of points')
+        trajectory.time_stamps = time_stamps
+        return trajectory
+
+    def append_point(self, x, y, time_stamp=None):
+        """ Appends a point (and its time stamp if the trajectory has time stamps)."""
+        self._check_time_stamp(time_stamp)
+        array.array.append(self, x)
+        array.array.append(self, y)
+        if self.time_stamps is not None:
+            self.time_stamps.append(time_stamp)
+
+    def append(self, point, time_stamp=None):
+        """ Appends a point (x, y) and its time stamp (see append_point)."""
+        self.append_point(*_get_point(point), time_stamp)
+
+    def extend(self, points):
+        """ Appends the points of a trajectory or of an iterable of points,
+the time stamps are shifted as by '+='."""
+        if not isinstance(points, Trajectory):
+            points = Trajectory(_get_point(point) for point in points)
+        self._extend(points)
+
+    def insert(self, index, point, time_stamp=None):
+        """ Inserts a point (x, y) and its time stamp (if the trajectory has
+time stamps) before the index."""
+        x, y = _get_point(point)
+        self._check_time_stamp(time_stamp)
+        index = _clamp_index(index, len(self))
+        array.array.insert(self, 2 * index, y)
+        array.array.insert(self, 2 * index, x)
+        if self.time_stamps is not None:
+            self.time_stamps.insert(index, time_stamp)
+
+    def pop(self, index=-1):
+        """ Removes the point at the index (default = the last one) and its
+time stamp. Returns the point (x, y)."""
+        point = self[index]
+        del self[index]
+        return point
+
+    def remove(self, point):
+        """ Removes the first point equal to the given one and its time stamp.
+ValueError is raised if there is no such point."""
+        del self[self.index(point)]
+
+    def reverse(self):
+        """ Reverses the order of the points. The time stamps are counted from
+the end of the movement, so the reversed movement takes the same time."""
+        points = list(self)
+        points.reverse()
+        time_stamps = None
+        if self.time_stamps is not None:
+            duration = self.duration
+            time_stamps = [duration - time_stamp for time_stamp in reversed(self.time_stamps)]
+        self._set_points(points, time_stamps)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            points = list(self)
+            replaced = len(points)
+            points[index] = [_get_point(point) for point in value]
+            if self.time_stamps is not None and len(points) != replaced:
+                raise ValueError('The points of a trajectory with time stamps are replaced by the same number of points')
+            self._set_points(points, self.time_stamps)
+            return
+        x, y = _get_point(value)
+        index = self._get_index(index)
+        array.array.__setitem__(self, 2 * index, x)
+        array.array.__setitem__(self, 2 * index + 1, y)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            points = list(self)
+            del points[index]
+            time_stamps = None
+            if self.time_stamps is not None:
+                time_stamps = self.time_stamps.tolist()
+                del time_stamps[index]
+            self._set_points(points, time_stamps)
+            return
+        index = self._get_index(index)
+        array.array.__delitem__(self, slice(2 * index, 2 * index + 2))
+        if self.time_stamps is not None:
+            del self.time_stamps[index]
+
+    def __len__(self):
+        return super().__len__() // 2
+
+    def __iter__(self):
+        coordinates = super().__iter__()
+        return zip(coordinates, coordinates)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            time_stamps = None
+            if self.time_stamps is not None:
+                time_stamps = [self.time_stamps[i] for i in indices]
+            return Trajectory([self[i] for i in indices], time_stamps)
+        index = self._get_index(index)
+        return super().__getitem__(2 * index), super().__getitem__(2 * index + 1)
+
+    def __contains__(self, point):
+        point = _as_point(point)
+        return any(candidate == point for candidate in self)
+
+    def index(self, point, start=0, stop=None):
+        """ Returns the index of the first point (x, y) equal to the given one
+between start and stop. ValueError is raised if there is no such point."""
+        point = _as_point(point)
+        for index in range(len(self))[start:stop]:
+            if self[index] == point:
+                return index
+        raise ValueError('trajectory.index(x): x not in trajectory')
+
+    def count(self, point):
+        """ Returns the number of the points (x, y) equal to the given one."""
+        point = _as_point(point)
+        return sum(1 for candidate in self if candidate == point)
+
+    def __add__(self, other):
+        other = _as_trajectory(other)
+        if other is None:
+            return NotImplemented
+        result = self.__copy__()
+        result._extend(other)
+        return result
+
+    def __radd__(self, other):
+        other = _as_trajectory(other)
+        if other is None:
+            return NotImplemented
+        return other + self
+
+    def __iadd__(self, other):
+        other = _as_trajectory(other)
+        if other is None:
+            return NotImplemented
+        self._extend(other)
+        return self
+
+    def __mul__(self, times):
+        if not isinstance(times, int):
+            return NotImplemented
+        result = Trajectory((), () if self.time_stamps is not None else None)
+        for _ in range(times):
+            result._extend(self)
+        return result
+
+    __rmul__ = __mul__
+
+    def __imul__(self, times):
+        if not isinstance(times, int):
+            return NotImplemented
+        repeated = self * times
+        array.array.__delitem__(self, slice(None))
+        self.frombytes(repeated.tobytes())
+        self.time_stamps = repeated.time_stamps
+        return self
+
+    def _get_index(self, index):
+        # Returns the non-negative index of a point, IndexError is raised if
+        # there is no such point.
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('trajectory index out of range')
+        return index
+
+    def _check_time_stamp(self, time_stamp):
+        # A point added to a trajectory with time stamps needs its own.
+        if self.time_stamps is not None and time_stamp is None:
+            raise ValueError('The trajectory has time stamps, the time stamp of the point is required')
+
+    def _set_points(self, points, time_stamps):
+        # Replaces all the points and the time stamps.
+        array.array.__delitem__(self, slice(None))
+        self.fromlist([coordinate for point in points for coordinate in point])
+        self.time_stamps = array.array('d', time_stamps) if time_stamps is not None else None
+
+    def _extend(self, other):
+        # Appends the points of another trajectory, the time stamps are kept
+        # only if both trajectories have them.
+        if self.time_stamps is not None and other.time_stamps is not None:
+            offset = self.duration or 0.0
+            self.time_stamps.extend([time_stamp + offset for time_stamp in other.time_stamps])
+        else:
+            self.time_stamps = None
+        self.frombytes(other.tobytes())
+
+    def __eq__(self, other):
+        if isinstance(other, (tuple, list)):
+            return tuple(self) == tuple(other)
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __copy__(self):
+        trajectory = Trajectory.from_buffer(self)
+        if self.time_stamps is not None:
+            trajectory.time_stamps = array.array('d', self.time_stamps)
+        return trajectory
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
+
+    def __repr__(self):
+        if self.time_stamps is None:
+            return f'Trajectory({list(self)!r})'
+        return f'Trajectory({list(self)!r}, time_stamps={self.time_stamps.tolist()!r})'
+
+    @property
+    def duration(self):
+        """ The time stamp of the last point in milliseconds or None."""
+        if not self.time_stamps:
+            return None
+        return self.time_stamps[-1]
+
+def _get_point(point):
+    # Returns the point as a tuple (x, y), TypeError is raised if it is not a point.
+    result = _as_point(point)
+    if result is None:
+        raise TypeError(f'A point (x, y) is expected, not {point!r}')
+    return result
+
+def _clamp_index(index, length):
+    # Returns the index of the insertion as list.insert does.
+    if index < 0:
+        index = max(0, index + length)
+    return min(index, length)
+
+def _as_point(point):
+    # Returns the point as a tuple (x, y) or None if it is not a point.
+    if isinstance(point, (tuple, list)) and len(point) == 2:
+        return tuple(point)
+    return None
+
+def _as_trajectory(other):
+    # Returns the operand of the concatenation as a trajectory or None if it
+    # cannot be concatenated.
+    if isinstance(other, Trajectory):
+        return other
+    if isinstance(other, (tuple, list)):
+        return Trajectory(other)
+    return None
@@ -7,6 +7,9 @@ from ctypes import POINTER
 KLF_ACTIVATE = 0x00000001
 KLF_SETFORPROCESS = 0x00000100
 
+# The message that asks a window to change its input language (keyboard layout).
+WM_INPUTLANGCHANGEREQUEST = 0x0050
+
 class POINT(ctypes.Structure):
     _fields_ = [("x", ctypes.c_long),
                 ("y", ctypes.c_long)]
@@ -20,4 +23,23 @@ def get_screen_size():
     return ctypes.windll.user32.GetSystemMetrics(0), ctypes.windll.user32.GetSystemMetrics(1)
 
 def get_left_button_state():
-    return ctypes.windll.user32.GetKeyState(0x01)
\ No newline at end of file
+    return ctypes.windll.user32.GetKeyState(0x01)
+
+
+_user32 = None
+
+def get_user32():
+    """ Returns user32.dll loaded by ctypes.WinDLL (use_last_error=True) with
+the prototypes of the functions the package calls. The library is loaded at
+the first call, so importing the package loads no native code."""
+    global _user32
+    if _user32 is None:
+        user32 = ctypes.WinDLL('user32', use_last_error=True)
+        user32.LoadKeyboardLayoutW.argtypes = (wintypes.LPCWSTR, wintypes.UINT)
+        user32.LoadKeyboardLayoutW.restype = wintypes.HKL
+        user32.ActivateKeyboardLayout.argtypes = (wintypes.HKL, wintypes.UINT)
+        user32.ActivateKeyboardLayout.restype = wintypes.HKL
+        user32.PostMessageW.argtypes = (wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+        user32.PostMessageW.restype = wintypes.BOOL
+        _user32 = user32
+    return _user32
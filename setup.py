@@ -24,16 +24,18 @@ setuptools.setup(
     url="https://github.com/Auskas/ruautogui",
     license='MIT',
     packages=setuptools.find_packages(),
+    package_data={'ruautogui': ['data/*.json']},
     keywords="gui automation test testing keyboard mouse cursor click press keystroke control",
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Environment :: Win32 (MS Windows)",
+        "Environment :: X11 Applications",
         "Intended Audience :: Developers",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "License :: OSI Approved :: MIT License",
         "Operating System :: Microsoft :: Windows :: Windows 10",
+        "Operating System :: POSIX :: Linux",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
 )
\ No newline at end of file
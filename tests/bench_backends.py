@@ -0,0 +1,38 @@
+# Measures the throughput of the key events and the latency of the mouse steps
+# through an input backend, headless by default (the recording backend).
+# Run it as a script with the package installed or on PYTHONPATH:
+#     python tests/bench_backends.py [recording|x11|win32]
+import sys
+import time
+
+from ruautogui import backends, keyboard, mouse
+
+name = sys.argv[1] if len(sys.argv) > 1 else 'recording'
+backend = backends.set_backend(name)
+
+text = 'The quick brown fox jumps over the lazy dog. ' * 200
+program = keyboard.compile(text, mode='instant')
+batch = backend.prepare_key_events(program.vk, program.flags, program.scan)
+start = time.perf_counter()
+for _ in range(20):
+    backend.send_prepared(batch)
+seconds = (time.perf_counter() - start) / 20
+print(f'{name}: {len(program)} key events in {seconds * 1e3:.2f} ms, '
+      f'{len(program) / seconds / 1e6:.2f} M events per second')
+
+start = time.perf_counter()
+statistics = keyboard.play(program)
+seconds = time.perf_counter() - start
+print(f'{name}: keyboard.play of {statistics.characters} characters in {seconds * 1e3:.1f} ms')
+
+start = time.perf_counter()
+for _ in range(1000):
+    backend.set_cursor_position(100, 100)
+seconds = (time.perf_counter() - start) / 1000
+print(f'{name}: set_cursor_position {seconds * 1e6:.2f} us per call')
+
+points, _, transition_time = mouse.plan_curve((0, 0), (800, 600), 3, 500, 'uniform')
+statistics = mouse.move_through_coordinates(points, transition_time)
+print(f'{name}: movement of {statistics.steps} steps in {statistics.actual_duration * 1e3:.1f} ms '
+      f'(planned {statistics.planned_duration * 1e3:.1f} ms), mean jitter '
+      f'{statistics.mean_jitter * 1e6:.1f} us, max jitter {statistics.max_jitter * 1e6:.1f} us')
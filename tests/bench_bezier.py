@@ -0,0 +1,51 @@
+# Compares the engines that calculate the points of a Bezier curve.
+# Run it as a script with the package installed or on PYTHONPATH:
+#     python tests/bench_bezier.py
+import logging
+import timeit
+
+from ruautogui import bezier
+
+logging.disable(logging.CRITICAL)
+
+TRANSITION_TIME = 650
+REPEAT = 200
+
+for order in range(1, 11):
+    control_points = [(i * 37 % 1920, i * 91 % 1080) for i in range(order - 1)]
+    results = {}
+    for engine in bezier.ENGINES:
+        results[engine] = min(timeit.repeat(
+            lambda: bezier.get_curve_points(
+                begin_pos=(0, 0),
+                end_pos=(1000, 700),
+                order=order,
+                control_points=list(control_points),
+                transition_time=TRANSITION_TIME,
+                engine=engine
+            ),
+            number=REPEAT,
+            repeat=5
+        )) / REPEAT
+    print(f'order {order:2}: ' + ', '.join(
+        f'{engine} {seconds * 1e6:8.1f} us' for engine, seconds in results.items()
+    ) + f', speedup x{results["python"] / results["numpy"]:.1f}')
+
+# A path through the waypoints: one pass over all the segments against
+# a chain of independent curves (one get_curve_points per segment).
+WAYPOINTS = [(i * 137 % 1920, i * 251 % 1080) for i in range(12)]
+TIMES = [300] * (len(WAYPOINTS) - 1)
+for engine in ('numpy', 'python'):
+    path = min(timeit.repeat(
+        lambda: bezier.get_path_points(WAYPOINTS, TIMES, engine=engine), number=REPEAT, repeat=5
+    )) / REPEAT
+    chain = min(timeit.repeat(
+        lambda: [
+            bezier.get_curve_points(begin_pos, end_pos, order=3, transition_time=300, engine=engine)
+            for begin_pos, end_pos in zip(WAYPOINTS, WAYPOINTS[1:])
+        ],
+        number=REPEAT,
+        repeat=5
+    )) / REPEAT
+    print(f'path of {len(TIMES)} segments, {engine}: one pass {path * 1e6:8.1f} us, '
+          f'chained curves {chain * 1e6:8.1f} us')
@@ -0,0 +1,30 @@
+# Measures the time to import the modules of the package in a fresh process
+# (python -X importtime), i.e. the start-up cost of a short-lived worker.
+# Run it as a script with the package installed or on PYTHONPATH:
+#     python tests/bench_import.py
+import subprocess
+import sys
+
+REPEAT = 5
+MODULES = (
+    'ruautogui', 'ruautogui.bezier', 'ruautogui.pool', 'ruautogui.timing',
+    'ruautogui.mouse', 'ruautogui.keyboard'
+)
+
+def import_time(module):
+    # Returns the cumulative import time of the module in seconds.
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    ).stderr
+    for line in reversed(output.splitlines()):
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1e6
+    raise RuntimeError(f'No import time of {module}')
+
+for module in MODULES:
+    seconds = min(import_time(module) for _ in range(REPEAT))
+    print(f'{module:>20}: {seconds * 1e3:7.1f} ms')
@@ -0,0 +1,39 @@
+# Measures the cost of the logging of the package in bezier.get_curve_points:
+# the DEBUG console and file handlers every module used to install, the silent
+# default and the asynchronous sink of configure_logging. Run it as a script
+# with the package installed or on PYTHONPATH:
+#     python tests/bench_logging.py
+import logging
+import os
+import sys
+import tempfile
+import timeit
+
+from ruautogui import bezier, logs
+
+REPEAT = 200
+
+def measure():
+    return min(timeit.repeat(
+        lambda: bezier.get_curve_points((0, 0), (800, 600), order=3, transition_time=400),
+        number=REPEAT,
+        repeat=5
+    )) / REPEAT
+
+def report(name, seconds):
+    print(f'{name:>24}: {seconds * 1e6:8.1f} us per curve')
+
+with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+    report('silent (default)', measure())
+
+    # The handlers of the previous versions: every record is formatted and
+    # written by the calling thread.
+    sys.stderr, stderr = devnull, sys.stderr
+    logs.configure_logging(filename=os.path.join(directory, 'sync.log'))
+    report('synchronous handlers', measure())
+    logs.configure_logging(filename=os.path.join(directory, 'async.log'), asynchronous=True)
+    report('asynchronous queue', measure())
+    logs.configure_logging(level=logging.WARNING, filename=os.path.join(directory, 'warning.log'))
+    report('WARNING level', measure())
+    logs.stop_logging()
+    sys.stderr = stderr
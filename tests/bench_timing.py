@@ -0,0 +1,33 @@
+# Measures the time to draw the keystroke intervals of a message by the digraph
+# timing model. Run it as a script with the package installed or on PYTHONPATH:
+#     python tests/bench_timing.py
+import timeit
+
+from ruautogui import layouts, timing
+
+REPEAT = 20
+
+english = layouts.load_layout_file('english')
+russian = layouts.load_layout_file('russian')
+text = 'The quick brown fox jumps over the lazy dog. Съешь же ещё этих мягких французских булок. '
+
+keys = []
+languages = []
+for character in text:
+    language = 'russian' if ord(character) in russian and ord(character) not in english else 'english'
+    keys.append((english.get(ord(character)) or russian[ord(character)])[0])
+    languages.append(language)
+
+timing.get_model('english')
+timing.get_model('russian')
+
+for copies in (1, 10, 100, 1000):
+    message_keys = keys * copies
+    message_languages = languages * copies
+    seconds = min(timeit.repeat(
+        lambda: timing.sample_intervals(message_keys, message_languages),
+        number=REPEAT,
+        repeat=5
+    )) / REPEAT
+    print(f'{len(message_keys):7} characters: {seconds * 1e3:8.3f} ms, '
+          f'{seconds / len(message_keys) * 1e9:7.1f} ns per character')
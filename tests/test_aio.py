@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from ruautogui import aio, keyboard, mouse
+from ruautogui.backends import recording
+from ruautogui.backends.base import KEYEVENTF_KEYUP, MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP
+from ruautogui.simulation import Simulation
+
+
+@pytest.fixture
+def simulation(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    monkeypatch.setattr(keyboard, 'layout_manager', keyboard.LayoutManager())
+    monkeypatch.setattr(keyboard, '_character_table', None)
+    with Simulation(position=(0, 0)) as simulation:
+        yield simulation
+
+
+def cancel_at(simulation, coroutine, time):
+    # Runs the coroutine as a task and cancels it at the virtual time.
+    async def main():
+        task = asyncio.ensure_future(coroutine)
+        while not task.done() and simulation.elapsed < time:
+            await asyncio.sleep(0)
+        assert not task.done()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+
+def assert_nothing_is_held(simulation):
+    held = {}
+    for event in simulation.get_events(recording.KEY):
+        held[event.a] = held.get(event.a, 0) + (-1 if event.b & KEYEVENTF_KEYUP else 1)
+    assert all(count == 0 for count in held.values()), held
+
+
+def test_cancelled_move_stops_at_once(simulation):
+    cancel_at(simulation, aio.move((500, 500), transition_time=1000), 0.5)
+    moves = simulation.get_events(recording.MOVE)
+    assert moves and moves[-1].time <= 0.5
+    assert mouse.get_mouse_cursor_position() != (500, 500)
+
+
+def test_cancelled_click_releases_the_button(simulation):
+    cancel_at(simulation, aio.click(), 0.05)
+    buttons = [(event.time, event.a) for event in simulation.get_events(recording.BUTTON)]
+    # The task is cancelled at the time of the release, before its step.
+    assert buttons == [(0.0, MOUSEEVENTF_LEFTDOWN), (mouse.CLICK_TIME, MOUSEEVENTF_LEFTUP)]
+
+
+def test_cancelled_press_and_hotkey_release_the_keys(simulation):
+    shift = keyboard.mapping['shift']
+    cancel_at(simulation, aio.press('a', mode='slow', shift=True), 0.001)
+    events = simulation.get_events(recording.KEY)
+    assert (events[0].a, events[0].b) == (shift, 0)
+    assert (events[-1].a, events[-1].b) == (shift, KEYEVENTF_KEYUP)
+    assert_nothing_is_held(simulation)
+
+    simulation.backend.clear()
+    cancel_at(simulation, aio.hotkey('ctrl', 'shift', 'a', interval=0.1), 0.15)
+    # ctrl and shift are down when the task is cancelled.
+    assert len(simulation.get_events(recording.KEY)) == 4
+    assert_nothing_is_held(simulation)
+
+
+def test_cancelled_typing_releases_the_keys_and_restores_the_layout(simulation):
+    cancel_at(simulation, aio.type('Привет, Мир', mode='standard'), 0.5)
+    keys = simulation.get_events(recording.KEY)
+    assert 0 < len(keys) < 2 * len('Привет, Мир') + 4
+    assert_nothing_is_held(simulation)
+    assert keyboard.get_keyboard_layout() == 'english'
+    layouts = [event.a for event in simulation.get_events(recording.LAYOUT)]
+    assert layouts == [0x0419, 0x0409]
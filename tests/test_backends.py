@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+
+import pytest
+
+from ruautogui import backends, keyboard, mouse
+from ruautogui.backends import recording
+from ruautogui.backends.base import KEYEVENTF_KEYUP, KEYEVENTF_UNICODE, MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP
+
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    backend = recording.RecordingBackend(capacity=4, position=(10, 20))
+    monkeypatch.setattr(backends, '_backend', backend)
+    return backend
+
+
+def test_recording_buffer_grows_and_keeps_events(backend):
+    backend.set_cursor_position(5, 6)
+    assert backend.get_cursor_position() == (5, 6)
+    prepared = backend.prepare_key_events([0x41, 0x41], [0, KEYEVENTF_KEYUP], [0, 0])
+    for _ in range(3):
+        assert backend.send_prepared(prepared) == 2
+    assert backend.send_mouse_events([MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP]) == 2
+    assert len(backend) == 9
+    events = backend.get_events()
+    assert events[0][1:] == (recording.MOVE, 5, 6, 0)
+    assert [event.b for event in backend.get_events(recording.KEY)] == [0, KEYEVENTF_KEYUP] * 3
+    assert [event.a for event in backend.get_events(recording.BUTTON)] == [MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP]
+    assert [event.time for event in events] == sorted(event.time for event in events)
+    assert len(backend.buffer()) == 9 * recording.FIELDS
+    backend.clear()
+    assert len(backend) == 0 and backend.get_events() == []
+
+
+def test_mouse_moves_and_clicks_through_backend(backend, monkeypatch):
+    monkeypatch.setattr(mouse, 'CLICK_TIME', 0.001)
+    mouse.move((300, 200), transition_time=60)
+    mouse.click()
+    moves = backend.get_events(recording.MOVE)
+    assert moves[-1][2:4] == (300, 200)
+    assert backend.get_cursor_position() == (300, 200)
+    assert [event.a for event in backend.get_events(recording.BUTTON)] == [MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP]
+
+
+def test_keyboard_switches_layout_through_backend(backend, monkeypatch):
+    monkeypatch.setattr(keyboard, 'layout_manager', keyboard.LayoutManager())
+    monkeypatch.setattr(keyboard, '_character_table', None)
+    statistics = keyboard.type('ab юя', mode='instant')
+    # The switch to russian and back to the layout of the window.
+    assert statistics.characters == 5 and statistics.layout_switches == 2
+    kinds = [event.kind for event in backend.get_events()]
+    assert kinds.count(recording.LAYOUT) == 2
+    assert keyboard.get_keyboard_layout() == 'english'
+    # The english runs come first: a and b are typed before the switch.
+    assert kinds.index(recording.LAYOUT) > 4
+
+
+def test_backend_names():
+    with pytest.raises(ValueError):
+        backends.create_backend('missing')
+    assert isinstance(backends.create_backend('recording'), recording.RecordingBackend)
+
+
+def test_type_stream_types_the_tail_of_an_idle_source(backend, monkeypatch):
+    monkeypatch.setattr(keyboard, 'layout_manager', keyboard.LayoutManager())
+    monkeypatch.setattr(keyboard, '_character_table', None)
+    release = threading.Event()
+    cancel = threading.Event()
+
+    def log():
+        yield 'hello '
+        release.wait(5)
+
+    def progress(characters):
+        if characters == 6:
+            cancel.set()
+
+    start = time.perf_counter()
+    try:
+        statistics = keyboard.type_stream(log(), mode='instant', progress=progress, cancel=cancel)
+    finally:
+        release.set()
+    assert statistics.characters == 6
+    assert time.perf_counter() - start < 2.0
+    assert len(backend.get_events(recording.KEY)) == 12
+
+
+@pytest.fixture
+def x11():
+    # The tests of the X11 backend run under an X server, e.g. Xvfb.
+    if not os.environ.get('DISPLAY'):
+        pytest.skip('There is no X display')
+    from ruautogui.backends import x11
+    try:
+        backend = x11.X11Backend()
+    except OSError as exc:
+        pytest.skip(str(exc))
+    yield backend
+    backend.close()
+
+
+def test_x11_types_characters_missing_from_the_keymap(x11):
+    from ruautogui.backends.x11 import X11Backend
+
+    def unicode_events(*code_units):
+        flags = [KEYEVENTF_UNICODE] * len(code_units) + [KEYEVENTF_UNICODE | KEYEVENTF_KEYUP] * len(code_units)
+        return x11.prepare_key_events([0] * len(flags), flags, list(code_units) * 2)
+
+    # The lowercase letter is typed by its key, the uppercase one is not typed
+    # by the same key without shift: a spare keycode is mapped to it.
+    assert [mapping for _, _, mapping in unicode_events(ord('a'))] == [None, None]
+    prepared = unicode_events(ord('A'))
+    assert [(press, mapping) for _, press, mapping in prepared] == [(True, 0x41), (False, 0x41)]
+    # A surrogate pair is one character.
+    emoji = unicode_events(0xD83D, 0xDE00)
+    assert [(press, mapping) for _, press, mapping in emoji] == [(True, 0x0101F600), (False, 0x0101F600)]
+
+    assert x11.send_prepared(prepared) == 2
+    keycode = prepared[0][0]
+    observer = X11Backend()
+    try:
+        observer._load_keymap()
+        assert observer._keymap[keycode][0] == 0x41
+        x11.close()
+        observer._load_keymap()
+        assert not any(observer._keymap[keycode])
+    finally:
+        observer.close()
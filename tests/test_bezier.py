@@ -0,0 +1,297 @@
+import random
+
+import pytest
+
+from ruautogui import bezier
+from ruautogui.trajectory import Trajectory
+
+
+def random_control_points(order, seed):
+    rng = random.Random(seed)
+    return [(rng.randint(-50, 1920), rng.randint(-50, 1080)) for _ in range(order + 1)]
+
+
+def assert_points_close(points, reference, tolerance=1):
+    assert len(points) == len(reference)
+    for point, expected in zip(points, reference):
+        assert abs(point[0] - expected[0]) <= tolerance
+        assert abs(point[1] - expected[1]) <= tolerance
+
+
+@pytest.mark.parametrize('order', range(1, 11))
+def test_numpy_engine_matches_python_engine(order):
+    pytest.importorskip('numpy')
+    control_points = random_control_points(order, order)
+    time_stamps = [t / 650 for t in range(0, 651, 13)]
+    reference = bezier.evaluate_curve(control_points, time_stamps, engine='python')
+    points = bezier.evaluate_curve(control_points, time_stamps, engine='numpy')
+    assert_points_close(points, reference)
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+def test_get_curve_points_contract(engine):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+    points, control_points, transition_time = bezier.get_curve_points(
+        begin_pos=(10, 20),
+        end_pos=(300, 400),
+        order=3,
+        control_points=[(50, 60), (200, 100)],
+        transition_time=260,
+        engine=engine
+    )
+    assert isinstance(points, Trajectory)
+    assert len(points) == len(points.time_stamps) == 21
+    assert points[0] == (10, 20)
+    assert points[-1] == (300, 400)
+    assert control_points == ((10, 20), (50, 60), (200, 100), (300, 400))
+    assert transition_time == 260
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        bezier.evaluate_curve([(0, 0), (1, 1)], [0, 1], engine='fortran')
+
+
+def test_basis_cache_hits_for_the_same_grid():
+    pytest.importorskip('numpy')
+    bezier.clear_basis_cache()
+    for _ in range(3):
+        bezier.get_curve_points(
+            begin_pos=(0, 0),
+            end_pos=(500, 300),
+            order=2,
+            control_points=[(100, 250)],
+            transition_time=400,
+            engine='numpy'
+        )
+    info = bezier.get_basis_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+    bezier.clear_basis_cache()
+    assert bezier.get_basis_cache_info().currsize == 0
+
+
+def test_basis_table_is_read_only():
+    numpy = pytest.importorskip('numpy')
+    table = bezier.get_basis_table(3, 260, 13)
+    assert table.shape == (21, 4)
+    numpy.testing.assert_allclose(table.sum(axis=1), 1)
+    with pytest.raises(ValueError):
+        table[0, 0] = 2
+
+
+@pytest.mark.parametrize('order', range(1, 21))
+def test_exact_engine_matches_python_engine(order):
+    control_points = random_control_points(order, order)
+    time_stamps = bezier.get_time_stamps(650, 13)
+    reference = bezier.evaluate_curve(control_points, time_stamps, engine='python')
+    points = bezier.evaluate_curve(control_points, time_stamps, engine='exact')
+    assert_points_close(points, reference)
+
+
+@pytest.mark.parametrize('order', [100, 400])
+def test_exact_engine_is_exact_for_high_orders(order):
+    from fractions import Fraction
+
+    control_points = random_control_points(order, order)
+    time_stamps = bezier.get_time_stamps(850, 17, exact=True)
+    points = bezier.evaluate_curve(control_points, time_stamps, engine='exact')
+    coefficients = bezier.binomial_coefficients(order)
+    for time_stamp, point in list(zip(time_stamps, points))[::10]:
+        expected = [
+            sum(
+                coefficients[i] * (1 - time_stamp) ** (order - i) * time_stamp ** i * control_point[axis]
+                for i, control_point in enumerate(control_points)
+            )
+            for axis in (0, 1)
+        ]
+        assert point == (int(expected[0]), int(expected[1]))
+    assert points[0] == control_points[0]
+    assert points[-1] == control_points[-1]
+
+
+def test_get_curve_points_exact_engine():
+    points, _, _ = bezier.get_curve_points(
+        begin_pos=(10, 20),
+        end_pos=(300, 400),
+        order=3,
+        control_points=[(50, 60), (200, 100)],
+        transition_time=260,
+        engine='exact'
+    )
+    reference, _, _ = bezier.get_curve_points(
+        begin_pos=(10, 20),
+        end_pos=(300, 400),
+        order=3,
+        control_points=[(50, 60), (200, 100)],
+        transition_time=260,
+        engine='python'
+    )
+    assert_points_close(points, reference)
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy', 'exact'])
+@pytest.mark.parametrize('transition_time, end_pos, control_points', [
+    (145, (20, 15), [(30, -10), (5, 30)]),
+    (850, (300, 300), [(100, 400)]),
+    (400, (1000, 50), [(500, 700), (900, -300)]),
+])
+def test_adaptive_sampling(engine, transition_time, end_pos, control_points):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+    uniform, _, _ = bezier.get_curve_points(
+        (0, 0), end_pos, len(control_points) + 1, list(control_points), transition_time,
+        engine=engine
+    )
+    points, _, _ = bezier.get_curve_points(
+        (0, 0), end_pos, len(control_points) + 1, list(control_points), transition_time,
+        engine=engine, sampling='adaptive'
+    )
+    assert len(points) < len(uniform)
+    assert points[0] == (0, 0)
+    assert points[-1] == end_pos
+    assert points.duration == transition_time
+    step = transition_time // (transition_time // 13)
+    for previous, current in zip(points, points[1:]):
+        assert previous != current
+    for previous, current in zip(points.time_stamps, points.time_stamps[1:]):
+        assert current - previous >= step - 1e-9
+
+
+def test_unknown_sampling():
+    with pytest.raises(ValueError):
+        bezier.get_curve_points((0, 0), (10, 10), 1, [], 100, sampling='random')
+
+
+def test_frame_time_sets_the_number_of_points():
+    points, _, _ = bezier.get_curve_points((0, 0), (100, 100), 1, [], 400, frame_time=4)
+    assert len(points) == 101
+    points, _, _ = bezier.get_curve_points((0, 0), (100, 100), 1, [], 400)
+    assert len(points) == 31
+
+
+def test_curve_stream_matches_get_curve_points():
+    control_points = [(400, -100), (900, 800)]
+    points, _, _ = bezier.get_curve_points(
+        begin_pos=(10, 20), end_pos=(640, 480), order=3,
+        control_points=list(control_points), transition_time=500, frame_time=13
+    )
+    stream = bezier.CurveStream(
+        begin_pos=(10, 20), end_pos=(640, 480), order=3,
+        control_points=control_points, transition_time=500, frame_time=13
+    )
+    streamed = list(stream)
+    assert len(stream) == len(points)
+    assert [(x, y) for x, y, _ in streamed] == list(points)
+    assert [deadline * 1000 for _, _, deadline in streamed] == pytest.approx(list(points.time_stamps))
+
+
+@pytest.mark.parametrize('engine', ['auto', 'python', 'numpy'])
+def test_curve_stream_default_engine_is_the_one_of_get_curve_points(engine):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+    for seed in range(50):
+        rng = random.Random(seed)
+        order = rng.randint(1, 8)
+        control_points = random_control_points(order, seed)
+        arguments = dict(
+            begin_pos=control_points[0], end_pos=control_points[-1], order=order,
+            transition_time=rng.randint(50, 1500), frame_time=rng.choice([7, 13, 16])
+        )
+        points, _, _ = bezier.get_curve_points(control_points=control_points[1:-1], **arguments)
+        # The defaults give the same points.
+        streamed = [(x, y) for x, y, _ in bezier.CurveStream(control_points=control_points[1:-1], **arguments)]
+        assert streamed == list(points)
+        # Any engine is within the rounding of a pixel.
+        streamed = [
+            (x, y) for x, y, _ in bezier.CurveStream(control_points=control_points[1:-1], engine=engine, **arguments)
+        ]
+        assert_points_close(streamed, points)
+
+
+def test_curve_stream_engine_follows_the_degree_of_the_control_points(monkeypatch):
+    monkeypatch.setattr(bezier, 'MAXIMUM_FLOAT_ORDER', 4)
+    control_points = random_control_points(6, 3)
+    # The order does not match the control points, the curve is of the degree 6.
+    arguments = dict(
+        begin_pos=control_points[0], end_pos=control_points[-1], order=2,
+        control_points=control_points[1:-1], transition_time=300, frame_time=10
+    )
+    points, _, _ = bezier.get_curve_points(sampling='uniform', engine='exact', **arguments)
+    calls = []
+    evaluate_curve = bezier.evaluate_curve
+    monkeypatch.setattr(bezier, 'evaluate_curve', lambda *args: calls.append(args[2]) or evaluate_curve(*args))
+    assert [(x, y) for x, y, _ in bezier.CurveStream(**arguments)] == list(points)
+    assert set(calls) == {'exact'}
+
+
+def test_curve_stream_does_not_load_the_basis_table():
+    pytest.importorskip('numpy')
+    bezier.clear_basis_cache()
+    stream = bezier.CurveStream(begin_pos=(0, 0), end_pos=(300, 200), order=3, transition_time=5000, frame_time=1)
+    assert len(list(stream)) == 5001
+    assert bezier.get_basis_cache_info().currsize == 0
+
+
+def test_curve_stream_follows_changed_end_point():
+    stream = bezier.CurveStream(begin_pos=(0, 0), end_pos=(100, 0), order=1, transition_time=100, frame_time=10)
+    iterator = iter(stream)
+    assert next(iterator)[:2] == (0, 0)
+    stream.set_end_pos((0, 100))
+    stream.set_control_points([(50, 50)])
+    *_, last = iterator
+    assert last == (0, 100, 0.1)
+    assert len(stream.control_points) == 3
+
+
+def test_default_control_points_are_not_accumulated():
+    for _ in range(3):
+        _, control_points, _ = bezier.get_curve_points((0, 0), (300, 200), order=3, transition_time=200)
+        assert len(control_points) == 4
+    passed = [(100, 100)]
+    bezier.get_curve_points((0, 0), (300, 200), order=2, control_points=passed, transition_time=200)
+    assert passed == [(100, 100)]
+
+
+@pytest.mark.parametrize('engine', ['numpy', 'python'])
+def test_path_passes_the_waypoints_with_continuous_tangents(engine):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+    waypoints = [(0, 0), (300, 100), (400, 400), (100, 500)]
+    times = [300, 260, 390]
+    points, control_points, arrivals = bezier.get_path_points(waypoints, times, stops={2}, engine=engine)
+    assert arrivals == [0, 300, 560, 950]
+    # Every waypoint is a point of the path at its arrival time.
+    for waypoint, arrival in zip(waypoints, arrivals):
+        assert points[list(points.time_stamps).index(arrival)] == waypoint
+    assert list(points.time_stamps) == sorted(points.time_stamps)
+    # The velocity is the same on both sides of a waypoint, zero at the stop.
+    for i in (1, 2):
+        before = [(control_points[i - 1][3][k] - control_points[i - 1][2][k]) * 3 / times[i - 1] for k in (0, 1)]
+        after = [(control_points[i][1][k] - control_points[i][0][k]) * 3 / times[i] for k in (0, 1)]
+        assert before == pytest.approx(after)
+    assert control_points[1][3] == control_points[1][2]
+    if engine == 'numpy':
+        reference, _, _ = bezier.get_path_points(waypoints, times, stops={2}, engine='python')
+        assert_points_close(points, reference)
+
+
+def test_path_times():
+    assert bezier.get_path_times([(0, 0), (30, 40), (30, 140)], 600) == [200, 400]
+    assert bezier.get_path_times([(0, 0), (1, 1)], [70]) == [70]
+    assert all(time >= 150 for time in bezier.get_path_times([(0, 0), (10, 0), (20, 0)]))
+    with pytest.raises(ValueError):
+        bezier.get_path_times([(0, 0), (1, 1)], [70, 80])
+    with pytest.raises(ValueError):
+        bezier.get_path_points([(0, 0)], [])
+
+
+def test_path_eases_in_and_out_at_its_ends():
+    waypoints = [(0, 0), (300, 0), (600, 0)]
+    points, control_points, _ = bezier.get_path_points(waypoints, [300, 300], engine='python')
+    assert control_points[0][:2] == ((0, 0), (0.0, 0.0))
+    assert control_points[-1][2:] == ((600.0, 0.0), (600, 0))
+    # The steps are short at the ends and long at the middle waypoint.
+    steps = [points[k + 1][0] - points[k][0] for k in range(len(points) - 1)]
+    middle = list(points).index((300, 0))
+    assert steps[0] < steps[middle - 1] and steps[-1] < steps[middle]
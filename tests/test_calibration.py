@@ -0,0 +1,35 @@
+import time
+
+from ruautogui import calibration
+
+
+def test_calibration_is_measured_once():
+    calls = []
+    calibration.reset_calibration()
+    try:
+        first = calibration.get_calibration(probe=lambda: calls.append(1))
+        second = calibration.get_calibration(probe=lambda: calls.append(1))
+    finally:
+        calibration.reset_calibration()
+    assert first is second
+    assert len(calls) == calibration.NUMBER_OF_SAMPLES
+    assert first.sleep_granularity >= calibration.SLEEP_PROBE_TIME
+    assert first.frame_time >= max(calibration.MINIMUM_FRAME_TIME, first.sleep_granularity)
+
+
+def test_injection_cost_is_added_by_the_first_probe():
+    calls = []
+    calibration.reset_calibration()
+    try:
+        # The keyboard calibrates without a probe, the mouse with one later.
+        first = calibration.get_calibration()
+        assert first.injection_cost == 0.0
+        second = calibration.get_calibration(probe=lambda: calls.append(time.sleep(0.002)))
+        third = calibration.get_calibration(probe=lambda: calls.append(1))
+    finally:
+        calibration.reset_calibration()
+    assert len(calls) == calibration.NUMBER_OF_SAMPLES
+    assert second is third
+    assert second.sleep_granularity == first.sleep_granularity
+    assert second.injection_cost >= 0.002
+    assert second.frame_time >= second.sleep_granularity + second.injection_cost
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import ruautogui
+
+# Imports the modules that can be imported on any platform and prints
+# the modules loaded by them: the modules of the package that do not use
+# the input do not load mouse and keyboard, none of them loads asyncio.
+CHECK = '''
+import sys
+import ruautogui
+loaded_by_package = sorted(name for name in sys.modules if name.startswith('ruautogui.'))
+import ruautogui.bezier, ruautogui.bezier_draftsman, ruautogui.pool, ruautogui.program, ruautogui.timing
+print(loaded_by_package)
+print(sorted(name for name in sys.modules if name in ('ruautogui.mouse', 'ruautogui.keyboard')))
+import ruautogui.keyboard, ruautogui.mouse, ruautogui.aio, ruautogui.timeline, ruautogui.simulation
+print(sorted(
+    name for name in sys.modules
+    if name == 'asyncio' or name.startswith(('numpy.', 'cv2.', 'logging.', 'asyncio.'))
+))
+'''
+
+
+def test_import_has_no_side_effects_and_defers_dependencies(tmp_path):
+    env = dict(os.environ, PYTHONPATH=str(Path(ruautogui.__file__).parents[1]))
+    output = subprocess.run(
+        [sys.executable, '-c', CHECK],
+        cwd=str(tmp_path),
+        env=env,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    ).stdout.splitlines()
+    assert output == ['[]', '[]', '[]']
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_modules_are_imported_on_first_access():
+    assert ruautogui.bezier is sys.modules['ruautogui.bezier']
+    assert ruautogui.configure_logging is ruautogui.logs.configure_logging
+    assert 'mouse' in dir(ruautogui)
+    with pytest.raises(AttributeError):
+        ruautogui.missing
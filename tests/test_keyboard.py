@@ -0,0 +1,190 @@
+import threading
+
+import pytest
+
+from ruautogui import backends, keyboard, timing
+from ruautogui.backends import recording
+from ruautogui.backends.base import KEYEVENTF_KEYDOWN, KEYEVENTF_KEYUP, KEYEVENTF_UNICODE
+from ruautogui.simulation import Simulation
+
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    backend = recording.RecordingBackend(position=(10, 20))
+    monkeypatch.setattr(backends, '_backend', backend)
+    monkeypatch.setattr(keyboard, 'layout_manager', keyboard.LayoutManager())
+    monkeypatch.setattr(keyboard, '_character_table', None)
+    return backend
+
+
+@pytest.fixture
+def simulation(backend):
+    with Simulation() as simulation:
+        yield simulation
+
+
+def record_calls(backend, monkeypatch):
+    # Returns the list of the sizes of the batches sent by the backend.
+    calls = []
+    send_prepared = backend.send_prepared
+    monkeypatch.setattr(backend, 'send_prepared', lambda prepared: calls.append(send_prepared(prepared)) or calls[-1])
+    return calls
+
+
+def test_only_natural_modes_use_the_timing_model(backend, monkeypatch):
+    calls = []
+    sample_intervals = timing.sample_intervals
+    monkeypatch.setattr(timing, 'sample_intervals', lambda *args: calls.append(args) or sample_intervals(*args))
+    keyboard.compile('hello', mode='standard')
+    assert calls == []
+
+    keyboard.compile('hello', mode='natural')
+    assert len(calls) == 1
+
+
+def unicode_edges(backend):
+    # Returns the code units of the Unicode key events: (the downs, the ups).
+    events = [event for event in backend.get_events(recording.KEY) if event.b & KEYEVENTF_UNICODE]
+    return (
+        [event.c for event in events if not event.b & KEYEVENTF_KEYUP],
+        [event.c for event in events if event.b & KEYEVENTF_KEYUP]
+    )
+
+
+def test_character_outside_the_bmp_is_sent_as_a_surrogate_pair(backend):
+    statistics = keyboard.type('\U0001F600', mode='instant', method='unicode')
+    assert statistics.characters == 1
+    assert all(event.a == 0 for event in backend.get_events(recording.KEY))
+    # Both code units go down and both go up.
+    assert unicode_edges(backend) == ([0xD83D, 0xDE00], [0xD83D, 0xDE00])
+
+
+def test_mixed_method_sends_only_unmapped_characters_as_unicode(backend):
+    statistics = keyboard.type('a\u2603b', mode='instant', method='mixed')
+    assert statistics.characters == 3
+    assert unicode_edges(backend) == ([0x2603], [0x2603])
+    vks = [event.a for event in backend.get_events(recording.KEY) if not event.b & KEYEVENTF_UNICODE]
+    assert vks == [keyboard.mapping['a']] * 2 + [keyboard.mapping['b']] * 2
+
+
+def test_control_characters_are_sent_by_their_virtual_keys(backend):
+    controls = ''.join(keyboard.UNICODE_CONTROL_KEYS)
+    keyboard.type('a' + controls, mode='instant', method='unicode')
+    assert unicode_edges(backend) == ([ord('a')], [ord('a')])
+    vks = [event.a for event in backend.get_events(recording.KEY) if not event.b & KEYEVENTF_UNICODE]
+    assert vks == [keyboard.mapping[keyboard.UNICODE_CONTROL_KEYS[character]] for character in controls for _ in range(2)]
+
+
+def test_message_is_segmented_into_layout_runs(backend):
+    def segment(message):
+        return [(run.language, len(run.keystrokes)) for run in keyboard.segment_message(message)]
+
+    # The neutral characters join the current run, the punctuation stays in it if it can.
+    assert segment('Hi, мир! ok') == [('english', 4), ('russian', 5), ('english', 2)]
+    # A leading neutral run takes the layout of the first character that needs one.
+    assert segment('42 да') == [('russian', 5)]
+    assert segment('a1б2c') == [('english', 2), ('russian', 2), ('english', 1)]
+    assert segment('123 ') == [(None, 4)]
+    assert keyboard.segment_message('') == []
+
+
+def test_layout_is_switched_once_per_run_and_restored(backend):
+    statistics = keyboard.type('ab юя cd', mode='instant')
+    assert statistics.runs == 3
+    # One query per run, a switch to russian, back to english and no restore needed.
+    assert statistics.layout_checks == 3 and statistics.layout_switches == 2
+    layouts = [event.a for event in backend.get_events(recording.LAYOUT)]
+    assert layouts == [0x0419, 0x0409]
+
+    backend.clear()
+    statistics = keyboard.type('юя', mode='instant')
+    assert statistics.layout_checks == 1 and statistics.layout_switches == 2
+    # The keys are typed in russian, then the english layout of the window is restored.
+    kinds = [event.kind for event in backend.get_events()]
+    assert kinds == [recording.LAYOUT] + [recording.KEY] * 4 + [recording.LAYOUT]
+    assert [event.a for event in backend.get_events(recording.LAYOUT)] == [0x0419, 0x0409]
+    assert keyboard.get_keyboard_layout() == 'english'
+
+
+def test_event_batch_sends_the_events_between_long_delays_together(simulation, monkeypatch):
+    calls = record_calls(simulation.backend, monkeypatch)
+    batch = keyboard._EventBatch(threshold=1.0)
+    for vk in (0x41, 0x42, 0x43, 0x44):
+        batch.add(vk, KEYEVENTF_KEYDOWN)
+        batch.wait(0.375)
+    batch.flush()
+    # The delays are summed up until they reach the threshold: 0.375, 0.75, 1.125.
+    assert calls == [3, 1]
+    assert [event.time for event in simulation.get_events(recording.KEY)] == [0.0, 0.0, 0.0, 1.125]
+    assert simulation.elapsed == 1.5
+
+    # With the zero threshold every delay is slept.
+    calls.clear()
+    batch = keyboard._EventBatch()
+    for vk in (0x41, 0x42):
+        batch.add(vk, KEYEVENTF_KEYDOWN)
+        batch.wait(0.25)
+    batch.flush()
+    assert calls == [1, 1]
+
+
+def test_hotkey_is_sent_atomically(simulation, monkeypatch):
+    calls = record_calls(simulation.backend, monkeypatch)
+    keyboard.hotkey('ctrl', 'shift', 'a')
+    assert calls == [6]
+    events = [(event.a, event.b) for event in simulation.get_events(recording.KEY)]
+    ctrl, shift, a = keyboard.mapping['ctrl'], keyboard.mapping['shift'], keyboard.mapping['a']
+    # All the downs, then all the ups in the reverse order.
+    assert events == [
+        (ctrl, KEYEVENTF_KEYDOWN), (shift, KEYEVENTF_KEYDOWN), (a, KEYEVENTF_KEYDOWN),
+        (a, KEYEVENTF_KEYUP), (shift, KEYEVENTF_KEYUP), (ctrl, KEYEVENTF_KEYUP)
+    ]
+
+    # With an interval every event is sent after its own delay.
+    calls.clear()
+    keyboard.hotkey('ctrl', 'a', interval=0.125)
+    assert calls == [1, 1, 1, 1]
+
+
+def test_keystroke_and_hotkey_programs_are_played_like_the_blocking_calls(simulation, monkeypatch):
+    calls = record_calls(simulation.backend, monkeypatch)
+    program = keyboard.compile_hotkey('ctrl', 'a')
+    assert len(program) == 4 and program.characters == 0
+    keyboard.play(program)
+    keyboard.play(keyboard.compile_keystroke('a', mode='instant', shift=True))
+    assert calls == [4, 4]
+    shift, a = keyboard.mapping['shift'], keyboard.mapping['a']
+    assert [(event.a, event.b) for event in simulation.get_events(recording.KEY)][4:] == [
+        (shift, KEYEVENTF_KEYDOWN), (a, KEYEVENTF_KEYDOWN), (a, KEYEVENTF_KEYUP), (shift, KEYEVENTF_KEYUP)
+    ]
+
+
+def assert_nothing_is_held(backend):
+    held = {}
+    for event in backend.get_events(recording.KEY):
+        held[event.a] = held.get(event.a, 0) + (-1 if event.b & KEYEVENTF_KEYUP else 1)
+    assert all(count == 0 for count in held.values()), held
+
+
+def test_stopped_typing_releases_the_held_shift(simulation, monkeypatch):
+    shift = keyboard.mapping['shift']
+    # The first group is shift down, A down and A up; shift goes up after the delay.
+    statistics = keyboard.play(keyboard.compile('AAAA', mode='fast'), should_stop=lambda: simulation.elapsed > 0)
+    events = [(event.a, event.b) for event in simulation.get_events(recording.KEY)]
+    assert events[-1] == (shift, KEYEVENTF_KEYUP) and len(events) == 4
+    assert statistics.characters < 4
+    assert_nothing_is_held(simulation.backend)
+
+    simulation.backend.clear()
+    cancel = threading.Event()
+    send_prepared = simulation.backend.send_prepared
+
+    def send_and_cancel(prepared):
+        cancel.set()
+        return send_prepared(prepared)
+
+    monkeypatch.setattr(simulation.backend, 'send_prepared', send_and_cancel)
+    keyboard.type_stream('AAAAAAAAAA', mode='fast', cancel=cancel)
+    assert 0 < len(simulation.get_events(recording.KEY)) < 40
+    assert_nothing_is_held(simulation.backend)
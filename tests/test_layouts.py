@@ -0,0 +1,80 @@
+from ruautogui import layouts
+
+
+def test_layout_files_cover_printable_ascii():
+    english = layouts.load_layout_file('english')
+    russian = layouts.load_layout_file('russian')
+    assert all(code_point in english for code_point in range(0x20, 0x7F))
+    assert english[ord('A')] == (0x41, layouts.SHIFT)
+    assert russian[ord('ж')] == (0xBA, 0)
+    assert russian[ord('.')] == (0xBF, 0)
+    assert russian[ord(',')] == (0xBF, layouts.SHIFT)
+
+
+def test_translation_table_falls_back_to_layout_file(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path))
+    layouts.clear_tables()
+    try:
+        table = layouts.get_translation_table('english', '00000409')
+        assert table == layouts.load_layout_file('english')
+        assert layouts.get_translation_table('english', '00000409') is table
+    finally:
+        layouts.clear_tables()
+
+
+def test_translation_table_prefers_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path))
+    layouts.clear_tables()
+    queried = []
+
+    def query():
+        queried.append(True)
+        return {ord('y'): (0x59, 0)}
+
+    try:
+        layouts._write_cache('0000abcd', 'win32', {ord('x'): (0x58, 0)})
+        table = layouts.get_translation_table('english', '0000abcd', query, 'win32')
+        assert table == {ord('x'): (0x58, 0)} and queried == []
+        # The cache of another backend is not used.
+        table = layouts.get_translation_table('english', '0000abcd', query, 'other')
+        assert table == {ord('y'): (0x59, 0)} and queried == [True]
+    finally:
+        layouts.clear_tables()
+
+
+def test_translation_table_of_backend_without_os_is_the_shipped_one(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path))
+    layouts.clear_tables()
+    try:
+        layouts._write_cache('00000409', None, {ord('x'): (0x58, 0)})
+        layouts._write_cache('00000409', 'recording', {ord('x'): (0x58, 0)})
+        table = layouts.get_translation_table('english', '00000409', backend='recording')
+        assert table == layouts.load_layout_file('english')
+    finally:
+        layouts.clear_tables()
+
+
+def test_cache_is_keyed_by_os_build_and_written_atomically(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path))
+    monkeypatch.setattr(layouts, 'get_os_build', lambda: '10.0.19045')
+    layouts._write_cache('00000409', 'win32', {ord('x'): (0x58, 0)})
+    # Only the final file is left.
+    cache_directory = tmp_path / 'ruautogui'
+    assert [path.name for path in cache_directory.iterdir()] == [
+        f'layout-00000409-win32-10.0.19045-v{layouts.CACHE_VERSION}.json'
+    ]
+    assert layouts._read_cache('00000409', 'win32') == {ord('x'): (0x58, 0)}
+    monkeypatch.setattr(layouts, 'get_os_build', lambda: '10.0.22631')
+    assert layouts._read_cache('00000409', 'win32') is None
+
+    # A failed write leaves neither the temporary file nor a broken cache.
+    def fail(*args):
+        raise OSError('disk is full')
+
+    monkeypatch.setattr(layouts.os, 'replace', fail)
+    layouts._write_cache('00000409', 'win32', {ord('x'): (0x58, 0)})
+    assert len(list(cache_directory.iterdir())) == 1
@@ -0,0 +1,21 @@
+import logging
+
+from ruautogui import bezier, logs
+
+
+def test_package_is_silent_by_default():
+    logger = logging.getLogger('ruautogui.bezier')
+    assert not logger.isEnabledFor(logging.DEBUG)
+    assert all(isinstance(handler, logging.NullHandler) for handler in logging.getLogger('ruautogui').handlers)
+
+
+def test_configure_logging_writes_file_asynchronously(tmp_path):
+    path = tmp_path / 'ruautogui.log'
+    logs.configure_logging(console=False, filename=str(path), asynchronous=True)
+    try:
+        assert logging.getLogger('ruautogui.bezier').isEnabledFor(logging.DEBUG)
+        bezier.get_curve_points((0, 0), (300, 200), order=2, transition_time=200)
+    finally:
+        logs.stop_logging()
+    assert 'ruautogui.bezier - DEBUG - Control points' in path.read_text()
+    assert not logging.getLogger('ruautogui.bezier').isEnabledFor(logging.DEBUG)
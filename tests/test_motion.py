@@ -0,0 +1,153 @@
+import queue
+import threading
+import time
+
+from ruautogui import bezier
+from ruautogui.motion import MotionWorker, get_direction
+from ruautogui.scheduler import StepScheduler
+from ruautogui.trajectory import Trajectory
+
+
+class FakeMouse:
+    """ A cursor that only remembers its positions."""
+
+    def __init__(self):
+        self.position = (0, 0)
+        self.history = []
+        self.scheduler = StepScheduler()
+
+    def get_position(self):
+        return self.position
+
+    def plan(self, begin_pos, end_pos, order, transition_time, control_points):
+        points, _, transition_time = bezier.get_curve_points(
+            begin_pos=begin_pos,
+            end_pos=end_pos,
+            order=order,
+            control_points=list(control_points or []),
+            transition_time=transition_time if transition_time is not None else 100,
+            frame_time=5
+        )
+        return points, transition_time
+
+    def execute(self, points, transition_time, should_stop):
+        def step(i):
+            self.position = points[i + 1]
+            self.history.append(self.position)
+        deadlines = [time_stamp / 1000 for time_stamp in points.time_stamps[1:]]
+        return self.scheduler.run(deadlines, step, transition_time / 1000, should_stop)
+
+    def click(self, button):
+        self.history.append(button)
+        return button
+
+
+def make_worker():
+    mouse = FakeMouse()
+    return mouse, MotionWorker(mouse.plan, mouse.execute, mouse.get_position)
+
+
+def test_moves_and_clicks_run_in_order():
+    mouse, worker = make_worker()
+    try:
+        first = worker.move((100, 0), order=1, transition_time=50)
+        click = worker.submit(mouse.click, 'left')
+        second = worker.move((100, 100), order=1, transition_time=50)
+        assert not first.done()
+        assert second.result(timeout=5).steps > 0
+        assert click.result() == 'left'
+        assert first.result().cancelled is False
+        index = mouse.history.index('left')
+        assert abs(mouse.history[index - 1][0] - 100) <= 5
+        assert abs(mouse.position[1] - 100) <= 5
+    finally:
+        worker.close()
+
+
+def test_cancel_stops_current_and_queued_moves():
+    mouse, worker = make_worker()
+    try:
+        current = worker.move((1000, 0), order=1, transition_time=2000)
+        queued = worker.move((0, 0), order=1, transition_time=100)
+        time.sleep(0.1)
+        assert worker.cancel()
+        assert current.result(timeout=1).cancelled
+        assert queued.cancelled()
+        assert 0 < mouse.position[0] < 500
+    finally:
+        worker.close()
+
+
+def test_retarget_replans_tail_from_current_position():
+    mouse, worker = make_worker()
+    try:
+        future = worker.move((1000, 0), order=1, transition_time=400)
+        time.sleep(0.1)
+        assert worker.retarget((500, 500), transition_time=100)
+        statistics = future.result(timeout=5)
+        assert not statistics.cancelled
+        assert abs(mouse.position[0] - 500) <= 10 and abs(mouse.position[1] - 500) <= 10
+        assert not worker.retarget((0, 0))
+    finally:
+        worker.close()
+
+
+def test_direction_of_movement():
+    points = Trajectory([(0, 0), (10, 0), (10, 10)], [0, 10, 20])
+    assert get_direction(points, 5) == (1.0, 0.0)
+    assert get_direction(points, 15) == (0.0, 1.0)
+    assert get_direction(Trajectory([(0, 0), (0, 0)], [0, 10]), 5) is None
+
+
+def test_retarget_after_the_last_step_is_not_dropped():
+    mouse, worker = make_worker()
+    retargeted = []
+
+    def execute(points, transition_time, should_stop):
+        # The new target comes after the last check of should_stop.
+        statistics = mouse.execute(points, transition_time, should_stop)
+        if not retargeted:
+            retargeted.append(worker.retarget((0, 300), transition_time=50))
+        return statistics
+
+    worker.execute = execute
+    try:
+        statistics = worker.move((300, 0), order=1, transition_time=50).result(timeout=5)
+        assert retargeted == [True] and not statistics.cancelled
+        assert abs(mouse.position[0]) <= 5 and abs(mouse.position[1] - 300) <= 5
+        # The movement has ended: it cannot be retargeted any more.
+        assert not worker.retarget((0, 0))
+        click = worker.submit(time.sleep, 0.2)
+        time.sleep(0.05)
+        assert not worker.retarget((0, 0))
+        click.result(timeout=5)
+    finally:
+        worker.close()
+
+
+def test_cancel_drops_the_command_taken_from_the_queue(monkeypatch):
+    taken = threading.Event()
+    resume = threading.Event()
+
+    class SlowQueue(queue.Queue):
+        # The worker stops after it takes a command and before it performs it.
+        def get(self, *args, **kwargs):
+            command = super().get(*args, **kwargs)
+            if command[0] is not None:
+                taken.set()
+                resume.wait(5)
+            return command
+
+    monkeypatch.setattr(queue, 'Queue', SlowQueue)
+    mouse, worker = make_worker()
+    try:
+        click = worker.submit(mouse.click, 'left')
+        assert taken.wait(5)
+        worker.cancel()
+        resume.set()
+        assert worker.submit(mouse.click, 'right').result(timeout=5) == 'right'
+        assert click.cancelled()
+        assert mouse.history == ['right']
+    finally:
+        resume.set()
+        worker.close()
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from ruautogui import pool
+from ruautogui.pool import TrajectoryPool
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'python'])
+def use_numpy(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(pool, 'numpy', None)
+    return request.param
+
+
+def test_curve_is_retargeted_to_the_end_points(use_numpy):
+    trajectory_pool = TrajectoryPool(size=2, orders=(3,), durations=(300,))
+    trajectory_pool.fill()
+    assert len(trajectory_pool) == 2
+    points, control_points, transition_time = trajectory_pool.get_curve_points((100, 200), (700, -50), order=3, transition_time=330)
+    assert points[0] == (100, 200)
+    # The grid of time stamps can stop short of the transition time.
+    last_x, last_y = points[len(points) - 1]
+    assert abs(last_x - 700) <= 10 and abs(last_y + 50) <= 10
+    assert control_points[0] == (100, 200) and control_points[-1] == (700, -50)
+    assert len(control_points) == 4
+    assert transition_time == 330
+    assert points.time_stamps[-1] == pytest.approx(330, abs=15)
+    # The curve stays near the segment between the points.
+    assert all(-200 <= x <= 1000 and -350 <= y <= 500 for x, y in points)
+
+
+def test_hits_and_misses_are_counted():
+    trajectory_pool = TrajectoryPool(size=1, orders=(2,), durations=(200, 400))
+    trajectory_pool.fill()
+    trajectory_pool.get_curve_points((0, 0), (500, 500), order=2, transition_time=210)
+    trajectory_pool.get_curve_points((0, 0), (500, 500), order=2, transition_time=190)
+    trajectory_pool.get_curve_points((0, 0), (500, 500), order=7, transition_time=190)
+    statistics = trajectory_pool.statistics()
+    assert statistics.hits == 1
+    assert statistics.misses == 2
+    assert statistics.generated == 2
+    assert statistics.hit_rate == pytest.approx(1 / 3)
+
+
+def test_background_thread_refills_the_pool():
+    trajectory_pool = TrajectoryPool(size=2, orders=(1, 2), durations=(200,))
+    trajectory_pool.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(trajectory_pool) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(trajectory_pool) == 4
+        trajectory_pool.take(1, 200)
+        deadline = time.monotonic() + 5
+        while len(trajectory_pool) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(trajectory_pool) == 4
+    finally:
+        trajectory_pool.stop()
+    assert trajectory_pool.statistics().generated == 5
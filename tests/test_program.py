@@ -0,0 +1,75 @@
+import pytest
+
+from ruautogui import program
+from ruautogui.program import KeystrokeProgram, ProgramBuilder
+
+
+def make_program():
+    builder = ProgramBuilder()
+    builder.start_run(None)
+    builder.add(0x20, 0)
+    builder.add(0x20, 2)
+    builder.wait(0.1)
+    builder.start_run('russian')
+    builder.add(0x41, 0)
+    builder.wait(0.001)
+    builder.add(0x41, 2)
+    builder.wait(0.001)
+    builder.add(0, 4, 0x44F)
+    builder.add(0, 6, 0x44F)
+    builder.wait(0.2)
+    return builder.build(mode='fast', characters=3)
+
+
+def test_sample_keystrokes_shape_and_ranges():
+    rows = program.sample_keystrokes(100, 0.1, 0.2, typorate=False)
+    assert len(rows) == 100
+    assert all(len(row) == program.NUMBER_OF_SAMPLES for row in rows)
+    assert not any(row[program.TYPO] for row in rows)
+    assert all(0.1 <= row[program.DELAY1] <= 0.2 for row in rows)
+    assert all(0.3 <= row[program.TYPO_PAUSE] <= 0.6 for row in rows)
+    assert all(0 <= row[program.TYPO_SYMBOL] < 1 for row in rows)
+
+
+def test_sample_keystrokes_pure_python(monkeypatch):
+    monkeypatch.setattr(program, 'numpy', None)
+    rows = program.sample_keystrokes(50, 0, 0, typorate=1)
+    assert len(rows) == 50
+    assert all(row[program.DELAY1] == 0 for row in rows)
+    assert {row[program.TYPO] for row in rows} <= {0.0, 1.0}
+
+
+def test_program_is_read_only():
+    keystrokes = make_program()
+    assert len(keystrokes) == 6
+    assert list(keystrokes.vk) == [0x20, 0x20, 0x41, 0x41, 0, 0]
+    assert keystrokes.runs == ((0, None), (2, 'russian'))
+    assert keystrokes.duration == pytest.approx(0.302)
+    with pytest.raises(TypeError):
+        keystrokes.vk[0] = 1
+
+
+def test_split_groups_short_delays():
+    keystrokes = make_program()
+    runs = keystrokes.split(0.01)
+    assert [run.language for run in runs] == [None, 'russian']
+    assert runs[0].groups == [(0, 2)]
+    assert runs[1].groups == [(2, 6)]
+    assert runs[1].duration == pytest.approx(0.202)
+
+    runs = keystrokes.split(0.0)
+    assert runs[1].groups == [(2, 3), (3, 4), (4, 6)]
+    assert runs[1].deadlines == pytest.approx([0, 0.001, 0.002])
+
+
+def test_serialization_round_trip(tmp_path):
+    keystrokes = make_program()
+    assert KeystrokeProgram.from_bytes(keystrokes.to_bytes()) == keystrokes
+    path = tmp_path / 'program.bin'
+    keystrokes.save(str(path))
+    loaded = KeystrokeProgram.load(str(path))
+    assert loaded == keystrokes
+    assert hash(loaded) == hash(keystrokes)
+    assert loaded.mode == 'fast' and loaded.characters == 3
+    with pytest.raises(ValueError):
+        KeystrokeProgram.from_bytes(b'XXXX' + keystrokes.to_bytes()[4:])
@@ -0,0 +1,134 @@
+import time
+
+from ruautogui.scheduler import StepScheduler
+
+
+class FakeClock:
+    """ A clock that moves only when somebody sleeps; every sleep oversleeps by lag."""
+
+    def __init__(self, lag=0.0):
+        self.now = 0.0
+        self.lag = lag
+
+    def __call__(self):
+        # Spinning moves the clock a little, so the busy loops end.
+        self.now += 1e-5
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds + self.lag
+
+
+def test_steps_run_at_deadlines():
+    clock = FakeClock()
+    scheduler = StepScheduler(clock=clock, sleep=clock.sleep)
+    performed = []
+    statistics = scheduler.run([0.0, 0.01, 0.02, 0.03], lambda i: performed.append((i, clock.now)), 0.05)
+    assert [i for i, _ in performed] == [0, 1, 2, 3]
+    for i, moment in performed:
+        assert 0.01 * i <= moment < 0.01 * i + 0.001
+    assert statistics.steps == 4
+    assert statistics.dropped == 0
+    assert statistics.overruns == 0
+    assert statistics.actual_duration >= statistics.planned_duration == 0.05
+
+
+def test_late_steps_are_dropped_but_not_the_last_one():
+    clock = FakeClock(lag=0.025)
+    scheduler = StepScheduler(clock=clock, sleep=clock.sleep, cpu_budget=0)
+    performed = []
+    statistics = scheduler.run([0.01 * i for i in range(10)], performed.append)
+    assert performed[-1] == 9
+    assert statistics.dropped == 10 - len(performed) > 0
+    # Only the first step is on time.
+    assert statistics.overruns == statistics.steps - 1
+    assert statistics.max_jitter > scheduler.overrun_tolerance
+
+    # The steps that cannot be dropped are performed late.
+    performed = []
+    droppable = [i % 2 == 0 for i in range(10)]
+    scheduler.run([0.01 * i for i in range(10)], performed.append, droppable=droppable)
+    assert [1, 3, 5, 7, 9] == [i for i in performed if not droppable[i]]
+
+
+def test_real_clock_keeps_the_planned_duration():
+    scheduler = StepScheduler()
+    start = time.perf_counter()
+    statistics = scheduler.run([0.005 * i for i in range(10)], lambda i: None, 0.06)
+    elapsed = time.perf_counter() - start
+    assert 0.06 <= elapsed < 0.09
+    assert statistics.steps + statistics.dropped == 10
+    assert statistics.spin_time <= 0.1 * 0.06 + 1e-3
+
+
+def test_run_is_cancelled_during_long_wait():
+    clock = FakeClock()
+    scheduler = StepScheduler(clock=clock, sleep=clock.sleep, stop_check_interval=0.05)
+    performed = []
+    statistics = scheduler.run(
+        [0.0, 10.0, 20.0], performed.append, 30.0, should_stop=lambda: clock.now > 1.0
+    )
+    assert performed == [0]
+    assert statistics.cancelled
+    assert statistics.actual_duration < 1.2
+
+
+def test_run_is_cancelled_during_the_final_wait():
+    clock = FakeClock()
+    scheduler = StepScheduler(clock=clock, sleep=clock.sleep)
+    performed = []
+    statistics = scheduler.run([0.0], performed.append, 10.0, should_stop=lambda: clock.now > 1.0)
+    assert performed == [0]
+    assert statistics.cancelled and statistics.actual_duration < 2.0
+
+
+def test_run_async_does_not_block_the_loop():
+    import asyncio
+
+    scheduler = StepScheduler()
+    performed = []
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.005)
+
+    async def main():
+        statistics, _ = await asyncio.gather(
+            scheduler.run_async([0.0, 0.01, 0.02], performed.append, 0.03),
+            ticker()
+        )
+        return statistics
+
+    loop = asyncio.new_event_loop()
+    try:
+        statistics = loop.run_until_complete(main())
+    finally:
+        loop.close()
+    assert performed == [0, 1, 2]
+    assert len(ticks) == 5
+    assert statistics.steps == 3
+    assert statistics.actual_duration >= 0.03
+    assert statistics.spin_time == 0.0
+
+
+def test_follow_requests_steps_lazily():
+    clock = FakeClock()
+    scheduler = StepScheduler(clock=clock, sleep=clock.sleep)
+    requested = []
+    performed = []
+
+    def stream():
+        for i in range(4):
+            requested.append(i)
+            # The next step is requested only after the previous one is performed.
+            assert len(performed) == i
+            yield (i, i * 0.01)
+
+    statistics = scheduler.follow(stream(), lambda item: performed.append((item[0], clock.now)))
+    assert [i for i, _ in performed] == [0, 1, 2, 3]
+    for i, moment in performed:
+        assert 0.01 * i <= moment < 0.01 * i + 0.001
+    assert statistics.steps == 4
+    assert statistics.planned_duration == 0.03
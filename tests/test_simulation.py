@@ -0,0 +1,140 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from ruautogui import aio, backends, calibration, clocks, keyboard, mouse
+from ruautogui.backends import recording
+from ruautogui.backends.base import MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP
+from ruautogui.scheduler import StepScheduler
+from ruautogui.simulation import Simulation
+
+
+@pytest.fixture
+def simulation(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    monkeypatch.setattr(keyboard, 'layout_manager', keyboard.LayoutManager())
+    monkeypatch.setattr(keyboard, '_character_table', None)
+    with Simulation() as simulation:
+        yield simulation
+
+
+def test_thousand_steps_take_exact_virtual_time(simulation):
+    coordinates = [(i, i // 2) for i in range(1001)]
+    started = time.perf_counter()
+    statistics = mouse.move_through_coordinates(coordinates, 10000)
+    mouse.click()
+    assert time.perf_counter() - started < 1.0
+
+    deadlines, _ = mouse.get_deadlines(coordinates, 10000)
+    moves = simulation.get_events(recording.MOVE)
+    assert [event.time for event in moves] == deadlines
+    assert [event[2:4] for event in moves] == coordinates[1:]
+    assert statistics.steps == 1000 and statistics.dropped == 0
+    assert statistics.actual_duration == statistics.planned_duration == deadlines[-1]
+    assert statistics.max_jitter == 0.0 and statistics.spin_time == 0.0
+
+    buttons = simulation.get_events(recording.BUTTON)
+    assert [(event.time, event.a) for event in buttons] == [
+        (deadlines[-1], MOUSEEVENTF_LEFTDOWN),
+        (deadlines[-1] + mouse.CLICK_TIME, MOUSEEVENTF_LEFTUP)
+    ]
+
+
+def test_move_and_grab_return_the_statistics(simulation):
+    statistics = mouse.move((300, 200), transition_time=500)
+    assert statistics.steps == len(simulation.get_events(recording.MOVE))
+    assert statistics.planned_duration == pytest.approx(0.5) and not statistics.cancelled
+    assert mouse.get_mouse_cursor_position() == (300, 200)
+    assert mouse.grab().steps > 0
+
+
+def test_typing_keeps_the_planned_time_of_every_group(simulation):
+    random.seed(5)
+    program = keyboard.compile('hello, world', mode='standard')
+    start = simulation.elapsed
+    keyboard.play(program)
+    expected = []
+    for run in program.split(keyboard.get_batch_threshold(program.mode)):
+        for (begin, end), deadline in zip(run.groups, run.deadlines):
+            expected.extend([start + deadline] * (end - begin))
+        start = start + run.duration
+    keys = simulation.get_events(recording.KEY)
+    assert [event.time for event in keys] == expected
+    assert [event.a for event in keys] == list(program.vk)
+    assert simulation.elapsed == pytest.approx(program.duration)
+
+
+def test_waits_can_be_stopped_and_awaited(simulation):
+    scheduler = StepScheduler()
+    performed = []
+    statistics = scheduler.run(
+        [0.0, 10.0, 20.0], performed.append, should_stop=lambda: simulation.clock.time() > 1.0
+    )
+    assert performed == [0] and statistics.cancelled
+    assert 1.0 < simulation.elapsed <= 1.0 + scheduler.stop_check_interval
+
+    simulation.backend.clear()
+    asyncio.run(aio.click(double_click=True))
+    times = [event.time for event in simulation.get_events(recording.BUTTON)]
+    assert times == pytest.approx([0.0, 0.13, 0.13, 0.26])
+
+
+def test_simulation_restores_the_package():
+    clock = clocks.get_clock()
+    backend = backends._backend
+    host = calibration._calibration
+    with Simulation(position=(5, 5)) as simulation:
+        assert clocks.get_clock() is simulation.clock
+        assert mouse.get_mouse_cursor_position() == (5, 5)
+        assert mouse.get_frame_time() == simulation.host.frame_time
+        with pytest.raises(RuntimeError):
+            simulation.start()
+    assert clocks.get_clock() is clock and not clock.virtual
+    assert backends._backend is backend
+    assert calibration._calibration is host
+
+
+def test_layout_caches_follow_the_backend(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    monkeypatch.setattr(keyboard, 'layout_manager', keyboard.LayoutManager())
+    handles = {'english': 1}
+    table = {ord('a'): {None: (0x41, 0)}}
+    monkeypatch.setattr(keyboard.layout_manager, 'handles', handles)
+    monkeypatch.setattr(keyboard, '_character_table', table)
+    monkeypatch.setattr(backends, '_backend', None)
+    with Simulation():
+        # The caches of the previous backend are dropped and loaded from the new one.
+        assert keyboard.layout_manager.handles is None and keyboard._character_table is None
+        keyboard.get_character_table()
+        assert keyboard.layout_manager.handles == {
+            language: int(layout_id, 16) for language, layout_id in keyboard.LAYOUT_IDS.items()
+        }
+    assert keyboard.layout_manager.handles is handles
+    assert keyboard._character_table is table
+
+    backends.set_backend(recording.RecordingBackend())
+    assert keyboard.layout_manager.handles is None and keyboard._character_table is None
+
+
+def test_move_path_clicks_and_dwells_in_one_run(simulation):
+    simulation.backend.position = (0, 0)
+    waypoints = [(200, 0), mouse.Waypoint(200, 200, dwell=0.5, click='left'), (0, 200)]
+    statistics = mouse.move_path(waypoints, transition_time=[200, 400, 200])
+    assert statistics.dropped == 0 and statistics.max_jitter == 0.0
+    assert statistics.planned_duration == pytest.approx(0.8 + mouse.CLICK_TIME + 0.5)
+    assert simulation.elapsed == statistics.planned_duration
+
+    events = simulation.get_events()
+    down, up = [i for i, event in enumerate(events) if event.kind == recording.BUTTON]
+    # The cursor reaches the waypoint, clicks there and moves on after the pause.
+    assert events[down - 1][1:4] == (recording.MOVE, 200, 200)
+    assert events[down].time == events[down - 1].time == pytest.approx(0.6)
+    assert events[up].time == events[down].time + mouse.CLICK_TIME
+    assert events[up + 1].time > events[up].time + 0.5
+    assert events[-1][1:4] == (recording.MOVE, 0, 200)
+    # The cursor passes the first waypoint without stopping.
+    positions = [move[2:4] for move in simulation.get_events(recording.MOVE)]
+    passed = positions.index((200, 0))
+    assert positions[passed - 1] != (200, 0) != positions[passed + 1]
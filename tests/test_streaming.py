@@ -0,0 +1,132 @@
+import io
+import time
+import threading
+
+import pytest
+
+from ruautogui import streaming
+
+
+def test_chunks_of_string_file_and_iterable():
+    text = 'abcdefghij' * 7
+    expected = [text[i:i + 16] for i in range(0, len(text), 16)]
+    assert list(streaming.iter_chunks(text, 16)) == expected
+    assert list(streaming.iter_chunks(io.StringIO(text), 16)) == expected
+    pieces = (text[i:i + 5] for i in range(0, len(text), 5))
+    assert list(streaming.iter_chunks(pieces, 16)) == expected
+    assert list(streaming.iter_chunks([text], 16)) == expected
+    assert list(streaming.iter_chunks([], 16)) == []
+    with pytest.raises(ValueError):
+        list(streaming.iter_chunks(text, 0))
+
+
+def test_pipeline_produces_ahead_in_order():
+    produced = []
+    consumed = []
+
+    def produce(item):
+        produced.append(threading.current_thread())
+        return item * 2
+
+    assert streaming.pipeline(range(10), produce, consumed.append)
+    assert consumed == [2 * i for i in range(10)]
+    assert threading.current_thread() not in produced
+
+
+def test_pipeline_raises_errors_of_producer():
+    def produce(item):
+        if item == 3:
+            raise KeyError(item)
+        return item
+
+    consumed = []
+    with pytest.raises(KeyError):
+        streaming.pipeline(range(10), produce, consumed.append)
+    assert consumed == [0, 1, 2]
+
+
+def test_pipeline_stops_unbounded_source():
+    def endless():
+        while True:
+            yield 'x'
+
+    stop = threading.Event()
+    consumed = []
+
+    def consume(item):
+        consumed.append(item)
+        if len(consumed) == 5:
+            stop.set()
+
+    assert not streaming.pipeline(endless(), str.upper, consume, should_stop=stop.is_set)
+    assert consumed == ['X'] * 5
+
+
+def test_partial_chunk_of_idle_source_is_not_held_back():
+    release = threading.Event()
+
+    def log():
+        yield 'hello '
+        release.wait(5)
+        yield 'world'
+
+    chunks = streaming.iter_chunks(log(), 1024, idle_timeout=0.05)
+    assert next(chunks) == 'hello '
+    release.set()
+    assert list(chunks) == ['world']
+
+
+def test_cancelled_pipeline_does_not_wait_for_blocked_source():
+    release = threading.Event()
+
+    def blocked():
+        yield 'x'
+        release.wait(5)
+        yield 'y'
+
+    stop = threading.Event()
+    consumed = []
+
+    def consume(item):
+        consumed.append(item)
+        stop.set()
+
+    start = time.perf_counter()
+    try:
+        assert not streaming.pipeline(blocked(), str.upper, consume, should_stop=stop.is_set)
+        assert time.perf_counter() - start < 1.0
+    finally:
+        release.set()
+    assert consumed == ['X']
+
+
+def source_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'ruautogui-source' and thread.is_alive()]
+
+
+def test_reader_of_closed_chunks_is_stopped():
+    release = threading.Event()
+
+    def blocked():
+        yield 'x'
+        release.wait(5)
+        yield 'y'
+        yield 'z'
+
+    chunks = streaming.iter_chunks(blocked(), 1024, idle_timeout=0.05)
+    assert next(chunks) == 'x'
+    chunks.close()
+    # The reader stops at the next string instead of waiting for a consumer forever.
+    release.set()
+    time.sleep(0.2)
+    assert source_threads() == []
+
+    def endless():
+        while True:
+            yield 'x'
+
+    chunks = streaming.iter_chunks(endless(), 4, idle_timeout=0.05)
+    assert next(chunks) == 'xxxx'
+    chunks.close()
+    time.sleep(0.2)
+    assert source_threads() == []
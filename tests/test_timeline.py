@@ -0,0 +1,90 @@
+import pytest
+
+from ruautogui import keyboard, mouse, timeline
+from ruautogui.backends import recording
+from ruautogui.backends.base import (
+    KEYEVENTF_KEYDOWN, KEYEVENTF_KEYUP, MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP
+)
+from ruautogui.simulation import Simulation
+
+CTRL = keyboard.mapping['ctrl']
+SHIFT = keyboard.mapping['shift']
+
+
+@pytest.fixture
+def simulation():
+    with Simulation(position=(100, 100)) as simulation:
+        yield simulation
+
+
+def get_edges(simulation):
+    # The button and the key events as tuples (time, kind, code, flags).
+    return [
+        (event.time, event.kind, event.a, event.b) for event in simulation.get_events()
+        if event.kind != recording.MOVE
+    ]
+
+
+def test_drag_holds_ctrl_during_the_movement(simulation):
+    line = timeline.Timeline()
+    end = line.drag((400, 300), button='left', keys=('ctrl',), transition_time=500)
+    statistics = line.run()
+    assert statistics.dropped == 0 and statistics.max_jitter == 0.0
+    assert simulation.elapsed == end
+
+    moves = simulation.get_events(recording.MOVE)
+    assert moves[-1][2:4] == (400, 300)
+    edges = get_edges(simulation)
+    assert [edge[1:] for edge in edges] == [
+        (recording.KEY, CTRL, KEYEVENTF_KEYDOWN),
+        (recording.BUTTON, MOUSEEVENTF_LEFTDOWN, 0),
+        (recording.BUTTON, MOUSEEVENTF_LEFTUP, 0),
+        (recording.KEY, CTRL, KEYEVENTF_KEYUP)
+    ]
+    press, down, up, release = (edge[0] for edge in edges)
+    assert down == press + timeline.PAUSE
+    # The cursor moves only while the button is down.
+    assert down < moves[0].time and moves[-1].time < up
+    assert up == pytest.approx(down + timeline.PAUSE + 0.5 + timeline.PAUSE)
+    assert release == end == up + timeline.PAUSE
+
+
+def test_shift_click_and_overlapping_actions_are_merged(simulation):
+    line = timeline.Timeline()
+    line.click(0.0, keys=('shift',))
+    line.press(0.05, 'a')
+    line.release(0.05 + mouse.CLICK_TIME, 'a')
+    line.run()
+    assert get_edges(simulation) == [
+        (0.0, recording.KEY, SHIFT, KEYEVENTF_KEYDOWN),
+        (0.05, recording.BUTTON, MOUSEEVENTF_LEFTDOWN, 0),
+        (0.05, recording.KEY, keyboard.mapping['a'], KEYEVENTF_KEYDOWN),
+        (0.05 + mouse.CLICK_TIME, recording.BUTTON, MOUSEEVENTF_LEFTUP, 0),
+        (0.05 + mouse.CLICK_TIME, recording.KEY, keyboard.mapping['a'], KEYEVENTF_KEYUP),
+        (0.05 + mouse.CLICK_TIME + 0.05, recording.KEY, SHIFT, KEYEVENTF_KEYUP)
+    ]
+
+
+def test_events_of_the_same_time_are_sent_together(simulation):
+    line = timeline.Timeline()
+    line.hold(('ctrl', 'shift'), 0.0, 0.25)
+    line.add([(0.0625, timeline.MOVE, 1, 1), (0.0625, timeline.MOVE, 2, 2)])
+    line.click(0.125, double_click=True, hold=0.0625)
+    deadlines, steps, droppable = line.compile(simulation.backend)
+    assert deadlines == [0.0, 0.0625, 0.125, 0.1875, 0.25]
+    # Both keys go in one call; of the movements only the last one is made.
+    assert [len(step) for step in steps] == [1, 1, 1, 1, 2]
+    assert steps[1][0] == (simulation.backend.set_cursor_position, (2, 2))
+    assert steps[3][0][1] == ((MOUSEEVENTF_LEFTUP, MOUSEEVENTF_LEFTDOWN),)
+    # Only the movements can be dropped.
+    assert droppable == [False, True, False, False, False]
+    line.run()
+    assert simulation.backend.position == (2, 2)
+    assert len(simulation.get_events(recording.KEY)) == 4
+
+
+def test_click_edges():
+    assert mouse.get_click_edges('missing') is None
+    assert mouse.get_click_edges('right', hold=0.1) == [(0.0, (0x8,)), (0.1, (0x10,))]
+    with pytest.raises(ValueError):
+        timeline.Timeline().click(button='missing')
@@ -0,0 +1,66 @@
+import json
+import os
+import statistics
+
+import pytest
+
+from ruautogui import layouts, timing
+
+
+def vk(character, language='english'):
+    return layouts.load_layout_file(language)[ord(character)][0]
+
+
+def test_model_tables_are_flat():
+    model = timing.get_model('russian')
+    assert len(model.mu) == timing.NUMBER_OF_KEYS ** 2
+    assert len(model.sigma) == timing.NUMBER_OF_KEYS ** 2
+    assert timing.get_model('russian') is model
+    assert timing.get_model('klingon') is timing.get_model('english')
+
+
+def test_common_digraph_is_faster_than_same_finger():
+    keys = [vk('t'), vk('h')] * 2000
+    common = timing.sample_intervals(keys, ['english'] * len(keys))[::2]
+    keys = [vk('d'), vk('e')] * 2000
+    same_finger = timing.sample_intervals(keys, ['english'] * len(keys))[::2]
+    assert statistics.median(common) < statistics.median(same_finger)
+
+
+def test_russian_digraphs_use_physical_keys(monkeypatch, tmp_path):
+    with open(os.path.join(timing.DATA_DIRECTORY, 'timing_russian.json'), encoding='utf-8') as fd:
+        data = json.load(fd)
+    data['digraphs'] = {'ст': [110, 35]}
+    with open(tmp_path / 'timing_russian.json', 'w', encoding='utf-8') as fd:
+        json.dump(data, fd)
+    monkeypatch.setattr(timing, 'DATA_DIRECTORY', str(tmp_path))
+    model = timing.TimingModel.load('russian')
+    index = vk('с', 'russian') * timing.NUMBER_OF_KEYS + vk('т', 'russian')
+    assert model.mu[index] == pytest.approx(timing._lognormal(110, 35)[0])
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_layout_switch_adds_pause(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(timing, 'numpy', None)
+        timing._models.clear()
+        timing._tables = None
+    try:
+        keys = [vk('a'), vk('b')] * 1000
+        languages = ['english', 'russian'] * 1000
+        switching = timing.sample_intervals(keys, languages)
+        steady = timing.sample_intervals(keys, ['english'] * len(keys))
+        assert len(switching) == len(keys)
+        assert statistics.median(switching) > statistics.median(steady) + 0.2
+        fast = timing.sample_intervals(keys, ['english'] * len(keys), speed=2.0)
+        assert statistics.median(fast) < statistics.median(steady)
+    finally:
+        timing._models.clear()
+        timing._tables = None
+
+
+def test_shipped_timing_is_per_class():
+    model = timing.get_model('english')
+    # Every pair of keys has the interval of its class.
+    assert model.mu[vk('t') * timing.NUMBER_OF_KEYS + vk('h')] == pytest.approx(timing._lognormal(190, 75)[0])
+    assert model.mu[vk('d') * timing.NUMBER_OF_KEYS + vk('e')] == pytest.approx(timing._lognormal(285, 115)[0])
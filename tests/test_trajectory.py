@@ -0,0 +1,134 @@
+import array
+import copy
+import pickle
+
+import pytest
+
+from ruautogui.trajectory import Trajectory
+
+
+def test_trajectory_behaves_like_tuple_of_points():
+    points = ((1, 2), (3, 4), (-5, 6))
+    trajectory = Trajectory(points)
+    assert len(trajectory) == 3
+    assert tuple(trajectory) == points
+    assert trajectory == points
+    assert trajectory[1] == (3, 4)
+    assert trajectory[-1][0] == -5
+    assert trajectory[1:] == points[1:]
+    with pytest.raises(IndexError):
+        trajectory[3]
+
+
+def test_trajectory_exposes_interleaved_int32_buffer():
+    trajectory = Trajectory([(1, 2), (3, 4)])
+    view = memoryview(trajectory)
+    assert view.itemsize == 4
+    assert view.tolist() == [1, 2, 3, 4]
+    copied = Trajectory.from_buffer(view)
+    assert copied == trajectory
+
+
+def test_trajectory_time_stamps():
+    trajectory = Trajectory([(0, 0), (5, 5)], time_stamps=[0, 13])
+    trajectory.append_point(10, 10, 26)
+    assert trajectory.time_stamps == array.array('d', [0, 13, 26])
+    assert trajectory.duration == 26
+    assert trajectory[1:].time_stamps.tolist() == [13, 26]
+    with pytest.raises(ValueError):
+        Trajectory([(0, 0)], time_stamps=[0, 1])
+
+
+def test_trajectory_copy_and_pickle():
+    trajectory = Trajectory([(1, 2), (3, 4)], time_stamps=[0, 13])
+    for duplicate in (copy.deepcopy(trajectory), pickle.loads(pickle.dumps(trajectory))):
+        assert isinstance(duplicate, Trajectory)
+        assert duplicate == trajectory
+        assert duplicate.time_stamps == trajectory.time_stamps
+
+
+def test_trajectory_searches_points():
+    trajectory = Trajectory([(1, 2), (3, 4), (1, 2)])
+    assert (3, 4) in trajectory and [1, 2] in trajectory
+    # The coordinates are not the items of the sequence.
+    assert 1 not in trajectory and (2, 3) not in trajectory
+    assert trajectory.index((1, 2)) == 0
+    assert trajectory.index((1, 2), 1) == 2
+    assert trajectory.count((1, 2)) == 2 and trajectory.count(1) == 0
+    with pytest.raises(ValueError):
+        trajectory.index((1, 2), 1, 2)
+
+
+def test_trajectory_concatenation_and_repetition():
+    trajectory = Trajectory([(0, 0), (5, 5)], time_stamps=[0, 13])
+    joined = trajectory + Trajectory([(6, 6), (7, 7)], time_stamps=[13, 26])
+    assert isinstance(joined, Trajectory)
+    assert joined == ((0, 0), (5, 5), (6, 6), (7, 7))
+    # The second movement follows the first one.
+    assert joined.time_stamps.tolist() == [0, 13, 26, 39]
+    assert (trajectory + [(9, 9)]).time_stamps is None
+    assert ((9, 9),) + trajectory == ((9, 9), (0, 0), (5, 5))
+
+    repeated = trajectory * 2
+    assert isinstance(repeated, Trajectory) and repeated == 2 * trajectory
+    assert repeated == ((0, 0), (5, 5)) * 2
+    assert repeated.time_stamps.tolist() == [0, 13, 13, 26]
+    assert len(trajectory * 0) == 0
+
+    trajectory += trajectory
+    trajectory *= 2
+    assert len(trajectory) == len(trajectory.time_stamps) == 8
+    for operand in (1, 'ab', 1.5):
+        with pytest.raises(TypeError):
+            trajectory + operand
+    with pytest.raises(TypeError):
+        trajectory * 1.5
+
+
+def test_trajectory_is_changed_by_points():
+    trajectory = Trajectory([(0, 0), (5, 5)])
+    trajectory.append((10, 10))
+    trajectory.extend([(15, 15), [20, 20]])
+    trajectory.insert(0, (-5, -5))
+    trajectory.insert(100, (25, 25))
+    assert trajectory == ((-5, -5), (0, 0), (5, 5), (10, 10), (15, 15), (20, 20), (25, 25))
+    assert trajectory.pop() == (25, 25) and trajectory.pop(0) == (-5, -5)
+    trajectory.remove((10, 10))
+    trajectory[0] = (1, 1)
+    trajectory[1:3] = [(6, 6)]
+    del trajectory[-1]
+    assert trajectory == ((1, 1), (6, 6))
+    trajectory.reverse()
+    assert trajectory == ((6, 6), (1, 1))
+    assert memoryview(trajectory).tolist() == [6, 6, 1, 1]
+    with pytest.raises(TypeError):
+        trajectory.append(1)
+    with pytest.raises(ValueError):
+        trajectory.remove((2, 2))
+
+
+def test_trajectory_changes_keep_time_stamps_in_step():
+    trajectory = Trajectory([(0, 0), (5, 5), (10, 10)], time_stamps=[0, 10, 30])
+    trajectory.append((15, 15), 40)
+    trajectory.insert(1, (2, 2), 5)
+    assert trajectory.time_stamps.tolist() == [0, 5, 10, 30, 40]
+    assert trajectory.pop(1) == (2, 2)
+    trajectory.remove((5, 5))
+    del trajectory[-1]
+    assert trajectory == ((0, 0), (10, 10)) and trajectory.time_stamps.tolist() == [0, 30]
+    trajectory.extend(Trajectory([(20, 20)], time_stamps=[10]))
+    assert trajectory.time_stamps.tolist() == [0, 30, 40]
+    # The reversed movement takes the same time.
+    trajectory.reverse()
+    assert trajectory == ((20, 20), (10, 10), (0, 0))
+    assert trajectory.time_stamps.tolist() == [0, 10, 40]
+    trajectory[0] = (21, 21)
+    trajectory[1:] = [(11, 11), (1, 1)]
+    assert trajectory.time_stamps.tolist() == [0, 10, 40]
+    del trajectory[::2]
+    assert trajectory == ((11, 11),) and trajectory.time_stamps.tolist() == [10]
+    with pytest.raises(ValueError):
+        trajectory.append((2, 2))
+    with pytest.raises(ValueError):
+        trajectory[:] = []
+    assert len(trajectory) == len(trajectory.time_stamps) == 1